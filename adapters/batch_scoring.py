@@ -0,0 +1,130 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.logger import attach_worker_queue, logger, worker_log_queue
+from config.settings import BATCH_CHUNK_ROWS
+from processing.data_analysis import normalize_frame, merge_categories
+from processing.dtype_optimizer import optimize_dtypes
+
+# Colunas de identificação copiadas para a saída mesmo sem serem features
+ID_COLUMNS = ["video_id", "trending_date"]
+
+# Modelo carregado uma vez por processo worker (initializer)
+_worker_model = {}
+
+
+def _init_scorer(registry_root, key, log_queue=None):
+    attach_worker_queue(log_queue)
+    from adapters.model_registry import ModelRegistry
+    model, meta = ModelRegistry(registry_root).load(key)
+    _worker_model.update(model=model, task_type=meta["task_type"], features=meta["features"])
+
+
+def _score_chunk(chunk):
+    from adapters.pycaret_adapter import PyCaretAdapter
+    features = _worker_model["features"]
+    scored = PyCaretAdapter().predict(_worker_model["model"], chunk[features], _worker_model["task_type"])
+    ids = [c for c in ID_COLUMNS if c in chunk.columns and c not in features]
+    if ids:
+        scored = pd.concat([chunk[ids].reset_index(drop=True), scored.reset_index(drop=True)], axis=1)
+    return scored
+
+
+def _prepare_chunk(chunk, csv_path, features):
+    # Mesma normalização do load_data: o modelo vê os dtypes do treino
+    chunk = optimize_dtypes(normalize_frame(chunk))
+    if "category_name" in features and "category_id" in chunk.columns:
+        chunk = merge_categories(chunk, csv_path)
+    missing = [f for f in features if f not in chunk.columns]
+    if missing:
+        raise ValueError(f"Colunas ausentes no CSV: {', '.join(missing)}")
+    return chunk
+
+
+def _wide_table(scored):
+    # optimize_dtypes decide por chunk (int8 num, int16 no outro; category ou
+    # não): grava inteiros como int64 e categorias como seus valores
+    table = pa.Table.from_pandas(scored, preserve_index=False)
+    fields = []
+    for field in table.schema:
+        if pa.types.is_dictionary(field.type):
+            field = field.with_type(field.type.value_type)
+        elif pa.types.is_integer(field.type):
+            field = field.with_type(pa.int64())
+        fields.append(field)
+    return table.cast(pa.schema(fields))
+
+
+def score_csv(csv_path, registry, key, output_path, chunksize=BATCH_CHUNK_ROWS, max_workers=None,
+              on_progress=None):
+    """
+    Aplica um modelo do registro a um CSV inteiro: lê em chunks, pontua cada
+    chunk num pool de processos (modelo desserializado uma vez por worker) e
+    grava as previsões em Parquet na ordem do arquivo.
+    Retorna {rows, seconds, rows_per_sec, output_path}.
+    """
+    meta = registry.meta(key)
+    features = meta["features"]
+    max_workers = max_workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    rows = 0
+    writer = None
+    pool = None
+
+    if max_workers == 1:
+        _init_scorer(registry.root, key)
+        submit = lambda chunk: _score_chunk(chunk)
+    else:
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_scorer, initargs=(registry.root, key, worker_log_queue())
+        )
+        submit = lambda chunk: pool.submit(_score_chunk, chunk)
+
+    def write(scored):
+        nonlocal writer, rows
+        table = _wide_table(scored)
+        if writer is None:
+            writer = pq.ParquetWriter(output_path, table.schema)
+        else:
+            # Chunks podem inferir dtypes diferentes (ex.: int com NaN vira float)
+            table = table.cast(writer.schema, safe=False)
+        writer.write_table(table)
+        rows += len(scored)
+        if on_progress is not None:
+            on_progress(rows)
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    try:
+        # No máximo 2 chunks por worker em voo: memória limitada mesmo em dumps grandes
+        in_flight = deque()
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            in_flight.append(submit(_prepare_chunk(chunk, csv_path, features)))
+            if pool is None:
+                write(in_flight.popleft())
+            elif len(in_flight) >= 2 * max_workers:
+                write(in_flight.popleft().result())
+        while in_flight:
+            write(in_flight.popleft().result())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if writer is not None:
+            writer.close()
+
+    seconds = time.perf_counter() - started
+    result = {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else float("nan"),
+        "output_path": output_path,
+    }
+    logger.info(f"Previsão em lote: {rows} linhas em {seconds:.1f}s ({result['rows_per_sec']:.0f} linhas/s)")
+    return result
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.pipeline import Pipeline
+
+from adapters.sparse_text_trainer import build_preprocessor
+from config.logger import logger
+from config.settings import CLUSTER_CACHE_DIR
+from processing.eda_cache import dataframe_content_hash
+
+# Faixa de k avaliada no sweep (elbow + silhouette)
+K_RANGE = range(2, 11)
+# Acima disto usa MiniBatchKMeans (custo por passo não depende do nº de linhas)
+MINIBATCH_MIN_ROWS = 50000
+MINIBATCH_SIZE = 4096
+# Silhouette é O(n²): calculada numa amostra fixa
+SILHOUETTE_SAMPLE = 10000
+SEED = 123
+
+
+class ClusteringPipeline(Pipeline):
+    """Pré-processamento + KMeans escolhido pelo sweep; o sweep fica em k_sweep_."""
+
+
+def _kmeans(k, n_rows):
+    if n_rows >= MINIBATCH_MIN_ROWS:
+        return MiniBatchKMeans(n_clusters=k, batch_size=MINIBATCH_SIZE, n_init=3, random_state=SEED)
+    return KMeans(n_clusters=k, n_init="auto", random_state=SEED)
+
+
+def _fit_k(X, k):
+    started = time.perf_counter()
+    model = _kmeans(k, X.shape[0]).fit(X)
+    sample = min(SILHOUETTE_SAMPLE, X.shape[0])
+    silhouette = silhouette_score(X, model.labels_, sample_size=sample, random_state=SEED)
+    return {
+        "k": k,
+        "inertia": float(model.inertia_),
+        "silhouette": float(silhouette),
+        "segundos": time.perf_counter() - started,
+    }, model
+
+
+class KSweepCache:
+    """Métricas por k em JSON (<dir>/<chave>.json), chave = dados + colunas + algoritmo."""
+
+    def __init__(self, root=CLUSTER_CACHE_DIR):
+        self.root = root
+
+    @staticmethod
+    def make_key(df):
+        payload = json.dumps(
+            {
+                "data": dataframe_content_hash(df),
+                "columns": list(df.columns),
+                "minibatch": len(df) >= MINIBATCH_MIN_ROWS,
+                "seed": SEED,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, key):
+        if not os.path.exists(self._path(key)):
+            return {}
+        with open(self._path(key), "r", encoding="utf-8") as f:
+            return {int(k): v for k, v in json.load(f).items()}
+
+    def put(self, key, results):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self._path(key)}.tmp-{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({str(k): v for k, v in results.items()}, f)
+        os.replace(tmp, self._path(key))
+
+
+def elbow_k(sweep):
+    """Joelho da curva de inércia: ponto mais distante da reta entre os extremos."""
+    k = sweep["k"].to_numpy(dtype="float64")
+    inertia = sweep["inertia"].to_numpy(dtype="float64")
+    if len(k) < 3:
+        return int(k[0])
+    # Normaliza os dois eixos para a distância não depender da escala
+    x = (k - k[0]) / (k[-1] - k[0])
+    y = (inertia - inertia[-1]) / max(inertia[0] - inertia[-1], 1e-12)
+    distance = np.abs(x + y - 1) / np.sqrt(2)
+    return int(k[np.argmax(distance)])
+
+
+def train_clustering(df, k_range=K_RANGE, max_workers=None, cache=None):
+    """
+    Sweep de k em paralelo (joblib), com métricas por k cacheadas em disco;
+    escolhe o k de maior silhouette e devolve um ClusteringPipeline.
+    """
+    from joblib import Parallel, delayed
+
+    # KMeans/silhouette exigem k < nº de linhas
+    valid_k = [k for k in k_range if k < len(df)]
+    if not valid_k:
+        raise ValueError(
+            f"Clusterização precisa de pelo menos {min(k_range, default=2) + 1} linhas; o dataset tem {len(df)}."
+        )
+    k_range = valid_k
+    cache = cache or KSweepCache()
+    key = KSweepCache.make_key(df)
+    preprocessor = build_preprocessor(df, target=None, text_columns=())
+    X = preprocessor.fit_transform(df)
+
+    results = cache.get(key)
+    missing = [k for k in k_range if k not in results]
+    fitted = {}
+    if missing:
+        # mmap copy-on-write: X é compartilhado entre workers sem cópia, mas o
+        # KMeans esparso do sklearn exige buffers graváveis
+        outputs = Parallel(n_jobs=max_workers or -1, mmap_mode="c")(delayed(_fit_k)(X, k) for k in missing)
+        for metrics, model in outputs:
+            results[metrics["k"]] = metrics
+            fitted[metrics["k"]] = model
+        cache.put(key, results)
+    logger.info(f"Sweep de k: {len(missing)} ajustes novos, {len(results) - len(missing)} do cache")
+
+    sweep = pd.DataFrame([results[k] for k in k_range if k in results]).sort_values("k").reset_index(drop=True)
+    best_k = int(sweep.loc[sweep["silhouette"].idxmax(), "k"])
+    model = fitted.get(best_k) or _fit_k(X, best_k)[1]
+    pipeline = ClusteringPipeline([("features", preprocessor), ("model", model)])
+    pipeline.k_sweep_ = sweep
+    pipeline.elbow_k_ = elbow_k(sweep)
+    return pipeline, sweep
+
+
+def predict_frame(model, df):
+    """Mesmo formato do PyCaret para clusterização: entrada + coluna Cluster ('Cluster N')."""
+    features = df[model.named_steps["features"].feature_names_in_]
+    result = df.copy()
+    result["Cluster"] = [f"Cluster {label}" for label in model.predict(features)]
+    return result
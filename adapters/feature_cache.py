@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import shutil
+
+import joblib
+import numpy as np
+
+from config.logger import logger
+from config.settings import FEATURE_CACHE_DIR
+from processing.eda_cache import dataframe_content_hash
+
+_ARRAYS = ("X_train", "y_train", "X_test", "y_test")
+
+
+def feature_key(df, target, task_type, train_size, stratify, session_id):
+    """Chave do resultado do setup: mesmos dados + mesma divisão = mesmas matrizes."""
+    payload = json.dumps(
+        {
+            "data": dataframe_content_hash(df),
+            "columns": list(df.columns),
+            "target": target,
+            "task_type": task_type,
+            "train_size": train_size,
+            "stratify": stratify,
+            "session_id": session_id,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class FeatureCache:
+    """
+    Resultado do setup do PyCaret em disco (<dir>/<chave>/): matrizes de
+    treino/teste já transformadas em .npy (abertas com memory-map), o
+    pipeline de pré-processamento ajustado e os candidatos do compare.
+    """
+
+    def __init__(self, root=FEATURE_CACHE_DIR):
+        self.root = root
+
+    def _dir(self, key):
+        return os.path.join(self.root, key)
+
+    def get(self, key):
+        entry_dir = self._dir(key)
+        if not os.path.exists(os.path.join(entry_dir, "complete")):
+            return None
+        entry = {name: np.load(os.path.join(entry_dir, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+        entry["pipeline"] = joblib.load(os.path.join(entry_dir, "pipeline.joblib"))
+        entry["candidates"] = joblib.load(os.path.join(entry_dir, "candidates.joblib"))
+        with open(os.path.join(entry_dir, "columns.json"), "r", encoding="utf-8") as f:
+            entry["columns"] = json.load(f)
+        logger.info(f"Cache de features: hit {key}")
+        return entry
+
+    def put(self, key, X_train, y_train, X_test, y_test, pipeline, candidates):
+        entry_dir = self._dir(key)
+        # Grava num diretório temporário e renomeia: leitores nunca veem entrada parcial
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        arrays = {"X_train": X_train, "y_train": y_train, "X_test": X_test, "y_test": y_test}
+        for name, values in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(values))
+        joblib.dump(pipeline, os.path.join(tmp_dir, "pipeline.joblib"))
+        joblib.dump(candidates, os.path.join(tmp_dir, "candidates.joblib"))
+        with open(os.path.join(tmp_dir, "columns.json"), "w", encoding="utf-8") as f:
+            json.dump([str(c) for c in getattr(X_train, "columns", [])], f)
+        open(os.path.join(tmp_dir, "complete"), "w").close()
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+        logger.info(f"Cache de features: gravado {key}")
@@ -0,0 +1,66 @@
+import os
+import threading
+
+from config.logger import logger
+from ports.dataset_port import DatasetPort, RemoteFile
+
+# Um cliente autenticado por processo (autenticar a cada download custa uma ida ao servidor)
+_api = None
+_api_lock = threading.Lock()
+
+
+def _kaggle_api():
+    global _api
+    with _api_lock:
+        if _api is None:
+            # Import sob demanda: o cliente do Kaggle só é carregado no download
+            from kaggle.api.kaggle_api_extended import KaggleApi
+            api = KaggleApi()
+            api.authenticate()
+            _api = api
+        return _api
+
+
+class KaggleDatasetAdapter(DatasetPort):
+    """Datasets do Kaggle arquivo a arquivo (owner/slug), com a versão atual do dataset."""
+
+    def dataset_version(self, source_name):
+        owner, slug = source_name.split("/", 1)
+        try:
+            info = _kaggle_api().datasets_view(owner, slug)
+        except Exception as e:
+            logger.warning(f"Versão do dataset {source_name} indisponível: {e}")
+            return None
+        if not isinstance(info, dict):
+            info = getattr(info, "__dict__", {})
+        version = info.get("currentVersionNumber") or info.get("current_version_number")
+        updated = info.get("lastUpdated") or info.get("last_updated")
+        if version is None and updated is None:
+            return None
+        return f"{version}:{updated}"
+
+    def list_files(self, source_name):
+        api = _kaggle_api()
+        files, token = [], None
+        while True:
+            result = api.dataset_list_files(source_name, page_token=token) if token else api.dataset_list_files(source_name)
+            for f in result.files:
+                size = getattr(f, "totalBytes", None)
+                files.append(RemoteFile(
+                    name=f.name,
+                    size=int(size) if size is not None else None,
+                    modified=str(getattr(f, "creationDate", "") or "") or None,
+                ))
+            token = getattr(result, "nextPageToken", None)
+            if not token:
+                return files
+
+    def download_file(self, source_name, file_name, dest_dir):
+        os.makedirs(dest_dir, exist_ok=True)
+        _kaggle_api().dataset_download_file(source_name, file_name, path=dest_dir, force=True, quiet=True)
+        # O Kaggle manda arquivos grandes compactados: <nome>.zip
+        local = os.path.join(dest_dir, os.path.basename(file_name))
+        for candidate in (local, f"{local}.zip"):
+            if os.path.exists(candidate):
+                return candidate
+        raise FileNotFoundError(f"Download de {file_name} não gerou arquivo em {dest_dir}")
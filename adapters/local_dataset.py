@@ -0,0 +1,46 @@
+import hashlib
+import os
+import shutil
+import zipfile
+
+from ports.dataset_port import DatasetPort, RemoteFile
+
+
+class LocalDirectoryDataset(DatasetPort):
+    """
+    Fonte falsa para testes e uso offline: o dataset "owner/slug" é o
+    diretório <root>/owner/slug. Com compress=True entrega cada arquivo
+    num .zip, como o Kaggle faz com os arquivos grandes.
+    """
+
+    def __init__(self, root, compress=False):
+        self.root = root
+        self.compress = compress
+        self.downloads = []  # arquivos entregues, para conferir o que foi baixado
+
+    def _dir(self, source_name):
+        return os.path.join(self.root, *source_name.split("/"))
+
+    def list_files(self, source_name):
+        files = []
+        with os.scandir(self._dir(source_name)) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append(RemoteFile(entry.name, stat.st_size, str(stat.st_mtime_ns)))
+        return files
+
+    def dataset_version(self, source_name):
+        listing = "\n".join(f"{f.name}:{f.size}:{f.modified}" for f in self.list_files(source_name))
+        return hashlib.sha1(listing.encode("utf-8")).hexdigest()[:16]
+
+    def download_file(self, source_name, file_name, dest_dir):
+        os.makedirs(dest_dir, exist_ok=True)
+        source = os.path.join(self._dir(source_name), file_name)
+        self.downloads.append(file_name)
+        if not self.compress:
+            return shutil.copy2(source, os.path.join(dest_dir, file_name))
+        archive = os.path.join(dest_dir, f"{file_name}.zip")
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(source, arcname=file_name)
+        return archive
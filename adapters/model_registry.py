@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from config.logger import logger
+from config.settings import MODELS_DIR, MODEL_CACHE_SIZE
+from processing.eda_cache import dataframe_content_hash
+
+# Parâmetros que não mudam o modelo resultante ficam fora da chave
+_KEY_IGNORED_PARAMS = {"max_workers", "on_update"}
+
+# Pipelines já desserializados, compartilhados entre sessões (LRU)
+_loaded_models = OrderedDict()
+_loaded_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Pipelines treinados em disco (./models/<chave>/), com chave derivada do
+    hash do conteúdo completo do dataset + alvo + tarefa + parâmetros de treino. A leitura
+    é preguiçosa e passa por um LRU em memória por processo.
+    """
+
+    def __init__(self, root=MODELS_DIR, cache_size=MODEL_CACHE_SIZE):
+        self.root = root
+        self.cache_size = cache_size
+
+    @staticmethod
+    def make_key(df, target, task_type, params):
+        relevant = {k: v for k, v in params.items() if k not in _KEY_IGNORED_PARAMS}
+        payload = json.dumps(
+            {
+                "data": dataframe_content_hash(df),
+                "columns": list(df.columns),
+                "target": target,
+                "task_type": task_type,
+                "params": relevant,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _dir(self, key):
+        return os.path.join(self.root, key)
+
+    def model_path(self, key):
+        # Caminho sem extensão: o save_model do PyCaret acrescenta .pkl
+        return os.path.join(self._dir(key), "model")
+
+    def exists(self, key):
+        return os.path.exists(os.path.join(self._dir(key), "meta.json"))
+
+    def save(self, key, model, task_type, target, features, params, leaderboard=None, artifacts=None,
+             saver=None):
+        """Serializa o pipeline e grava meta.json por último (marca a entrada como completa)."""
+        os.makedirs(self._dir(key), exist_ok=True)
+        if saver is None:
+            from adapters.pycaret_adapter import PyCaretAdapter
+            saver = PyCaretAdapter()
+        saver.save_model(model, task_type, self.model_path(key))
+        if artifacts is not None:
+            # Arrays da avaliação do holdout (processing.evaluation)
+            np.savez_compressed(os.path.join(self._dir(key), "eval.npz"), **artifacts)
+        meta = {
+            "key": key,
+            "task_type": task_type,
+            "target": target,
+            "features": list(features),
+            "params": {k: v for k, v in params.items() if k not in _KEY_IGNORED_PARAMS},
+            "model_name": type(model).__name__ if not hasattr(model, "steps") else type(model.steps[-1][1]).__name__,
+            "created_at": time.time(),
+            "leaderboard": leaderboard.to_dict(orient="records") if leaderboard is not None else None,
+        }
+        tmp_meta = os.path.join(self._dir(key), "meta.json.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, default=str)
+        os.replace(tmp_meta, os.path.join(self._dir(key), "meta.json"))
+        logger.info(f"Modelo registrado: {key} ({meta['model_name']})")
+        return meta
+
+    def meta(self, key):
+        with open(os.path.join(self._dir(key), "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def entries(self):
+        """Metadados de todos os modelos, mais recentes primeiro (sem desserializar nada)."""
+        if not os.path.exists(self.root):
+            return []
+        metas = [self.meta(k) for k in os.listdir(self.root) if self.exists(k)]
+        return sorted(metas, key=lambda m: m["created_at"], reverse=True)
+
+    def has_artifacts(self, key):
+        return os.path.exists(os.path.join(self._dir(key), "eval.npz"))
+
+    def figures(self, key):
+        """
+        PNGs de avaliação {família: bytes}: renderizados dos arrays na primeira
+        vez (em paralelo) e guardados ao lado do modelo para as próximas.
+        """
+        from processing.evaluation import evaluation_figures
+        entry_dir = self._dir(key)
+        cached = sorted(f for f in os.listdir(entry_dir) if f.startswith("eval-") and f.endswith(".png"))
+        if cached:
+            figures = {}
+            for name in cached:
+                with open(os.path.join(entry_dir, name), "rb") as f:
+                    figures[name[len("eval-"):-len(".png")]] = f.read()
+            return figures
+        with np.load(os.path.join(entry_dir, "eval.npz")) as data:
+            artifacts = dict(data)
+        figures = evaluation_figures(artifacts, self.meta(key)["task_type"])
+        for name, png in figures.items():
+            with open(os.path.join(entry_dir, f"eval-{name}.png"), "wb") as f:
+                f.write(png)
+        return figures
+
+    def load(self, key):
+        """Retorna (pipeline, meta); desserializa só na primeira vez por processo."""
+        meta = self.meta(key)
+        with _loaded_lock:
+            if key in _loaded_models:
+                _loaded_models.move_to_end(key)
+                return _loaded_models[key], meta
+        from adapters.pycaret_adapter import PyCaretAdapter
+        model = PyCaretAdapter().load_model(meta["task_type"], self.model_path(key))
+        with _loaded_lock:
+            _loaded_models[key] = model
+            while len(_loaded_models) > self.cache_size:
+                _loaded_models.popitem(last=False)
+        return model, meta
@@ -0,0 +1,19 @@
+import pandas as pd
+from ports.profiling_port import ProfilingPort
+from processing.profiling import compute_profile
+from processing.data_analysis import plot_numeric_distribution, plot_missing_values
+
+
+class NumpyProfiler(ProfilingPort):
+    """
+    Perfil calculado numa passada vetorizada pelos buffers NumPy
+    (processing.profiling), memoizado pelo fingerprint do DataFrame.
+    """
+
+    def profile(self, df: pd.DataFrame) -> dict:
+        return compute_profile(df)
+
+    def generate_report(self, df: pd.DataFrame) -> None:
+        # Os gráficos apenas renderizam a partir do perfil já calculado
+        plot_numeric_distribution(df)
+        plot_missing_values(df)
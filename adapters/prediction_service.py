@@ -0,0 +1,206 @@
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty, Queue
+
+import numpy as np
+import pandas as pd
+
+from config.logger import logger
+from config.settings import SERVING_MAX_BATCH, SERVING_MAX_WAIT_MS
+
+# Janela (em requisições) usada para percentis de latência e vazão
+METRICS_WINDOW = 10000
+
+
+class ServingMetrics:
+    """Contadores + janela deslizante de latências (thread-safe)."""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self._latencies = deque(maxlen=window)
+        self._finished = deque(maxlen=window)
+
+    def record_batch(self, size):
+        with self._lock:
+            self.batches += 1
+            self.batch_rows += size
+
+    def record_request(self, latency, ok=True):
+        with self._lock:
+            self.requests += 1
+            self.errors += 0 if ok else 1
+            self._latencies.append(latency)
+            self._finished.append(time.monotonic())
+
+    def snapshot(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            finished = list(self._finished)
+            snap = {
+                "uptime_s": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "errors": self.errors,
+                "batches": self.batches,
+                "mean_batch_size": round(self.batch_rows / self.batches, 2) if self.batches else 0.0,
+            }
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            snap.update(latency_ms_p50=round(p50, 2), latency_ms_p95=round(p95, 2), latency_ms_p99=round(p99, 2))
+        if len(finished) > 1 and finished[-1] > finished[0]:
+            snap["throughput_rps"] = round((len(finished) - 1) / (finished[-1] - finished[0]), 1)
+        return snap
+
+
+class MicroBatcher:
+    """
+    Junta registros de requisições concorrentes num único DataFrame: um lote
+    sai quando chega a max_batch_size ou quando o primeiro registro esperou
+    max_wait_ms. O pipeline roda uma vez por lote.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=SERVING_MAX_BATCH, max_wait_ms=SERVING_MAX_WAIT_MS,
+                 metrics=None):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics or ServingMetrics()
+        self._queue = Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="siamd-microbatcher")
+        self._thread.start()
+
+    def submit(self, record):
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self, batch):
+        records = [record for record, _ in batch]
+        predictions = self.predict_fn(pd.DataFrame(records))
+        if len(predictions) != len(batch):
+            # Sem isto o zip deixaria requisições esperando para sempre
+            raise ValueError(f"Previsão devolveu {len(predictions)} linhas para {len(batch)} registros.")
+        for (_, future), prediction in zip(batch, predictions):
+            future.set_result(prediction)
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            self.metrics.record_batch(len(batch))
+            try:
+                self._run(batch)
+            except Exception:
+                # Um registro inválido não derruba o lote: refaz um a um
+                for item in batch:
+                    try:
+                        self._run([item])
+                    except Exception as e:
+                        item[1].set_exception(e)
+
+
+def make_predict_fn(model, task_type, features):
+    """Função DataFrame → lista de dicts com as colunas de previsão do PyCaret."""
+    from adapters.pycaret_adapter import PyCaretAdapter
+    adapter = PyCaretAdapter()
+
+    def predict(df):
+        scored = adapter.predict(model, df.reindex(columns=features), task_type)
+        columns = [c for c in scored.columns if c.startswith("prediction_") or c == "Cluster"]
+        return scored[columns].to_dict(orient="records")
+
+    return predict
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    batcher = None
+    model_info = None
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "model": self.model_info})
+        elif self.path == "/metrics":
+            self._send(200, self.batcher.metrics.snapshot())
+        else:
+            self._send(404, {"error": "rota não encontrada"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send(404, {"error": "rota não encontrada"})
+            return
+        started = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send(400, {"error": f"JSON inválido: {e}"})
+            return
+        # Aceita um registro ou uma lista; cada registro entra no micro-lote
+        records = payload if isinstance(payload, list) else [payload]
+        futures = [self.batcher.submit(r) for r in records]
+        try:
+            predictions = [f.result() for f in futures]
+        except Exception as e:
+            self.batcher.metrics.record_request(time.perf_counter() - started, ok=False)
+            self._send(422, {"error": str(e)})
+            return
+        self.batcher.metrics.record_request(time.perf_counter() - started)
+        self._send(200, predictions if isinstance(payload, list) else predictions[0])
+
+    def log_message(self, format, *args):
+        # Sem log por requisição no stderr; métricas ficam em /metrics
+        pass
+
+
+class _PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Backlog padrão (5) recusa conexões em rajadas de requisições concorrentes
+    request_queue_size = 256
+
+
+def serve(registry, key, host="127.0.0.1", port=8765, max_batch_size=SERVING_MAX_BATCH,
+          max_wait_ms=SERVING_MAX_WAIT_MS):
+    """Carrega o pipeline uma vez e atende POST /predict, GET /metrics e GET /health."""
+    model, meta = registry.load(key)
+    predict_fn = make_predict_fn(model, meta["task_type"], meta["features"])
+    handler = type("PredictionHandler", (_Handler,), {
+        "batcher": MicroBatcher(predict_fn, max_batch_size, max_wait_ms),
+        "model_info": {k: meta[k] for k in ("key", "task_type", "target", "features", "model_name")},
+    })
+    server = _PredictionServer((host, port), handler)
+    logger.info(f"Serviço de previsão em http://{host}:{port} (modelo {key})")
+    return server
@@ -1,24 +1,152 @@
+import copy
+import logging
+
+import joblib
+import numpy as np
 import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import KFold, StratifiedKFold
 from ports.training_port import TrainingPort
+from adapters.training_scheduler import ModelScheduler
+from adapters.feature_cache import FeatureCache, feature_key
+from adapters.sparse_text_trainer import SparseTextPipeline, predict_frame, train_sparse_text_model
+from adapters import clustering_engine
+from processing.data_sizing import learning_curve_size, stratified_sample
+from processing.text_features import TEXT_COLUMNS
+from processing.evaluation import estimator_artifacts
+from config.instrumentation import span, traced
 
 # PyCaret tasks + imports para análise de modelo
 from pycaret.classification import (
     setup as class_setup,
-    compare_models as class_compare,
-    plot_model as clf_plot
+    create_model as class_create,
+    models as class_models,
+    get_config as class_get_config,
+    plot_model as clf_plot,
+    save_model as class_save,
+    load_model as class_load,
+    predict_model as class_predict
 )
 from pycaret.regression import (
     setup as reg_setup,
-    compare_models as reg_compare,
-    plot_model as reg_plot
+    create_model as reg_create,
+    models as reg_models,
+    get_config as reg_get_config,
+    plot_model as reg_plot,
+    save_model as reg_save,
+    load_model as reg_load,
+    predict_model as reg_predict
 )
 from pycaret.clustering import (
-    setup as clus_setup,
-    create_model as clus_create,
-    plot_model as clus_plot
+    plot_model as clus_plot,
+    save_model as clus_save,
+    load_model as clus_load,
+    predict_model as clus_predict
 )
 
+# Semente do setup; faz parte da chave do cache de features
+SESSION_ID = 123
+
+
+def _decode_classes(pipeline, classes):
+    # Alvo codificado pelo LabelEncoder do pipeline do PyCaret → nomes originais
+    for _, step in getattr(pipeline, "steps", []):
+        encoder = getattr(step, "transformer", None)
+        if hasattr(encoder, "classes_") and hasattr(encoder, "inverse_transform"):
+            try:
+                return encoder.inverse_transform(np.asarray(classes))
+            except Exception:
+                break
+    return None
+
+
 class PyCaretAdapter(TrainingPort):
+    def __init__(self, feature_cache=None):
+        self.leaderboard = None
+        self.learning_curve = None
+        self.setup_active = False
+        self.eval_artifacts = None
+        self.feature_cache = feature_cache or FeatureCache()
+
+    def _size_data(self, df, target, task_type):
+        """Reduz df à amostra estratificada escolhida pela curva de aprendizado."""
+        with span("learning_curve", rows=len(df)):
+            n_rows, self.learning_curve = learning_curve_size(df, target, task_type)
+        return stratified_sample(df, target, n_rows, task_type)
+
+    def _candidates(self, models_fn):
+        # Modelos turbo do PyCaret, ainda não treinados
+        table = models_fn(internal=True)
+        table = table[table["Turbo"] & ~table["Special"]]
+        return {
+            model_id: (row["Name"], row["Class"](**row["Args"]))
+            for model_id, row in table.iterrows()
+        }
+
+    def _scheduled_compare(self, candidates, X, y, splits, task_type, time_budget, max_workers, on_update):
+        """
+        Substitui o compare_models padrão: candidatos e folds rodam em paralelo
+        com successive halving e orçamento de tempo. Retorna o id do vencedor.
+        """
+        scheduler = ModelScheduler(max_workers=max_workers, time_budget=time_budget)
+        with span("compare", rows=len(y), candidates=len(candidates)):
+            self.leaderboard, best_id = scheduler.run(
+                candidates, X, y, splits, task_type, on_update=on_update
+            )
+        return best_id
+
+    def _train_with_setup(self, df, target, task_type, setup_fn, setup_kwargs, models_fn, create_fn,
+                          get_config_fn, cache_key, cv_folds, time_budget, max_workers, on_update):
+        with span("setup", rows=len(df)):
+            # Log do PyCaret vai para a fila da aplicação (nível em LIBRARY_LOG_LEVELS), não para logs.log
+            setup_fn(data=df, target=target, session_id=SESSION_ID, html=False, fold=cv_folds,
+                     system_log=logging.getLogger("pycaret"), **setup_kwargs)
+        self.setup_active = True
+        X = get_config_fn("X_train_transformed")
+        y = get_config_fn("y_train_transformed")
+        candidates = self._candidates(models_fn)
+        self.feature_cache.put(
+            cache_key, X, y, get_config_fn("X_test_transformed"), get_config_fn("y_test_transformed"),
+            get_config_fn("pipeline"), candidates
+        )
+        splits = list(get_config_fn("fold_generator").split(X, y))
+        best_id = self._scheduled_compare(candidates, X, y, splits, task_type, time_budget, max_workers, on_update)
+        # Vencedor refeito no treino completo pelo create_model
+        with span("create_model", rows=len(y), model=best_id):
+            best_model = create_fn(best_id, cross_validation=False, verbose=False)
+        self._evaluate(best_model, get_config_fn("X_test_transformed"), get_config_fn("y_test_transformed"),
+                       task_type, get_config_fn("pipeline"))
+        return best_model
+
+    def _evaluate(self, estimator, X_test, y_test, task_type, pipeline):
+        """Pontua o holdout transformado uma vez; os gráficos saem depois desses arrays."""
+        class_names = None
+        if task_type == "classification" and hasattr(estimator, "classes_"):
+            class_names = _decode_classes(pipeline, estimator.classes_)
+        with span("evaluate", rows=len(y_test)):
+            self.eval_artifacts = estimator_artifacts(estimator, X_test, y_test, task_type, class_names)
+
+    def _train_from_cache(self, cached, task_type, cv_folds, time_budget, max_workers, on_update):
+        """
+        Sem setup: usa as matrizes memory-mapped do cache, os mesmos folds que o
+        PyCaret geraria (Stratified/KFold sem shuffle) e devolve o pipeline
+        de pré-processamento cacheado + o vencedor treinado no treino completo.
+        """
+        X, y = cached["X_train"], cached["y_train"]
+        splitter = StratifiedKFold(cv_folds) if task_type == "classification" else KFold(cv_folds)
+        splits = list(splitter.split(X, y))
+        candidates = cached["candidates"]
+        best_id = self._scheduled_compare(candidates, X, y, splits, task_type, time_budget, max_workers, on_update)
+        with span("create_model", rows=len(y), model=best_id):
+            estimator = clone(candidates[best_id][1]).fit(np.asarray(X), np.asarray(y))
+        self._evaluate(estimator, np.asarray(cached["X_test"]), np.asarray(cached["y_test"]),
+                       task_type, cached["pipeline"])
+        pipeline = copy.deepcopy(cached["pipeline"])
+        pipeline.steps.append(("trained_model", estimator))
+        self.setup_active = False
+        return pipeline
+
+    @traced("train_model")
     def train_model(
         self,
         df: pd.DataFrame,
@@ -26,51 +154,89 @@ class PyCaretAdapter(TrainingPort):
         task_type: str,
         cv_folds: int = 5,
         train_size: float = 0.8,
-        stratify: bool = True
+        stratify: bool = True,
+        time_budget: float = None,
+        max_workers: int = None,
+        auto_size: bool = False,
+        text_features: bool = False,
+        on_update=None
     ):
-        if task_type == "classification":
-            # Classificação com CV e controle de estratificação
-            class_setup(
-                data=df,
-                target=target,
-                session_id=123,
-                html=False,
-                fold=cv_folds,
-                train_size=train_size,
-                train_test_split_stratify=stratify
-            )
-            best_model = class_compare()
-            print("Best Classification Model:", best_model)
+        if auto_size and task_type in ("classification", "regression"):
+            # Treino final só com as linhas que a curva de aprendizado justifica
+            df = self._size_data(df, target, task_type)
+
+        has_text = any(c in TEXT_COLUMNS for c in df.columns if c != target)
+        if text_features and has_text and task_type in ("classification", "regression"):
+            # Texto hasheado em matriz esparsa: modelos lineares, fora do setup do PyCaret
+            with span("compare_sparse_text", rows=len(df)):
+                best_model, self.leaderboard, self.eval_artifacts = train_sparse_text_model(
+                    df, target, task_type, cv_folds=cv_folds, max_workers=max_workers, on_update=on_update
+                )
+            self.setup_active = False
+            print(f"Best Sparse {task_type.capitalize()} Model:", best_model)
             return best_model
 
-        elif task_type == "regression":
-            # Regressão com CV
-            reg_setup(
-                data=df,
-                target=target,
-                session_id=123,
-                html=False,
-                fold=cv_folds,
-                train_size=train_size
-            )
-            best_model = reg_compare()
-            print("Best Regression Model:", best_model)
+        if task_type in ("classification", "regression"):
+            # Setup já feito com os mesmos dados/divisão: pula direto para o compare
+            cache_key = feature_key(df, target, task_type, train_size, stratify, SESSION_ID)
+            cached = self.feature_cache.get(cache_key)
+            if cached is not None:
+                best_model = self._train_from_cache(cached, task_type, cv_folds, time_budget, max_workers, on_update)
+            elif task_type == "classification":
+                # Classificação com CV e controle de estratificação
+                best_model = self._train_with_setup(
+                    df, target, task_type, class_setup,
+                    dict(train_size=train_size, train_test_split_stratify=stratify),
+                    class_models, class_create, class_get_config,
+                    cache_key, cv_folds, time_budget, max_workers, on_update
+                )
+            else:
+                # Regressão com CV
+                best_model = self._train_with_setup(
+                    df, target, task_type, reg_setup, dict(train_size=train_size),
+                    reg_models, reg_create, reg_get_config,
+                    cache_key, cv_folds, time_budget, max_workers, on_update
+                )
+            print(f"Best {task_type.capitalize()} Model:", best_model)
             return best_model
 
         elif task_type == "clustering":
-            # Clusterização padrão (KMeans)
-            clus_setup(
-                data=df,
-                session_id=123,
-                html=False
-            )
-            best_model = clus_create("kmeans")
+            # KMeans (mini-batch em frames grandes) com k escolhido por sweep paralelo
+            with span("cluster_sweep", rows=len(df)):
+                best_model, self.leaderboard = clustering_engine.train_clustering(df, max_workers=max_workers)
+            self.setup_active = False
             print("Clustering Model:", best_model)
             return best_model
 
         else:
             raise ValueError("task_type deve ser 'classification', 'regression' ou 'clustering'")
 
+    def save_model(self, model, task_type: str, path: str):
+        """Salva o pipeline completo (pré-processamento + modelo) em <path>.pkl."""
+        if not self.setup_active:
+            # Modelo vindo do cache de features já é o pipeline completo; sem
+            # setup ativo o save_model do PyCaret não tem experimento
+            joblib.dump(model, f"{path}.pkl")
+            return
+        save_fn = {"classification": class_save, "regression": reg_save}.get(task_type, clus_save)
+        save_fn(model, path, verbose=False)
+
+    def load_model(self, task_type: str, path: str):
+        load_fn = {"classification": class_load, "regression": reg_load}.get(task_type, clus_load)
+        return load_fn(path, verbose=False)
+
+    @traced("predict")
+    def predict(self, model, df: pd.DataFrame, task_type: str) -> pd.DataFrame:
+        """Aplica o pipeline a um DataFrame inteiro (entrada + colunas prediction_*)."""
+        if isinstance(model, SparseTextPipeline):
+            return predict_frame(model, df)
+        if isinstance(model, clustering_engine.ClusteringPipeline):
+            return clustering_engine.predict_frame(model, df)
+        if task_type == "clustering":
+            return clus_predict(model, data=df)
+        predict_fn = class_predict if task_type == "classification" else reg_predict
+        return predict_fn(model, data=df, verbose=False)
+
     def analyze_model(self, model, task_type: str):
         """
         Exibe gráficos de avaliação do modelo no Streamlit usando plot_model().
@@ -83,6 +249,18 @@ class PyCaretAdapter(TrainingPort):
             reg_plot(model, plot="residuals", display_format="streamlit")
             reg_plot(model, plot="error", display_format="streamlit")
 
+        elif isinstance(model, clustering_engine.ClusteringPipeline):
+            # Elbow/silhouette do sweep já calculado no treino: nenhum refit aqui
+            import streamlit as st
+            sweep = model.k_sweep_.set_index("k")
+            c1, c2 = st.columns(2)
+            c1.metric("k escolhido (silhouette)", model.named_steps["model"].n_clusters)
+            c2.metric("k pelo cotovelo (inércia)", model.elbow_k_)
+            st.write("**Elbow (inércia por k):**")
+            st.line_chart(sweep["inertia"])
+            st.write("**Silhouette por k:**")
+            st.line_chart(sweep["silhouette"])
+
         else:  # clustering
             clus_plot(model, plot="elbow", display_format="streamlit")
             clus_plot(model, plot="cluster", display_format="streamlit")
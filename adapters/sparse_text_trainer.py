@@ -0,0 +1,157 @@
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import Ridge, SGDClassifier, SGDRegressor
+from sklearn.model_selection import KFold, StratifiedKFold, cross_val_predict, cross_val_score
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+from adapters.training_scheduler import DEFAULT_METRIC
+from config.logger import logger
+from processing.evaluation import classification_artifacts, regression_artifacts
+from processing.text_features import HASH_N_FEATURES, TEXT_COLUMNS, hash_text
+
+# Modelos lineares que treinam direto na matriz esparsa (sem densificar)
+SPARSE_CANDIDATES = {
+    "classification": {
+        "sgd_log": ("SGD (log loss)", SGDClassifier(loss="log_loss", alpha=1e-5, random_state=123)),
+        "sgd_hinge": ("SGD (SVM linear)", SGDClassifier(loss="hinge", alpha=1e-5, random_state=123)),
+    },
+    "regression": {
+        "ridge": ("Ridge (sparse_cg)", Ridge(alpha=1.0, solver="sparse_cg")),
+        "sgd_huber": ("SGD (huber)", SGDRegressor(loss="huber", alpha=1e-5, random_state=123)),
+    },
+}
+
+
+class TextHashingTransformer(BaseEstimator, TransformerMixin):
+    """Passo sklearn para as colunas de texto: hashing sem estado (fit não aprende nada)."""
+
+    def __init__(self, n_features=HASH_N_FEATURES, n_jobs=None):
+        self.n_features = n_features
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y=None):
+        self.columns_ = list(X.columns)
+        return self
+
+    def transform(self, X):
+        return hash_text(X, self.columns_, self.n_features, n_jobs=self.n_jobs)
+
+
+class SparseTextPipeline(Pipeline):
+    """Pipeline de features esparsas + modelo linear; previsto fora do PyCaret."""
+
+
+def _datetime_days(X):
+    return X.apply(lambda s: pd.to_datetime(s).astype("int64") / 86400e9).where(X.notna())
+
+
+def _as_text(X):
+    return X.astype(str)
+
+
+def build_preprocessor(df, target, text_columns=TEXT_COLUMNS, n_jobs=None):
+    """ColumnTransformer com saída esparsa: números escalados, datas em dias, categorias one-hot, texto hasheado."""
+    features = [c for c in df.columns if c != target]
+    text = [c for c in features if c in text_columns]
+    dates = [c for c in features if c not in text and pd.api.types.is_datetime64_any_dtype(df[c])]
+    numeric = [
+        c for c in features if c not in text and c not in dates
+        and (pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c]))
+    ]
+    categorical = [c for c in features if c not in text + dates + numeric]
+    transformers = []
+    if numeric:
+        transformers.append(("num", make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), numeric))
+    if dates:
+        transformers.append(("date", make_pipeline(
+            FunctionTransformer(_datetime_days), SimpleImputer(strategy="median"), StandardScaler()
+        ), dates))
+    if categorical:
+        transformers.append(("cat", make_pipeline(
+            FunctionTransformer(_as_text), OneHotEncoder(handle_unknown="ignore", min_frequency=5)
+        ), categorical))
+    if text:
+        transformers.append(("text", TextHashingTransformer(n_jobs=n_jobs), text))
+    return ColumnTransformer(transformers, sparse_threshold=1.0)
+
+
+def train_sparse_text_model(df, target, task_type, cv_folds=5, max_workers=None, on_update=None):
+    """
+    Transforma uma vez (o hashing não tem estado), compara os candidatos
+    esparsos por CV em paralelo e retorna (SparseTextPipeline, leaderboard,
+    artefatos de avaliação das previsões out-of-fold do vencedor).
+    """
+    df = df[df[target].notna()]
+    X_frame, y = df.drop(columns=[target]), df[target]
+    preprocessor = build_preprocessor(df, target, n_jobs=max_workers)
+    started = time.perf_counter()
+    X = preprocessor.fit_transform(X_frame)
+    logger.info(
+        f"Features esparsas: {X.shape[0]}×{X.shape[1]}, {X.nnz} valores não nulos "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+
+    scoring = DEFAULT_METRIC[task_type]
+    if task_type == "classification":
+        splitter = StratifiedKFold(cv_folds, shuffle=True, random_state=123)
+    else:
+        splitter = KFold(cv_folds, shuffle=True, random_state=123)
+    candidates = SPARSE_CANDIDATES[task_type]
+    rows = []
+    for cid, (name, estimator) in candidates.items():
+        fold_started = time.perf_counter()
+        try:
+            scores = cross_val_score(clone(estimator), X, y, cv=splitter, scoring=scoring, n_jobs=max_workers)
+            status = "ativo"
+        except Exception as e:
+            logger.warning(f"Candidato esparso {cid} falhou: {e}")
+            scores, status = [], "erro"
+        rows.append({
+            "ID": cid,
+            "Modelo": name,
+            scoring: np.mean(scores) if len(scores) else np.nan,
+            "Folds": len(scores),
+            "Tempo (s)": round(time.perf_counter() - fold_started, 2),
+            "Status": status,
+        })
+        board = pd.DataFrame(rows).sort_values(scoring, ascending=False, na_position="last").reset_index(drop=True)
+        if on_update is not None:
+            on_update(board)
+
+    scored = board[board["Status"] != "erro"].dropna(subset=[scoring])
+    if scored.empty:
+        raise RuntimeError("Nenhum modelo esparso concluiu a validação cruzada.")
+    best_id = scored.iloc[0]["ID"]
+    artifacts = _out_of_fold_artifacts(candidates[best_id][1], X, y, splitter, task_type, max_workers)
+    model = clone(candidates[best_id][1]).fit(X, y)
+    return SparseTextPipeline([("features", preprocessor), ("model", model)]), board, artifacts
+
+
+def _out_of_fold_artifacts(estimator, X, y, splitter, task_type, n_jobs):
+    # Sem holdout separado: cada linha é prevista pelo fold que não a viu
+    if task_type == "regression":
+        return regression_artifacts(y, cross_val_predict(clone(estimator), X, y, cv=splitter, n_jobs=n_jobs))
+    method = "predict_proba" if hasattr(estimator, "predict_proba") else "decision_function"
+    y_score = cross_val_predict(clone(estimator), X, y, cv=splitter, method=method, n_jobs=n_jobs)
+    classes = np.unique(y)
+    if y_score.ndim == 1:
+        y_pred = classes[(y_score > 0).astype(int)]
+    else:
+        y_pred = classes[np.argmax(y_score, axis=1)]
+    return classification_artifacts(y, y_pred, y_score, classes)
+
+
+def predict_frame(model, df):
+    """Mesmo formato do predict_model do PyCaret: entrada + prediction_label (+ prediction_score)."""
+    features = df[model.named_steps["features"].feature_names_in_]
+    result = df.copy()
+    result["prediction_label"] = model.predict(features)
+    if hasattr(model, "predict_proba"):
+        result["prediction_score"] = model.predict_proba(features).max(axis=1).round(4)
+    return result
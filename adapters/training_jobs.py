@@ -0,0 +1,311 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+from config.logger import attach_worker_queue, logger, worker_log_queue
+from config.settings import JOBS_DIR, MODELS_DIR, TRAINING_MAX_CONCURRENT_JOBS
+from adapters.model_registry import ModelRegistry
+from ports.training_job_port import TrainingJobPort
+from ports.training_port import TrainingPort
+
+# Intervalo do despachante entre verificações da fila
+POLL_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    target TEXT NOT NULL,
+    features TEXT NOT NULL,
+    params TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    pid INTEGER,
+    progress REAL DEFAULT 0,
+    message TEXT,
+    leaderboard TEXT,
+    result_path TEXT,
+    registry_key TEXT,
+    registry_root TEXT,
+    error TEXT
+)
+"""
+
+
+class JobStore:
+    """Estado dos jobs em SQLite: sobrevive a refresh da página e a reinício do servidor."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            # Bancos criados antes do registro de modelos não têm as colunas
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column in ("registry_key", "registry_root"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, job_id, task_type, target, features, params, result_path, registry_key, registry_root):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, task_type, target, features, params, result_path, "
+                "registry_key, registry_root, created_at) VALUES (?, 'queued', ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, task_type, target, json.dumps(features), json.dumps(params), result_path,
+                 registry_key, registry_root, time.time()),
+            )
+
+    def update(self, job_id, **fields):
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def claim(self, job_id, owner_pid):
+        # Transição atômica queued → starting; evita dois despachantes no mesmo job.
+        # O pid do despachante fica no job até o processo de treino gravar o seu
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'starting', pid = ? WHERE id = ? AND status = 'queued'",
+                (owner_pid, job_id),
+            )
+            return cursor.rowcount == 1
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def with_status(self, *statuses):
+        marks = ", ".join("?" for _ in statuses)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM jobs WHERE status IN ({marks}) ORDER BY created_at", statuses
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def recent(self, limit=20):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def _input_path(db_path, job_id):
+    return os.path.join(os.path.dirname(db_path), job_id, "input.parquet")
+
+
+def _remove_input(db_path, job_id):
+    # Frame de treino só serve ao job: terminado (ok ou falha), sai do disco
+    try:
+        os.remove(_input_path(db_path, job_id))
+    except FileNotFoundError:
+        pass
+
+
+def _run_job(db_path, job_id, registry_root, log_queue=None):
+    # Executa em processo próprio (spawn): PyCaret só é importado aqui
+    attach_worker_queue(log_queue)
+    store = JobStore(db_path)
+    job = store.get(job_id)
+    store.update(job_id, status="running", started_at=time.time(), pid=os.getpid())
+    try:
+        from adapters.pycaret_adapter import PyCaretAdapter
+
+        df = pd.read_parquet(_input_path(db_path, job_id))
+        params = json.loads(job["params"])
+        n_folds = params.get("cv_folds", 5)
+
+        def on_update(board):
+            # Progresso aproximado: folds avaliados / folds de todos os candidatos
+            progress = min(0.99, board["Folds"].sum() / max(1, len(board) * n_folds))
+            store.update(job_id, progress=progress, leaderboard=board.to_json(orient="records"))
+
+        adapter = PyCaretAdapter()
+        model = adapter.train_model(df, job["target"], job["task_type"], on_update=on_update, **params)
+        registry = ModelRegistry(registry_root)
+        registry.save(
+            job["registry_key"], model, job["task_type"], job["target"], json.loads(job["features"]),
+            params, leaderboard=adapter.leaderboard, artifacts=adapter.eval_artifacts, saver=adapter
+        )
+        if adapter.leaderboard is not None:
+            store.update(job_id, leaderboard=adapter.leaderboard.to_json(orient="records"))
+        store.update(job_id, status="done", progress=1.0, message=str(model), finished_at=time.time())
+    except Exception:
+        store.update(job_id, status="failed", error=traceback.format_exc(), finished_at=time.time())
+    finally:
+        _remove_input(db_path, job_id)
+
+
+class JobDispatcher(threading.Thread):
+    """Thread que inicia jobs da fila em processos separados, no máximo `max_concurrent` por vez."""
+
+    def __init__(self, db_path, max_concurrent):
+        super().__init__(daemon=True, name="siamd-job-dispatcher")
+        self.store = JobStore(db_path)
+        self.db_path = db_path
+        self.max_concurrent = max_concurrent
+        self._context = multiprocessing.get_context("spawn")
+        self._processes = {}
+        self._recover()
+
+    def _recover(self):
+        # Jobs cujo processo morreu (ex.: servidor reiniciado) viram falha. Em
+        # "starting" o pid é o do despachante que reivindicou o job: se ele
+        # (outro servidor) segue vivo, o job continua dele
+        for job in self.store.with_status("starting", "running"):
+            if not _pid_alive(job["pid"]):
+                self.store.update(
+                    job["id"], status="failed", error="Interrompido (processo encerrado).",
+                    finished_at=time.time()
+                )
+                _remove_input(self.db_path, job["id"])
+
+    def _reap(self):
+        for job_id, process in list(self._processes.items()):
+            if not process.is_alive():
+                process.join()
+                del self._processes[job_id]
+                # Processo morto sem passar pelo finally do _run_job
+                _remove_input(self.db_path, job_id)
+                job = self.store.get(job_id)
+                if job and job["status"] in ("starting", "running"):
+                    self.store.update(
+                        job_id, status="failed",
+                        error=f"Processo terminou com código {process.exitcode}.",
+                        finished_at=time.time()
+                    )
+
+    def _launch(self):
+        for job in self.store.with_status("queued"):
+            if len(self._processes) >= self.max_concurrent:
+                return
+            if not self.store.claim(job["id"], os.getpid()):
+                continue
+            # Jobs antigos (sem a coluna) usam o registro padrão
+            registry_root = job["registry_root"] or MODELS_DIR
+            process = self._context.Process(
+                target=_run_job, args=(self.db_path, job["id"], registry_root, worker_log_queue()),
+                name=f"siamd-job-{job['id']}"
+            )
+            try:
+                process.start()
+            except Exception as e:
+                self.store.update(job["id"], status="failed", error=str(e), finished_at=time.time())
+                _remove_input(self.db_path, job["id"])
+                raise
+            self._processes[job["id"]] = process
+            logger.info(f"Job de treinamento iniciado: {job['id']} (pid {process.pid})")
+
+    def run(self):
+        while True:
+            try:
+                self._reap()
+                self._launch()
+            except Exception as e:
+                logger.error(f"Erro no despachante de jobs: {e}")
+            time.sleep(POLL_SECONDS)
+
+
+_dispatchers = {}
+_dispatchers_lock = threading.Lock()
+
+
+def _ensure_dispatcher(db_path, max_concurrent):
+    # Um despachante por processo do servidor, compartilhado entre sessões
+    with _dispatchers_lock:
+        dispatcher = _dispatchers.get(db_path)
+        if dispatcher is None or not dispatcher.is_alive():
+            dispatcher = JobDispatcher(db_path, max_concurrent)
+            dispatcher.start()
+            _dispatchers[db_path] = dispatcher
+        return dispatcher
+
+
+class TrainingJobQueue(TrainingPort, TrainingJobPort):
+    """
+    TrainingPort + TrainingJobPort com fila persistente: submit_training devolve um id na hora,
+    o treino roda num processo separado e status/progresso ficam em SQLite
+    (entrada em ./jobs/<id>); o modelo final vai para o ModelRegistry.
+    """
+
+    def __init__(self, jobs_dir=JOBS_DIR, max_concurrent=TRAINING_MAX_CONCURRENT_JOBS, registry=None):
+        self.jobs_dir = jobs_dir
+        self.registry = registry or ModelRegistry()
+        self.db_path = os.path.join(jobs_dir, "jobs.sqlite")
+        self.max_concurrent = max_concurrent
+        self.store = JobStore(self.db_path)
+
+    def train_model(self, df: pd.DataFrame, target: str, task_type: str, **params):
+        # Caminho síncrono do port, sem fila
+        from adapters.pycaret_adapter import PyCaretAdapter
+        return PyCaretAdapter().train_model(df, target, task_type, **params)
+
+    def submit_training(self, df: pd.DataFrame, target: str, task_type: str, **params) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        df.to_parquet(os.path.join(job_dir, "input.parquet"), index=False)
+        features = [c for c in df.columns if c != target]
+        key = self.registry.make_key(df, target, task_type, params)
+        self.store.create(job_id, task_type, target, features, params, self.registry.model_path(key), key,
+                          self.registry.root)
+        _ensure_dispatcher(self.db_path, self.max_concurrent)
+        logger.info(f"Job de treinamento enfileirado: {job_id}")
+        return job_id
+
+    def get_job(self, job_id: str) -> dict:
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        job["features"] = json.loads(job["features"])
+        job["params"] = json.loads(job["params"])
+        return job
+
+    def list_jobs(self, limit=20) -> pd.DataFrame:
+        # Garante o despachante também após reinício do servidor (jobs na fila)
+        _ensure_dispatcher(self.db_path, self.max_concurrent)
+        rows = self.store.recent(limit)
+        columns = ["id", "status", "task_type", "target", "progress", "created_at", "finished_at"]
+        jobs = pd.DataFrame(rows, columns=columns)
+        for col in ("created_at", "finished_at"):
+            jobs[col] = pd.to_datetime(jobs[col], unit="s")
+        return jobs
+
+    def load_model(self, job_id: str):
+        job = self.get_job(job_id)
+        if job is None or job["status"] != "done":
+            raise ValueError(f"Job {job_id} não concluído.")
+        model, _ = self.registry.load(job["registry_key"])
+        return model
@@ -0,0 +1,184 @@
+import math
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+
+from config.logger import attach_worker_queue, logger, worker_log_queue
+
+# Métrica usada para ranquear candidatos (mesma ordenação padrão do compare_models)
+DEFAULT_METRIC = {"classification": "accuracy", "regression": "r2"}
+
+# Dados de treino abertos uma vez por processo worker (initializer). Vão por
+# arquivo .npy memory-mapped: passar os arrays em initargs serializa o start
+# dos workers (o pipe do spawn bloqueia até cada filho terminar os imports).
+_worker_data = {}
+
+
+def _init_worker(X_path, y_path, pid_dir, log_queue=None):
+    attach_worker_queue(log_queue)
+    _worker_data["X"] = np.load(X_path, mmap_mode="r")
+    _worker_data["y"] = np.load(y_path, mmap_mode="r")
+    # Registra o pid: ao estourar o orçamento o pai encerra os workers por ele
+    open(os.path.join(pid_dir, str(os.getpid())), "w").close()
+
+
+def _array_file(values, tmp_dir, name):
+    # .npy já memory-mapped (cache de features) vai direto para os workers, sem cópia
+    if isinstance(values, np.memmap) and str(values.filename or "").endswith(".npy"):
+        return str(values.filename)
+    path = os.path.join(tmp_dir, f"{name}.npy")
+    np.save(path, np.asarray(values))
+    return path
+
+
+def _fit_and_score(estimator, train_idx, test_idx, scoring):
+    X, y = _worker_data["X"], _worker_data["y"]
+    started = time.perf_counter()
+    model = clone(estimator)
+    model.fit(X[train_idx], y[train_idx])
+    score = get_scorer(scoring)(model, X[test_idx], y[test_idx])
+    return score, time.perf_counter() - started
+
+
+def _single_thread(estimator):
+    # Paralelismo vem dos processos; evita oversubscription dentro de cada um.
+    # Cópia não treinada: o estimator do chamador não é alterado
+    estimator = clone(estimator)
+    if "n_jobs" in estimator.get_params():
+        estimator.set_params(n_jobs=1)
+    return estimator
+
+
+def _terminate_workers(pid_dir):
+    for name in os.listdir(pid_dir):
+        try:
+            os.kill(int(name), signal.SIGTERM)
+        except (OSError, ValueError):
+            pass  # worker já saiu
+
+
+class ModelScheduler:
+    """
+    Compara candidatos por successive halving: todos começam com poucos folds,
+    a cada rodada só a melhor fração (1/eta) segue e ganha mais folds, até o
+    total de folds do CV. Os pares (modelo, fold) rodam num pool de processos
+    e param ao estourar o orçamento de tempo.
+    """
+
+    def __init__(self, max_workers=None, time_budget=None, eta=2, metric=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.time_budget = time_budget
+        self.eta = eta
+        self.metric = metric
+
+    def _fold_schedule(self, n_candidates, n_folds):
+        # Nº de folds por rodada: cresce até n_folds enquanto a lista encolhe
+        n_rounds = max(1, math.ceil(math.log(max(n_candidates, 1), self.eta)))
+        return [
+            max(1, math.ceil(n_folds / self.eta ** (n_rounds - r - 1)))
+            for r in range(n_rounds)
+        ]
+
+    def run(self, candidates, X, y, splits, task_type, on_update=None):
+        """
+        candidates: {id: (nome, estimator não treinado)}; splits: lista de (train_idx, test_idx).
+        Retorna (leaderboard, id do melhor candidato).
+        """
+        scoring = self.metric or DEFAULT_METRIC[task_type]
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        scores = {cid: [] for cid in candidates}
+        fit_times = {cid: 0.0 for cid in candidates}
+        errors = {}
+        alive = list(candidates)
+
+        def leaderboard():
+            rows = [
+                {
+                    "ID": cid,
+                    "Modelo": candidates[cid][0],
+                    scoring: np.mean(scores[cid]) if scores[cid] else np.nan,
+                    "Folds": len(scores[cid]),
+                    "Tempo (s)": round(fit_times[cid], 2),
+                    "Status": "erro" if cid in errors else ("ativo" if cid in alive else "podado"),
+                }
+                for cid in candidates
+            ]
+            return pd.DataFrame(rows).sort_values(scoring, ascending=False, na_position="last").reset_index(drop=True)
+
+        tmp_dir = tempfile.TemporaryDirectory(prefix="siamd-train-")
+        X_path = _array_file(X, tmp_dir.name, "X")
+        y_path = _array_file(y, tmp_dir.name, "y")
+        pid_dir = os.path.join(tmp_dir.name, "pids")
+        os.makedirs(pid_dir)
+
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=context, initializer=_init_worker,
+            initargs=(X_path, y_path, pid_dir, worker_log_queue()),
+        )
+        timed_out = False
+        try:
+            schedule = self._fold_schedule(len(candidates), len(splits))
+            for round_idx, n_folds in enumerate(schedule):
+                pending = {}
+                for cid in alive:
+                    estimator = _single_thread(candidates[cid][1])
+                    for fold in range(len(scores[cid]), n_folds):
+                        train_idx, test_idx = splits[fold]
+                        future = pool.submit(_fit_and_score, estimator, train_idx, test_idx, scoring)
+                        pending[future] = cid
+
+                while pending:
+                    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                    done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                    if not done:
+                        timed_out = True
+                        break
+                    for future in done:
+                        cid = pending.pop(future)
+                        try:
+                            score, elapsed = future.result()
+                            scores[cid].append(score)
+                            fit_times[cid] += elapsed
+                        except Exception as e:
+                            errors[cid] = str(e)
+                            logger.warning(f"Candidato {cid} falhou: {e}")
+                    if on_update is not None:
+                        on_update(leaderboard())
+
+                if timed_out:
+                    logger.info("Orçamento de tempo esgotado; encerrando comparação.")
+                    break
+
+                if round_idx < len(schedule) - 1:
+                    # Poda: mantém a melhor fração dos candidatos que pontuaram
+                    ranked = sorted(
+                        (cid for cid in alive if cid not in errors and scores[cid]),
+                        key=lambda cid: np.mean(scores[cid]),
+                        reverse=True,
+                    )
+                    alive = ranked[: max(1, math.ceil(len(ranked) / self.eta))]
+        finally:
+            if timed_out:
+                # Não espera fits em andamento: o orçamento é de relógio de parede
+                _terminate_workers(pid_dir)
+            pool.shutdown(wait=not timed_out, cancel_futures=True)
+            tmp_dir.cleanup()
+
+        board = leaderboard()
+        if on_update is not None:
+            on_update(board)
+        scored = board[board["Status"] != "erro"].dropna(subset=[scoring])
+        if scored.empty:
+            raise RuntimeError("Nenhum modelo concluiu um fold dentro do orçamento de tempo.")
+        # Melhor entre os que chegaram mais longe (mais folds avaliados)
+        finalists = scored[scored["Folds"] == scored["Folds"].max()]
+        return board, finalists.iloc[0]["ID"]
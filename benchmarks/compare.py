@@ -0,0 +1,45 @@
+import argparse
+import json
+import sys
+
+
+def _index(path):
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return report, {(r["size"], r["benchmark"]): r for r in report["results"]}
+
+
+def compare(base_path, head_path, threshold=0.10, metric="seconds"):
+    """Linhas (tamanho, benchmark, base, atual, variação) das medições presentes nos dois arquivos."""
+    _, base = _index(base_path)
+    _, head = _index(head_path)
+    rows = []
+    for key in head:
+        if key not in base or metric not in base[key] or metric not in head[key]:
+            continue
+        before, after = base[key][metric], head[key][metric]
+        change = (after - before) / before if before else 0.0
+        rows.append((*key, before, after, change, change > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmarks/run.py")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--metric", default="seconds", choices=["seconds", "peak_mb"])
+    parser.add_argument("--threshold", type=float, default=0.10, help="Piora relativa tolerada (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    rows = compare(args.base, args.head, args.threshold, args.metric)
+    regressions = 0
+    for size, benchmark, before, after, change, regressed in rows:
+        regressions += regressed
+        flag = "  << regressão" if regressed else ""
+        print(f"{size:>5} {benchmark:<40} {before:>12.4f} → {after:>12.4f} ({change:+.1%}){flag}")
+    print(f"{len(rows)} medições comparadas, {regressions} acima de {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+# Roda como `python -m benchmarks.run` a partir da raiz do projeto
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join("benchmarks", "results")
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000, "10M": 10_000_000}
+
+
+def measure(fn, repeat=1, memory=True):
+    """
+    Tempo (melhor de `repeat`, sem tracemalloc ligado) + pico de memória
+    alocada numa execução extra com tracemalloc. Retorna (resultado, métricas).
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    metrics = {"seconds": round(min(times), 6)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        metrics["peak_mb"] = round(peak / 2 ** 20, 3)
+    return result, metrics
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _environment():
+    import numpy
+    import pandas
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+    }
+
+
+def _analysis_cases(df, stats):
+    """(nome, chamada) para cada função de processing.data_analysis sobre o frame carregado."""
+    from processing import data_analysis as da
+
+    multi = df.assign(country="CA")
+    return [
+        ("calculate_null_zero_percentage", lambda: da.calculate_null_zero_percentage(df)),
+        ("missing_values_figure", lambda: da.missing_values_figure(df)),
+        ("plot_missing_values", lambda: da.plot_missing_values(df)),
+        ("numeric_distribution_figure", lambda: da.numeric_distribution_figure(df)),
+        ("plot_numeric_distribution", lambda: da.plot_numeric_distribution(df)),
+        ("fit_regression_likes_views", lambda: da.fit_regression_likes_views(df)),
+        ("regression_likes_views_figure", lambda: da.regression_likes_views_figure(df)),
+        ("plot_regression_likes_views", lambda: da.plot_regression_likes_views(df)),
+        ("fit_regression_like_rate_vs_views", lambda: da.fit_regression_like_rate_vs_views(df)),
+        ("regression_like_rate_vs_views_figure", lambda: da.regression_like_rate_vs_views_figure(df)),
+        ("plot_regression_like_rate_vs_views", lambda: da.plot_regression_like_rate_vs_views(df)),
+        ("likes_by_view_bins", lambda: da.likes_by_view_bins(df)),
+        ("views_vs_likes_figure", lambda: da.views_vs_likes_figure(df)),
+        ("plot_views_vs_likes", lambda: da.plot_views_vs_likes(df)),
+        ("views_by_category", lambda: da.views_by_category(df)),
+        ("plot_views_by_category", lambda: da.plot_views_by_category(df)),
+        ("top_videos", lambda: da.top_videos(df)),
+        ("show_top_videos", lambda: da.show_top_videos(df)),
+        ("cross_country_summary", lambda: da.cross_country_summary(multi)),
+        ("views_by_category_and_country", lambda: da.views_by_category_and_country(multi)),
+        ("plot_cross_country", lambda: da.plot_cross_country(multi)),
+        ("show_streaming_summary", lambda: da.show_streaming_summary(stats)),
+    ]
+
+
+def _train_case(df, task_type, target):
+    from processing.data_sizing import default_features
+    features = default_features(df, target)
+    frame = df[features + [target]]
+
+    def train():
+        import tempfile
+        from adapters.feature_cache import FeatureCache
+        from adapters.pycaret_adapter import PyCaretAdapter
+        # Cache de features vazio a cada execução: mede o treino, não o hit
+        with tempfile.TemporaryDirectory() as cache_dir:
+            PyCaretAdapter(feature_cache=FeatureCache(cache_dir)).train_model(frame, target, task_type, cv_folds=3)
+
+    return train
+
+
+def run_size(name, n_rows, args, emit):
+    from benchmarks.synthetic_data import ensure_dataset
+    from data.columnar_cache import cache_file_for
+    from processing.data_analysis import NORMALIZATION_VERSION, load_data, merge_categories
+    from processing.eda_cache import eda_cache
+    from processing.streaming_stats import stream_aggregates
+
+    started = time.perf_counter()
+    path = ensure_dataset(n_rows, args.seed)
+    print(f"[{name}] dataset {path} ({time.perf_counter() - started:.1f}s)", flush=True)
+
+    def record(benchmark, fn, repeat=args.repeat, memory=not args.no_memory):
+        try:
+            result, metrics = measure(fn, repeat, memory)
+        except Exception as e:
+            result, metrics = None, {"error": f"{type(e).__name__}: {e}"}
+        emit({"size": name, "rows": n_rows, "benchmark": benchmark, **metrics})
+        return result
+
+    def drop_columnar_cache():
+        cached = cache_file_for(path, NORMALIZATION_VERSION)
+        if os.path.exists(cached):
+            os.remove(cached)
+
+    # load_data: parse do CSV (sem cache), primeira carga (grava o cache) e rerun (lê o cache)
+    df = record("load_data[csv]", lambda: load_data(path, max_rows=None, use_cache=False))
+    record("load_data[cache_write]", lambda: (drop_columnar_cache(), load_data(path, max_rows=None))[1], repeat=1)
+    record("load_data[cache_read]", lambda: load_data(path, max_rows=None))
+    if df is None:
+        return
+    record("stream_aggregates", lambda: stream_aggregates(path))
+    df = record("merge_categories", lambda: merge_categories(df.copy(), path))
+    stats = stream_aggregates(path)
+
+    for benchmark, fn in _analysis_cases(df, stats):
+        # Sem o memo do EDA: cada medição calcula do zero
+        record(benchmark, lambda: (eda_cache.clear(), fn())[1])
+
+    if args.train and n_rows <= args.train_max_rows:
+        record("train_model[regression]", _train_case(df, "regression", "views"), repeat=1, memory=False)
+    elif args.train:
+        emit({"size": name, "rows": n_rows, "benchmark": "train_model[regression]",
+              "skipped": f"acima de --train-max-rows ({args.train_max_rows})"})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de carga, EDA e treino sobre dados sintéticos")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"Subconjunto de {', '.join(SIZES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Execuções cronometradas (vale a melhor)")
+    parser.add_argument("--no-memory", action="store_true", help="Não mede pico de memória (tracemalloc)")
+    parser.add_argument("--no-train", dest="train", action="store_false", help="Pula o PyCaretAdapter.train_model")
+    parser.add_argument("--train-max-rows", type=int, default=100_000)
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: benchmarks/results/<commit>.json)")
+    args = parser.parse_args(argv)
+
+    unknown = [s for s in args.sizes.split(",") if s not in SIZES]
+    if unknown:
+        parser.error(f"Tamanhos desconhecidos: {', '.join(unknown)}")
+
+    os.chdir(PROJECT_ROOT)
+    sys.path.insert(0, PROJECT_ROOT)
+    # Funções de UI (st.*) rodam em modo "bare", sem servidor do Streamlit;
+    # avisos de depreciação repetidos a cada medição só poluem a saída
+    import matplotlib
+    matplotlib.use("Agg")
+    warnings.simplefilter("ignore")
+    from streamlit import config as st_config
+    from streamlit.logger import set_log_level
+    st_config.get_option("logger.level")  # o parse da config reaplicaria o nível padrão
+    set_log_level("error")
+
+    commit = _git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{(commit or 'sem-commit')[:12]}.json")
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "environment": _environment(),
+        "results": [],
+    }
+
+    def emit(entry):
+        report["results"].append(entry)
+        detail = entry.get("error") or entry.get("skipped") or (
+            f"{entry['seconds']:.3f}s" + (f", pico {entry['peak_mb']:.1f} MB" if "peak_mb" in entry else "")
+        )
+        print(f"  {entry['benchmark']:<40} {detail}", flush=True)
+
+    for name in args.sizes.split(","):
+        run_size(name, SIZES[name], args, emit)
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        # Chaves ordenadas e uma linha por campo: `git diff` entre resultados fica legível
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Resultados em {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Incrementar quando a saída do gerador mudar (invalida os CSVs já gerados)
+GENERATOR_VERSION = 1
+
+# Mesmas colunas (e ordem) dos dumps XXvideos.csv do datasnaek/youtube-new
+COLUMNS = [
+    "video_id", "trending_date", "title", "channel_title", "category_id", "publish_time",
+    "tags", "views", "likes", "dislikes", "comment_count", "thumbnail_link",
+    "comments_disabled", "ratings_disabled", "video_error_or_removed", "description",
+]
+
+# Como nos dumps reais: ~200 vídeos em alta por dia, cada um por alguns dias
+ROWS_PER_DAY = 200
+DAYS_ON_TRENDING = 5
+START_DATE = pd.Timestamp("2017-11-14")
+N_CHANNELS = 5000
+CHUNK_ROWS = 200000
+
+_ID_ALPHABET = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"))
+_WORDS = np.array(
+    "video music official trailer new live best funny game news how to make vs top challenge "
+    "reaction vlog episode season full highlights tutorial review first time world day night "
+    "canada hockey toronto recipe easy love life family prank short film cover remix song "
+    "update ft feat minecraft fortnite nba nfl interview podcast unboxing".split()
+)
+
+
+def _splitmix64(values):
+    # Hash inteiro vetorizado: cada (linha, vídeo) gera os mesmos valores
+    # independentemente do tamanho do chunk
+    z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _uniform(values, seed, stream):
+    h = _splitmix64(values ^ np.uint64(seed * 1000003 + stream))
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _normal(values, seed, stream):
+    # Box-Muller sobre dois uniformes derivados do hash
+    u1 = np.maximum(_uniform(values, seed, stream), 1e-12)
+    u2 = _uniform(values, seed, stream + 1)
+    return np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
+
+
+def category_ids(country="CA", data_dir="data"):
+    """Ids atribuíveis do <país>_category_id.json (os que aparecem nos vídeos)."""
+    with open(os.path.join(data_dir, f"{country}_category_id.json"), "r", encoding="utf-8") as f:
+        items = json.load(f).get("items", [])
+    return np.array(
+        sorted(int(i["id"]) for i in items if i["snippet"].get("assignable", True)), dtype="int64"
+    )
+
+
+def _words(h, count):
+    # count palavras do vocabulário escolhidas pelos bits de h
+    picks = [(h >> np.uint64(6 * i)) % np.uint64(len(_WORDS)) for i in range(int(count.max()))]
+    picks = np.stack(picks, axis=1).astype(np.int64)
+    return [" ".join(_WORDS[row[:n]]) for row, n in zip(picks, count)]
+
+
+def generate_chunk(start, n_rows, seed=0, categories=None):
+    """Linhas [start, start + n_rows) do dataset sintético (determinístico por linha)."""
+    categories = category_ids() if categories is None else categories
+    rows = np.arange(start, start + n_rows, dtype=np.uint64)
+    day = (rows // np.uint64(ROWS_PER_DAY)).astype(np.int64)
+    slot = (rows % np.uint64(ROWS_PER_DAY)).astype(np.int64)
+    # Cada posição do ranking troca de vídeo a cada DAYS_ON_TRENDING dias (escalonado)
+    shifted = day + slot % DAYS_ON_TRENDING
+    video = (slot + ROWS_PER_DAY * (shifted // DAYS_ON_TRENDING)).astype(np.uint64)
+    age = shifted % DAYS_ON_TRENDING
+
+    h_id = _splitmix64(video ^ np.uint64(seed))
+    h_text = _splitmix64(h_id)
+    # 11 caracteres base64 como os ids do YouTube (6 bits do hash por caractere)
+    shifts = np.arange(0, 66, 6, dtype=np.uint64) % np.uint64(64)
+    chars = _ID_ALPHABET[((h_id[:, None] >> shifts) & np.uint64(63)).astype(np.int64)]
+    video_id = np.ascontiguousarray(chars).view("<U11").ravel()
+
+    trending = START_DATE + pd.to_timedelta(day, unit="D")
+    publish_lag = pd.to_timedelta(age + 1, unit="D") + pd.to_timedelta(
+        (_uniform(video, seed, 1) * 86400).astype(np.int64), unit="s"
+    )
+    publish = trending - publish_lag
+
+    # Views log-normais por vídeo, crescendo enquanto está em alta
+    base_views = np.exp(11.5 + 1.6 * _normal(video, seed, 2))
+    views = (base_views * (1 + 0.35 * age) * (1 + 0.05 * _uniform(rows, seed, 4))).astype(np.int64)
+    like_rate = np.exp(np.log(0.03) + 0.6 * _normal(video, seed, 5))
+    likes = (views * np.minimum(like_rate, 0.5)).astype(np.int64)
+    dislikes = (likes * 0.05 * np.exp(0.8 * _normal(video, seed, 7))).astype(np.int64)
+    comments = (likes * 0.12 * np.exp(0.7 * _normal(video, seed, 9))).astype(np.int64)
+
+    ratings_disabled = _uniform(video, seed, 11) < 0.01
+    comments_disabled = _uniform(video, seed, 12) < 0.015
+    removed = _uniform(rows, seed, 13) < 0.0005
+    likes[ratings_disabled] = 0
+    dislikes[ratings_disabled] = 0
+    comments[comments_disabled] = 0
+
+    n_title = 3 + (h_text % np.uint64(6)).astype(np.int64)
+    n_tags = (h_text >> np.uint64(8)) % np.uint64(9)
+    tags = [
+        "[none]" if n == 0 else "|".join(f'"{w}"' for w in text.split())
+        for text, n in zip(_words(h_text >> np.uint64(3), np.maximum(n_tags.astype(np.int64), 1)), n_tags)
+    ]
+    description = pd.Series(_words(_splitmix64(h_text), 4 + (h_text >> np.uint64(16)) % np.uint64(7)))
+    description[_uniform(video, seed, 14) < 0.1] = np.nan
+
+    return pd.DataFrame({
+        "video_id": video_id,
+        "trending_date": trending.strftime("%y.%d.%m"),
+        "title": _words(h_text, n_title),
+        "channel_title": [f"Canal {c}" for c in (h_id >> np.uint64(20)) % np.uint64(N_CHANNELS)],
+        "category_id": categories[(h_id % np.uint64(len(categories))).astype(np.int64)],
+        "publish_time": publish.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "tags": tags,
+        "views": views,
+        "likes": likes,
+        "dislikes": dislikes,
+        "comment_count": comments,
+        "thumbnail_link": [f"https://i.ytimg.com/vi/{v}/default.jpg" for v in video_id],
+        "comments_disabled": comments_disabled,
+        "ratings_disabled": ratings_disabled,
+        "video_error_or_removed": removed,
+        "description": description,
+    }, columns=COLUMNS)
+
+
+def write_csv(path, n_rows, seed=0, country="CA", chunk_rows=CHUNK_ROWS):
+    """Grava um XXvideos.csv sintético de n_rows linhas em chunks (memória constante)."""
+    categories = category_ids(country)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    for start in range(0, n_rows, chunk_rows):
+        chunk = generate_chunk(start, min(chunk_rows, n_rows - start), seed, categories)
+        chunk.to_csv(tmp, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def dataset_path(n_rows, seed=0, country="CA", root=os.path.join("benchmarks", ".data")):
+    """Caminho estável por (tamanho, seed, versão); o nome mantém o padrão <país>videos.csv."""
+    return os.path.join(root, f"v{GENERATOR_VERSION}-s{seed}-{n_rows}", f"{country}videos.csv")
+
+
+def ensure_dataset(n_rows, seed=0, country="CA"):
+    """Gera o CSV só se ainda não existe para este tamanho/seed/versão do gerador."""
+    path = dataset_path(n_rows, seed, country)
+    if not os.path.exists(path):
+        write_csv(path, n_rows, seed, country)
+    return path
@@ -0,0 +1,48 @@
+import importlib
+import os
+import re
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+# Custo do primeiro import de cada módulo carregado sob demanda (módulo → segundos)
+lazy_import_times = {}
+
+# Linha do `-X importtime`: "import time: <self us> | <cumulativo us> | <indent><módulo>"
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed_import(module_name):
+    """importlib.import_module que registra quanto custou o primeiro import."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    lazy_import_times[module_name] = time.perf_counter() - started
+    return module
+
+
+def importtime_report(module_name, top=30):
+    """
+    Importa `module_name` num processo novo com `python -X importtime` e
+    devolve (total em ms, DataFrame com os imports mais caros).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True, text=True, cwd=PROJECT_ROOT,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, len(indent) // 2, int(self_us) / 1000, int(cumulative_us) / 1000))
+    report = pd.DataFrame(rows, columns=["módulo", "nível", "próprio (ms)", "cumulativo (ms)"])
+    # Nível 0 = imports de topo; a soma deles é o custo total do import
+    total_ms = report.loc[report["nível"] == 0, "cumulativo (ms)"].sum()
+    report = report.sort_values("cumulativo (ms)", ascending=False).head(top)
+    return total_ms, report.reset_index(drop=True)
@@ -0,0 +1,144 @@
+import functools
+import itertools
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+from config.settings import SPAN_HISTORY, SPAN_TRACEMALLOC
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# DEBUG: com o nível padrão (INFO) os spans ficam só em memória, sem I/O
+span_logger = logging.getLogger("siamd.spans")
+
+# Etapas concluídas, mais recentes no fim (deque é thread-safe para append)
+_records = deque(maxlen=SPAN_HISTORY)
+_run_ids = itertools.count(1)
+_local = threading.local()
+
+
+def _process_rss_hwm_mb():
+    # Pico de RSS do processo desde o início (KB no Linux, bytes no macOS). Só
+    # cresce: não mede a etapa, mostra se ela elevou o pico do processo
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def start_run():
+    """Marca o início de uma execução (rerun) nesta thread; os spans seguintes levam o id."""
+    _local.run = next(_run_ids)
+    return _local.run
+
+
+@contextmanager
+def span(name, rows=None, **fields):
+    """
+    Mede uma etapa: duração, linhas processadas e memória (peak_mb: pico da
+    etapa via tracemalloc; process_rss_hwm_mb: pico de RSS do processo inteiro
+    até o fim da etapa). O dict cedido pode ser atualizado dentro do bloco
+    (ex.: record["rows"] = len(df)).
+    """
+    stack = _stack()
+    record = {"name": name, "rows": rows, **fields}
+    if SPAN_TRACEMALLOC:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        current, peak = tracemalloc.get_traced_memory()
+        # O pico é global: guarda o do pai antes de zerar para esta etapa
+        if stack:
+            stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+        tracemalloc.reset_peak()
+        record["_base"], record["_peak"] = current, current
+    record["parent"] = stack[-1]["name"] if stack else None
+    record["depth"] = len(stack)
+    stack.append(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - started
+        stack.pop()
+        if SPAN_TRACEMALLOC:
+            peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1])
+            record["peak_mb"] = (peak - record.pop("_base")) / 1024 ** 2
+            if stack:
+                stack[-1]["_peak"] = max(stack[-1]["_peak"], peak)
+        record["process_rss_hwm_mb"] = _process_rss_hwm_mb()
+        record["run"] = getattr(_local, "run", None)
+        record["thread"] = threading.current_thread().name
+        record["finished_at"] = time.time()
+        _records.append(record)
+        if span_logger.isEnabledFor(logging.DEBUG):
+            details = " ".join(
+                f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}"
+                for k, v in record.items() if k not in ("name", "finished_at")
+            )
+            span_logger.debug(f"span {name} {details}")
+
+
+def _first_len(args):
+    for value in args:
+        if isinstance(value, pd.DataFrame):
+            return len(value)
+    return None
+
+
+def traced(name=None):
+    """Decorador: cada chamada vira um span (linhas = len do primeiro DataFrame)."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name or func.__name__, rows=_first_len(args)):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def span_frame(run=None):
+    """Spans concluídos (de uma execução, se `run` for dado) em ordem cronológica."""
+    records = [r for r in list(_records) if run is None or r["run"] == run]
+    columns = ["name", "parent", "depth", "rows", "seconds", "peak_mb", "process_rss_hwm_mb", "run", "thread"]
+    frame = pd.DataFrame(records)
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+    extra = [c for c in frame.columns if c not in columns and c != "finished_at"]
+    return frame.reindex(columns=columns + extra)
+
+
+def span_summary():
+    """Agregado por etapa no processo: chamadas, tempo total/médio/máximo e linhas."""
+    frame = span_frame()
+    if frame.empty:
+        return frame
+    summary = frame.groupby("name").agg(
+        chamadas=("seconds", "size"),
+        total_s=("seconds", "sum"),
+        media_s=("seconds", "mean"),
+        max_s=("seconds", "max"),
+        linhas=("rows", "max"),
+    )
+    return summary.sort_values("total_s", ascending=False)
+
+
+def clear_spans():
+    _records.clear()
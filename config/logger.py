@@ -1,17 +1,103 @@
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
+import threading
 
-log_dir = "logs"
+# Testes e implantações podem apontar o log para outro diretório
+log_dir = os.environ.get("SIAMD_LOG_DIR", "logs")
 os.makedirs(log_dir, exist_ok=True)
 
 log_file = os.path.join(log_dir, "app.log")
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+# Nível da aplicação e rotação do arquivo (MB por arquivo, nº de arquivos antigos)
+LOG_LEVEL = os.environ.get("SIAMD_LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = int(os.environ.get("SIAMD_LOG_MAX_MB", "5")) * 1024 * 1024
+LOG_BACKUP_COUNT = int(os.environ.get("SIAMD_LOG_BACKUPS", "3"))
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+# Bibliotecas verbosas: só avisos e erros delas chegam ao arquivo
+LIBRARY_LOG_LEVELS = {
+    "pycaret": logging.WARNING,
+    "logs": logging.WARNING,  # logger padrão do PyCaret quando system_log=True
+    "lightgbm": logging.WARNING,
+    "matplotlib": logging.WARNING,
+    "PIL": logging.WARNING,
+    "numexpr": logging.WARNING,
+    "urllib3": logging.WARNING,
+    "kaggle": logging.WARNING,
+    "fsspec": logging.WARNING,
+}
+
+
+# Processo dono do arquivo de log: filhos (spawn, fork, loky) herdam a variável
+# e não abrem o RotatingFileHandler; rotação em vários processos perde registros
+_OWNER_ENV = "SIAMD_LOG_OWNER_PID"
+os.environ.setdefault(_OWNER_ENV, str(os.getpid()))
+
+_file_handler = None
+_worker_queue = None
+_worker_lock = threading.Lock()
+
+
+def is_log_owner():
+    return os.environ[_OWNER_ENV] == str(os.getpid())
+
+
+def _configure():
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    for name, level in LIBRARY_LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level)
+    if not is_log_owner() or any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        # Filhos só logam depois de attach_worker_queue (fila do processo dono)
+        return None
+    # Quem loga só enfileira o registro; a escrita em disco (com rotação)
+    # fica na thread do QueueListener
+    global _file_handler
+    _file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+    _file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S"))
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, _file_handler, respect_handler_level=True)
+    listener.start()
+    # Esvazia a fila antes do processo sair
+    atexit.register(listener.stop)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    return listener
+
+
+def worker_log_queue():
+    """
+    Fila entre processos para os workers (passada em initargs/args); um
+    listener no processo dono grava os registros no mesmo arquivo rotativo.
+    Fora do processo dono retorna None.
+    """
+    global _worker_queue
+    if _file_handler is None:
+        return None
+    with _worker_lock:
+        if _worker_queue is None:
+            _worker_queue = multiprocessing.get_context("spawn").Queue()
+            listener = logging.handlers.QueueListener(_worker_queue, _file_handler, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+        return _worker_queue
+
+
+def attach_worker_queue(log_queue):
+    # Chamado no início do worker: seus logs vão para a fila do processo dono
+    if log_queue is None or is_log_owner():
+        return
+    root = logging.getLogger()
+    if not any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+log_listener = _configure()
 
 logger = logging.getLogger()
 
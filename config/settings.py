@@ -2,6 +2,41 @@ import os
 import json
 from config.logger import logger
 
+# Orçamento de memória do cache de análises (EDA) por processo
+EDA_CACHE_MAX_BYTES = int(os.environ.get("SIAMD_EDA_CACHE_MB", "256")) * 1024 * 1024
+
+# Fila de treinamento em segundo plano (SQLite + artefatos por job)
+JOBS_DIR = os.environ.get("SIAMD_JOBS_DIR", "jobs")
+TRAINING_MAX_CONCURRENT_JOBS = int(os.environ.get("SIAMD_MAX_TRAINING_JOBS", "2"))
+
+# Registro de modelos treinados (pipelines em disco + LRU em memória)
+MODELS_DIR = os.environ.get("SIAMD_MODELS_DIR", "models")
+MODEL_CACHE_SIZE = int(os.environ.get("SIAMD_MODEL_CACHE_SIZE", "4"))
+
+# Resultado do setup do PyCaret (matrizes transformadas + pipeline) reaproveitado entre treinos
+FEATURE_CACHE_DIR = os.environ.get("SIAMD_FEATURE_CACHE_DIR", "data/.cache/features")
+# Métricas por k do sweep de clusterização (inércia/silhouette)
+CLUSTER_CACHE_DIR = os.environ.get("SIAMD_CLUSTER_CACHE_DIR", "data/.cache/clusters")
+
+# Previsão em lote: saídas Parquet e tamanho dos chunks de CSV
+PREDICTIONS_DIR = os.environ.get("SIAMD_PREDICTIONS_DIR", "predictions")
+BATCH_CHUNK_ROWS = int(os.environ.get("SIAMD_BATCH_CHUNK_ROWS", "50000"))
+
+# Serviço HTTP de previsão: micro-lotes de até N registros ou T ms de espera
+SERVING_MAX_BATCH = int(os.environ.get("SIAMD_SERVING_MAX_BATCH", "64"))
+SERVING_MAX_WAIT_MS = float(os.environ.get("SIAMD_SERVING_MAX_WAIT_MS", "10"))
+
+# Índice de trajetórias por vídeo (linhas ordenadas + features), atualizado dia a dia
+TRAJECTORY_CACHE_DIR = os.environ.get("SIAMD_TRAJECTORY_CACHE_DIR", "data/.cache/trajectories")
+
+# Manifestos dos downloads (versão remota + sha256 local por arquivo) para refresh incremental
+DATASET_MANIFEST_DIR = os.environ.get("SIAMD_MANIFEST_DIR", "data/.cache/manifests")
+
+# Etapas medidas (spans) guardadas em memória para o painel de diagnóstico;
+# SIAMD_SPAN_TRACEMALLOC=1 mede o pico alocado por etapa (custa CPU em todo o processo)
+SPAN_HISTORY = int(os.environ.get("SIAMD_SPAN_HISTORY", "1000"))
+SPAN_TRACEMALLOC = os.environ.get("SIAMD_SPAN_TRACEMALLOC", "0") == "1"
+
 def load_kaggle_credentials():
     kaggle_json_path = os.path.expanduser("~/.kaggle/kaggle.json")
     try:
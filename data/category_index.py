@@ -0,0 +1,65 @@
+import functools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from config.logger import logger
+
+UNKNOWN_CATEGORY = "Desconhecido"
+
+
+def country_code(csv_file):
+    # Ex: 'data/USvideos.csv' → 'US'
+    return os.path.basename(csv_file).split('videos')[0]
+
+
+class CategoryIndex:
+    """
+    Mapeamento category_id → nome de um país, já pronto para lookup vetorizado:
+    ids ordenados (int64) e o código categórico de cada id.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        self.ids = np.array(sorted(self.mapping), dtype="int64")
+        names = sorted(set(self.mapping.values()))
+        self.categories = pd.Index(names + [UNKNOWN_CATEGORY]).unique()
+        self.unknown_code = self.categories.get_loc(UNKNOWN_CATEGORY)
+        self.id_codes = self.categories.get_indexer([self.mapping[i] for i in self.ids])
+
+    def lookup(self, category_ids):
+        """Converte ids em pd.Categorical via searchsorted + from_codes (sem Series.map)."""
+        values = np.asarray(category_ids, dtype="int64")
+        if len(self.ids) == 0:
+            codes = np.full(values.shape, self.unknown_code)
+        else:
+            pos = np.searchsorted(self.ids, values).clip(0, len(self.ids) - 1)
+            found = self.ids[pos] == values
+            codes = np.where(found, self.id_codes[pos], self.unknown_code)
+        return pd.Categorical.from_codes(codes, categories=self.categories)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_category_index(json_file, mtime_ns):
+    with open(json_file, "r", encoding="utf-8") as f:
+        items = json.load(f).get("items", [])
+    return CategoryIndex({int(i["id"]): i["snippet"]["title"] for i in items})
+
+
+def get_category_index(country, data_dir="data"):
+    """
+    Índice do país, parseado uma vez por processo (compartilhado entre sessões)
+    e recarregado só se o JSON mudar.
+    """
+    json_file = os.path.join(data_dir, f"{country}_category_id.json")
+    if not os.path.exists(json_file):
+        logger.warning(f"Arquivo JSON de categorias não encontrado: {json_file}")
+        return _load_empty_index()
+    return _load_category_index(json_file, os.stat(json_file).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_empty_index():
+    return CategoryIndex({})
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+
+from config.logger import logger
+
+CACHE_DIR = os.path.join("data", ".cache")
+
+
+def _path_digest(file_path):
+    return hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_file_for(file_path, version, cache_dir=CACHE_DIR):
+    # Chave: caminho + mtime + tamanho + versão da normalização
+    stat = os.stat(file_path)
+    signature = f"{stat.st_mtime_ns}:{stat.st_size}:{version}"
+    digest = hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{_path_digest(file_path)}-{digest}.arrow")
+
+
+def read_cached_frame(file_path, version, max_rows=None, cache_dir=CACHE_DIR):
+    """
+    Lê o DataFrame normalizado do cache Arrow IPC (memory-mapped).
+    Retorna None se não houver entrada válida com linhas suficientes.
+    """
+    cache_file = cache_file_for(file_path, version, cache_dir)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with pa.memory_map(cache_file, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (OSError, pa.ArrowInvalid) as e:
+        logger.warning(f"Cache colunar inválido ({cache_file}): {e}")
+        return None
+
+    metadata = table.schema.metadata or {}
+    complete = metadata.get(b"siamd_complete") == b"1"
+    if max_rows is None:
+        if not complete:
+            return None
+    elif table.num_rows < max_rows and not complete:
+        return None
+    elif table.num_rows > max_rows:
+        table = table.slice(0, max_rows)
+    logger.info(f"Cache colunar: {file_path} ({table.num_rows} linhas)")
+    # O arquivo tem um único record batch: read_all e slice são views do
+    # mapeamento (só as páginas do prefixo são lidas). Com split_blocks os
+    # numéricos sem nulos viram arrays sobre o arquivo, sem cópia; o resto é
+    # convertido coluna a coluna, liberando cada buffer Arrow ao terminar
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    if b"siamd_attrs" in metadata:
+        df.attrs.update(json.loads(metadata[b"siamd_attrs"]))
+    return df
+
+
+def write_cached_frame(file_path, version, df, complete, cache_dir=CACHE_DIR):
+    """Grava o DataFrame normalizado em Arrow IPC, substituindo entradas antigas do mesmo arquivo."""
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_file = cache_file_for(file_path, version, cache_dir)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"siamd_complete"] = b"1" if complete else b"0"
+    metadata[b"siamd_attrs"] = json.dumps(df.attrs).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_file, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            # Um batch só: colunas de um chunk convertem para pandas sem cópia
+            writer.write_table(table.combine_chunks())
+    try:
+        os.replace(tmp_file, cache_file)
+    except PermissionError as e:
+        # Windows: um DataFrame lido do cache ainda mapeia o arquivo antigo
+        os.remove(tmp_file)
+        logger.warning(f"Cache colunar em uso, não substituído ({cache_file}): {e}")
+        return None
+
+    # Remove versões antigas (mtime/tamanho/normalização diferentes)
+    prefix = _path_digest(file_path) + "-"
+    for name in os.listdir(cache_dir):
+        old = os.path.join(cache_dir, name)
+        if name.startswith(prefix) and name.endswith(".arrow") and old != cache_file:
+            try:
+                os.remove(old)
+            except PermissionError:
+                pass  # ainda mapeado (Windows); sai na próxima gravação
+    return cache_file
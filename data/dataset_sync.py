@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+from config.instrumentation import span
+from config.logger import logger
+from config.settings import DATASET_MANIFEST_DIR
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_CHUNK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stream_to_file(source, dest_path):
+    # Uma passada: grava e calcula o sha256; o destino só aparece completo
+    digest = hashlib.sha256()
+    tmp = f"{dest_path}.part-{os.getpid()}"
+    with open(tmp, "wb") as out:
+        while block := source.read(HASH_CHUNK_BYTES):
+            digest.update(block)
+            out.write(block)
+    os.replace(tmp, dest_path)
+    return digest.hexdigest()
+
+
+def _local_state(path, sha256):
+    stat = os.stat(path)
+    return {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class DatasetSync:
+    """
+    Download incremental de um dataset via DatasetPort. O manifesto guarda,
+    por arquivo remoto, tamanho/data do remoto e sha256/tamanho/mtime das
+    cópias locais; só baixa o que mudou. `on_extracted(path)` roda para
+    cada arquivo instalado (ex.: aquecer os caches do CSV).
+    """
+
+    def __init__(self, port, download_path="./data", manifest_dir=DATASET_MANIFEST_DIR, on_extracted=None):
+        self.port = port
+        self.download_path = download_path
+        self.manifest_dir = manifest_dir
+        self.on_extracted = on_extracted
+
+    def _manifest_path(self, source_name):
+        return os.path.join(self.manifest_dir, source_name.replace("/", "__") + ".json")
+
+    def load_manifest(self, source_name):
+        path = self._manifest_path(source_name)
+        if not os.path.exists(path):
+            return {"dataset": source_name, "version": None, "files": {}}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_manifest(self, source_name, manifest):
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        path = self._manifest_path(source_name)
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    def _local_ok(self, entry):
+        """Cópias locais intactas? mtime/tamanho iguais bastam; senão confere o sha256."""
+        for name, state in entry["local"].items():
+            path = os.path.join(self.download_path, name)
+            if not os.path.exists(path):
+                return False
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime_ns) == (state["size"], state["mtime_ns"]):
+                continue
+            if stat.st_size != state["size"] or sha256_file(path) != state["sha256"]:
+                return False
+            state["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    def _install(self, downloaded, remote_name):
+        """Move/extrai o arquivo baixado para download_path; {nome local: estado}."""
+        local = {}
+        # A fonte compactou o arquivo (ex.: CAvideos.csv → CAvideos.csv.zip)
+        compressed = os.path.basename(downloaded) != os.path.basename(remote_name)
+        if compressed and zipfile.is_zipfile(downloaded):
+            # Membros extraídos em streaming direto para o destino (sem extrair em disco antes)
+            with zipfile.ZipFile(downloaded) as zf:
+                for member in zf.infolist():
+                    if member.is_dir():
+                        continue
+                    name = os.path.basename(member.filename)
+                    dest = os.path.join(self.download_path, name)
+                    with zf.open(member) as source:
+                        local[name] = _stream_to_file(source, dest)
+        else:
+            name = os.path.basename(downloaded)
+            digest = sha256_file(downloaded)
+            os.replace(downloaded, os.path.join(self.download_path, name))
+            local[name] = digest
+        states = {}
+        for name, digest in local.items():
+            path = os.path.join(self.download_path, name)
+            if self.on_extracted is not None:
+                self.on_extracted(path)
+            states[name] = _local_state(path, digest)
+        return states
+
+    def sync(self, source_name, force=False):
+        """
+        Atualiza os arquivos do dataset e retorna um resumo
+        {version, downloaded, unchanged, bytes, seconds}.
+        """
+        started = time.perf_counter()
+        os.makedirs(self.download_path, exist_ok=True)
+        manifest = self.load_manifest(source_name)
+        summary = {"version": None, "downloaded": [], "unchanged": [], "bytes": 0}
+
+        version = self.port.dataset_version(source_name)
+        summary["version"] = version
+        files = manifest["files"]
+        if (not force and version is not None and version == manifest.get("version")
+                and files and all(self._local_ok(e) for e in files.values())):
+            # Mesma versão remota e cópias intactas: nenhuma listagem nem download
+            summary["unchanged"] = sorted(files)
+            self._save_manifest(source_name, manifest)
+            summary["seconds"] = time.perf_counter() - started
+            return summary
+
+        remote = self.port.list_files(source_name)
+        with tempfile.TemporaryDirectory(dir=self.download_path, prefix=".download-") as tmp_dir:
+            for remote_file in remote:
+                entry = files.get(remote_file.name)
+                if (not force and entry is not None
+                        and (entry["remote_size"], entry["remote_modified"]) == (remote_file.size, remote_file.modified)
+                        and self._local_ok(entry)):
+                    summary["unchanged"].append(remote_file.name)
+                    continue
+                with span("download_file", file=remote_file.name) as record:
+                    downloaded = self.port.download_file(source_name, remote_file.name, tmp_dir)
+                    record["bytes"] = os.path.getsize(downloaded)
+                    files[remote_file.name] = {
+                        "remote_size": remote_file.size,
+                        "remote_modified": remote_file.modified,
+                        "local": self._install(downloaded, remote_file.name),
+                    }
+                summary["downloaded"].append(remote_file.name)
+                summary["bytes"] += record["bytes"]
+                # Progresso persistido por arquivo: uma falha no meio não refaz o que já veio
+                self._save_manifest(source_name, manifest)
+
+        # Arquivos removidos do remoto saem do manifesto (as cópias locais ficam)
+        for name in set(files) - {f.name for f in remote}:
+            del files[name]
+        manifest["version"] = version
+        self._save_manifest(source_name, manifest)
+        summary["seconds"] = time.perf_counter() - started
+        logger.info(
+            f"Sync {source_name}: {len(summary['downloaded'])} baixados "
+            f"({summary['bytes'] / 2 ** 20:.1f} MB), {len(summary['unchanged'])} sem mudança"
+        )
+        return summary
@@ -1,16 +1,47 @@
-from kaggle.api.kaggle_api_extended import KaggleApi
 import os
 
+from config.logger import logger
+from data.dataset_sync import DatasetSync
 
-def download_dataset(dataset_name, download_path="./data"):
+
+# Linhas pré-carregadas no cache colunar: o máximo do slider "Linhas Máx." da UI
+# (o cache serve qualquer max_rows menor), sem ler o arquivo inteiro em memória
+PREWARM_ROWS = 100000
+
+
+def prepare_downloaded_file(path):
+    # CSV recém-baixado: grava no cache colunar só o prefixo de PREWARM_ROWS
+    # linhas (a UI nunca pede mais). Não é uma conversão do arquivo inteiro:
+    # quem pede o arquivo completo (load_data com max_rows=None) ainda faz o
+    # parse do CSV uma vez. O índice de trajetórias lê o arquivo em chunks.
+    if not path.endswith(".csv"):
+        return
+    from processing.data_analysis import load_data
+    from processing.trajectory_index import trajectory_index_for
+    try:
+        df = load_data(path, max_rows=PREWARM_ROWS)
+        if "video_id" in df.columns and "trending_date" in df.columns:
+            trajectory_index_for(path)
+    except Exception as e:
+        logger.warning(f"Caches não gerados para {path}: {e}")
+
+
+def download_dataset(dataset_name, download_path="./data", port=None, force=False):
+    """
+    Baixa só os arquivos novos ou alterados do dataset (padrão: Kaggle).
+    Retorna o resumo do DatasetSync.sync ou None em caso de erro.
+    """
     if not os.path.exists(download_path):
         os.makedirs(download_path)
     try:
-        api = KaggleApi()
-        api.authenticate()
-        api.dataset_download_files(dataset_name, path=download_path, unzip=True)
-        print(" Dataset baixado com sucesso!")
-        return True
+        if port is None:
+            from adapters.kaggle_dataset import KaggleDatasetAdapter
+            port = KaggleDatasetAdapter()
+        sync = DatasetSync(port, download_path, on_extracted=prepare_downloaded_file)
+        summary = sync.sync(dataset_name, force=force)
+        print(" Dataset sincronizado com sucesso!")
+        return summary
     except Exception as e:
         print(f" Erro ao baixar o dataset: {e}")
-        return False
+        logger.error(f"Erro ao baixar o dataset {dataset_name}: {e}")
+        return None
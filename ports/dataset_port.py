@@ -1,13 +1,36 @@
 # ports/dataset_port.py
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    """A file of a remote dataset as listed by the source."""
+    name: str
+    size: Optional[int] = None
+    modified: Optional[str] = None
+
 
 class DatasetPort(ABC):
-    """Defines how we fetch or load a dataset."""
-    
+    """Defines how we fetch or load a dataset, one file at a time."""
+
+    def dataset_version(self, source_name: str) -> Optional[str]:
+        """
+        Return an identifier that changes whenever the remote dataset changes
+        (version number, last update...), or None if the source has none.
+        """
+        return None
+
+    @abstractmethod
+    def list_files(self, source_name: str) -> List[RemoteFile]:
+        """List the files of the dataset with their remote size and date."""
+        pass
+
     @abstractmethod
-    def download_dataset(self, source_name: str) -> str:
+    def download_file(self, source_name: str, file_name: str, dest_dir: str) -> str:
         """
-        Download a dataset from some source (e.g., Kaggle) and
-        return the local path of the dataset CSV (or ZIP) file.
+        Download a single file of the dataset into dest_dir and return the
+        local path (a ZIP archive if the source sends it compressed).
         """
         pass
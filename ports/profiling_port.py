@@ -5,6 +5,14 @@ import pandas as pd
 class ProfilingPort(ABC):
     """Defines how we generate a profile (EDA) of a dataset."""
     
+    @abstractmethod
+    def profile(self, df: pd.DataFrame) -> dict:
+        """
+        Compute per-column statistics (null/zero counts, min/max,
+        moments, histogram bins) that the EDA plots render from.
+        """
+        pass
+
     @abstractmethod
     def generate_report(self, df: pd.DataFrame) -> None:
         """Generate or display a data profiling report."""
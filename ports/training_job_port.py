@@ -0,0 +1,24 @@
+# ports/training_job_port.py
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import pandas as pd
+
+
+class TrainingJobPort(ABC):
+    """Defines how training runs as queued jobs outside the caller."""
+
+    @abstractmethod
+    def submit_training(self, df: pd.DataFrame, target: str, task_type: str, **params) -> str:
+        """Queue a training job and return its job id right away."""
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """Return status, progress and result info of a submitted job (None if unknown)."""
+        pass
+
+    @abstractmethod
+    def list_jobs(self, limit: int = 20) -> pd.DataFrame:
+        """Most recent jobs, newest first."""
+        pass
@@ -1,22 +1,32 @@
-import json
+import io
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import streamlit as st
-import os
-import statsmodels.api as sm
+# matplotlib/seaborn são importados dentro das funções de figura: o primeiro
+# paint da aba de EDA não paga o custo desses imports
+from config.instrumentation import span, traced
+from data.columnar_cache import read_cached_frame, write_cached_frame
+from data.category_index import get_category_index, country_code
+from processing.eda_cache import memoize_eda
+from processing.dtype_optimizer import optimize_dtypes
+from processing.profiling import compute_profile, missing_counts
+from processing.rendering import draw_density_regression
+from processing.regression import OLSAccumulator, likes_views_arrays, like_rate_arrays
 
-def load_data(file_path, max_rows=10000):
-    df = pd.read_csv(file_path, nrows=max_rows)
+# Incrementar sempre que a normalização abaixo mudar (invalida o cache colunar)
+NORMALIZATION_VERSION = 2
+
+
+def normalize_frame(df):
     # Se veio com índice extra
     if 'Unnamed: 0' in df.columns:
         df = df.drop(columns=['Unnamed: 0'])
     # normalize colunas
     df.columns = df.columns.str.lower()
     # trending_date é yy.dd.mm → converte para datetime
-    df['trending_date'] = pd.to_datetime(
-        df['trending_date'], format='%y.%d.%m', errors='coerce'
-    )
+    if 'trending_date' in df.columns:
+        df['trending_date'] = pd.to_datetime(
+            df['trending_date'], format='%y.%d.%m', errors='coerce'
+        )
     # publish_time: remove Z e parse
     if 'publish_time' in df.columns:
         df['publish_time'] = pd.to_datetime(
@@ -24,168 +34,341 @@ def load_data(file_path, max_rows=10000):
         )
     return df
 
+
+def load_data(file_path, max_rows=10000, use_cache=True):
+    with span("load_data") as record:
+        # Reruns reaproveitam o cache Arrow em ./data/.cache e pulam o parse do CSV
+        if use_cache:
+            df = read_cached_frame(file_path, NORMALIZATION_VERSION, max_rows)
+            if df is not None:
+                record.update(rows=len(df), cache="hit")
+                return df
+        df = normalize_frame(pd.read_csv(file_path, nrows=max_rows))
+        # Dtypes compactos antes de cachear: o cache já guarda category/int32
+        df = optimize_dtypes(df)
+        if use_cache:
+            complete = max_rows is None or len(df) < max_rows
+            write_cached_frame(file_path, NORMALIZATION_VERSION, df, complete)
+        record.update(rows=len(df), cache="miss" if use_cache else None)
+        return df
+
     
 def load_category_mapping(csv_file):
-    json_file = os.path.join("data", f"{csv_file[:2]}_category_id.json")
-    print(json_file)
-    if os.path.exists(json_file):
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        category_mapping = {item["id"]: item["snippet"]["title"] for item in data.get("items", [])}
-        return category_mapping
-    else:
-        print(f"Arquivo JSON de categorias não encontrado: {json_file}")
-        return {}
+    # {category_id (int): nome}, do índice parseado uma vez por processo
+    return get_category_index(country_code(csv_file)).mapping
 
+
+@traced()
 def merge_categories(df, csv_file):
     # Ex: 'USvideos.csv' → data/US_category_id.json
-    prefix = os.path.basename(csv_file).split('videos')[0]
-    mapping_file = os.path.join('data', f'{prefix}_category_id.json')
-    with open(mapping_file, 'r', encoding='utf-8') as f:
-        items = json.load(f).get('items', [])
-    cmap = {int(i['id']): i['snippet']['title'] for i in items}
-
-    df['category_id'] = df['category_id'].astype(int)
-    df['category_name'] = df['category_id'].map(cmap).fillna('Desconhecido')
+    index = get_category_index(country_code(csv_file))
+    if not pd.api.types.is_integer_dtype(df['category_id']):
+        df['category_id'] = df['category_id'].astype(int)
+    df['category_name'] = index.lookup(df['category_id'])
     return df
 
 
+def _figure_png(fig):
+    # Renderiza uma vez para PNG (cacheável) e libera a figura do matplotlib
+    import matplotlib.pyplot as plt
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+@traced()
 def calculate_null_zero_percentage(df):
     #Calcula o percentual de valores nulos e zeros.
     if df is None:
         return None, None
-    total_values = df.size
-    null_values = df.isnull().sum().sum()
-    zero_values = (df == 0).sum().sum()
+    profile = compute_profile(df)
+    total_values = profile["size"]
+    null_values = profile["null_total"]
+    zero_values = profile["zero_total"]
     null_percentage = (null_values / total_values) * 100
     zero_percentage = (zero_values / total_values) * 100
     return null_percentage, zero_percentage
 
-def plot_missing_values(df):
-    #Gera um gráfico de barras mostrando valores nulos por coluna.
-    missing_values = df.isnull().sum()
+
+@memoize_eda
+def missing_values_figure(df):
+    missing_values = missing_counts(compute_profile(df))
     missing_values = missing_values[missing_values > 0]
+    if missing_values.empty:
+        return None
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(x=missing_values.index, y=missing_values.values, ax=ax, hue=missing_values.index, palette="Reds")
+    ax.set_ylabel("Quantidade")
+    ax.tick_params(axis="x", rotation=45)
+    return _figure_png(fig)
 
-    if not missing_values.empty:
-        fig, ax = plt.subplots(figsize=(10, 5))
-        sns.barplot(x=missing_values.index, y=missing_values.values, ax=ax, hue=missing_values.index, palette="Reds")
-        st.write(f"### Valores Nulos por Coluna")
-        ax.set_ylabel("Quantidade")
-        ax.tick_params(axis="x", rotation=45)
 
-        st.pyplot(fig)
+def plot_missing_values(df):
+    #Gera um gráfico de barras mostrando valores nulos por coluna.
+    png = missing_values_figure(df)
+    st.write(f"### Valores Nulos por Coluna")
+    if png is not None:
+        st.image(png, use_container_width=True)
     else:
-        st.write(f"### Valores Nulos por Coluna")
         st.write("Nenhuma coluna contém valores nulos!")
 
+
+@memoize_eda
+def numeric_distribution_figure(df):
+    # Desenha direto dos bins do perfil; nenhuma passada extra pelos dados
+    columns = compute_profile(df)["columns"]
+    numeric_cols = [col for col, c in columns.items() if c["numeric"] and "hist_counts" in c]
+    if len(numeric_cols) == 0:
+        return None
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(len(numeric_cols), 1, figsize=(10, len(numeric_cols) * 5), squeeze=False)
+    for i, col in enumerate(numeric_cols):
+        ax[i, 0].stairs(columns[col]["hist_counts"], columns[col]["hist_edges"], fill=True, color="blue", alpha=0.6)
+        ax[i, 0].set_title(f"Distribuição de {col}")
+        ax[i, 0].set_ylabel("Count")
+    return _figure_png(fig)
+
+
 def plot_numeric_distribution(df):
     #Exibe a distribuição das variáveis numéricas.
-    numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
+    png = numeric_distribution_figure(df)
+    if png is not None:
+        st.image(png, use_container_width=True)
+    else:
+        st.write("Nenhuma coluna numérica disponível para análise!")
 
-    if len(numeric_cols) > 0:
-        fig, ax = plt.subplots(len(numeric_cols), 1, figsize=(10, len(numeric_cols) * 5))
 
-        for i, col in enumerate(numeric_cols):
-            sns.histplot(df[col].dropna(), bins=20, kde=True, ax=ax[i], color="blue")
-            ax[i].set_title(f"Distribuição de {col}")
+def _views_likes_arrays(df):
+    # Filtra views > 0 e likes > 0 com a máscara do perfil, direto nos arrays
+    mask = compute_profile(df)["masks"]["views_likes_positive"]
+    return likes_views_arrays(df["views"], df["likes"], mask)
 
-        st.pyplot(fig)
+
+def _like_rate_arrays(df):
+    return like_rate_arrays(*_views_likes_arrays(df))
+
+
+@memoize_eda
+def fit_regression_likes_views(df):
+    #Regressão linear likes ~ views; retorna (intercept, slope, R²).
+    # OLS fechado por estatísticas suficientes, sem design matrix nem cópias
+    views, likes = _views_likes_arrays(df)
+    return OLSAccumulator().update(views, likes).params()
+
+
+@memoize_eda
+def regression_likes_views_figure(df, fast=True):
+    views, likes = _views_likes_arrays(df)
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(10, 5))
+    if fast:
+        # Grade de densidade + amostra limitada + reta do OLS já ajustado
+        intercept, slope, _ = fit_regression_likes_views(df)
+        draw_density_regression(ax, views, likes, intercept, slope, log_x=True, log_y=True)
     else:
-        st.write("Nenhuma coluna numérica disponível para análise!")
-        
-def plot_regression_likes_views(df):
+        import seaborn as sns
+        sns.regplot(x=views, y=likes, ax=ax, scatter_kws={"s": 10}, line_kws={"color": "red"})
+    ax.set_xlabel("Views")
+    ax.set_ylabel("Likes")
+    return _figure_png(fig)
+
+
+def plot_regression_likes_views(df, fast=True):
     #Realiza uma regressão linear entre views e likes e exibe o gráfico com a reta ajustada.
     if "views" in df.columns and "likes" in df.columns:
-        df_filtered = df[(df["views"] > 0) & (df["likes"] > 0)].copy()
-        #df_filtered = df_filtered.sample(min(5000, len(df_filtered)))  # Amostra para melhorar performance
-        
-        X = sm.add_constant(df_filtered["views"])
-        y = df_filtered["likes"]
-        model = sm.OLS(y, X).fit()
-        
-        intercept, slope = model.params
-        r_squared = model.rsquared
-
-        fig, ax = plt.subplots(figsize=(10, 5))
-        sns.regplot(x=df_filtered["views"], y=df_filtered["likes"], ax=ax, scatter_kws={"s": 10}, line_kws={"color": "red"})
-        ax.set_xlabel("Views")
-        ax.set_ylabel("Likes")
+        intercept, slope, r_squared = fit_regression_likes_views(df)
 
         st.write(f"### Regressão Linear: Likes vs Views (R² = {r_squared:.4f})")
-        st.pyplot(fig)
+        st.image(regression_likes_views_figure(df, fast), use_container_width=True)
 
         st.write(f"**Equação da regressão:** Likes = {intercept:.2f} + {slope:.6f} × Views")
         st.write(f"**Coeficiente de determinação (R²):** {r_squared:.4f}")
     else:
         st.write("Erro: As colunas 'views' e 'likes' são necessárias para essa análise.")
-        
-def plot_regression_like_rate_vs_views(df):
+
+
+@memoize_eda
+def fit_regression_like_rate_vs_views(df):
+    #Regressão linear like_rate ~ views; retorna (intercept, slope, R²).
+    views, like_rate = _like_rate_arrays(df)
+    return OLSAccumulator().update(views, like_rate).params()
+
+
+@memoize_eda
+def regression_like_rate_vs_views_figure(df, fast=True):
+    views, like_rate = _like_rate_arrays(df)
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(10, 5))
+    if fast:
+        intercept, slope, _ = fit_regression_like_rate_vs_views(df)
+        draw_density_regression(ax, views, like_rate, intercept, slope, log_x=True)
+    else:
+        import seaborn as sns
+        sns.regplot(x=views, y=like_rate, ax=ax, scatter_kws={"s": 10}, line_kws={"color": "red"})
+    ax.set_xlabel("Views")
+    ax.set_ylabel("Taxa de Likes (Likes / Views)")
+    return _figure_png(fig)
+
+
+def plot_regression_like_rate_vs_views(df, fast=True):
     #Realiza uma regressão linear entre views e taxa de likes (likes/views)
     if "views" in df.columns and "likes" in df.columns:
-        df_filtered = df[(df["views"] > 0) & (df["likes"] > 0)].copy()
-        
-        df_filtered["like_rate"] = df_filtered["likes"] / df_filtered["views"]
-
-        # Remover outliers (taxas muito altas, acima de 0.2 = 20%)
-        df_filtered = df_filtered[df_filtered["like_rate"] < 0.2]
-
-        X = sm.add_constant(df_filtered["views"])
-        y = df_filtered["like_rate"]
-        model = sm.OLS(y, X).fit()
-        
-        intercept, slope = model.params
-        r_squared = model.rsquared
-
-        # Plot da regressão
-        fig, ax = plt.subplots(figsize=(10, 5))
-        sns.regplot(x=df_filtered["views"], y=df_filtered["like_rate"], ax=ax, scatter_kws={"s": 10}, line_kws={"color": "red"})
-        ax.set_xlabel("Views")
-        ax.set_ylabel("Taxa de Likes (Likes / Views)")
+        intercept, slope, r_squared = fit_regression_like_rate_vs_views(df)
 
         st.write(f"### Regressão Linear: Taxa de Likes vs Views (R² = {r_squared:.4f})")
-        st.pyplot(fig)
+        st.image(regression_like_rate_vs_views_figure(df, fast), use_container_width=True)
 
         st.write(f"**Equação da regressão:** Taxa de Likes = {intercept:.6f} + {slope:.12f} × Views")
         st.write(f"**Coeficiente de determinação (R²):** {r_squared:.4f}")
     else:
         st.write("Erro: As colunas 'views' e 'likes' são necessárias para essa análise.")
-        
+
+
+@memoize_eda
+def likes_by_view_bins(df, num_bins=10):
+    #Agrupa views em faixas (quantis) e calcula a média de likes de cada faixa.
+    # Remover possíveis valores zero/nulos (máscara já calculada no perfil)
+    df_filtered = df.loc[compute_profile(df)["masks"]["views_positive"], ["views", "likes"]]
+    view_bins = pd.qcut(df_filtered["views"], num_bins, duplicates="drop")
+    return df_filtered.groupby(view_bins, observed=False)["likes"].mean().reset_index()
+
+
+@memoize_eda
+def views_vs_likes_figure(df, num_bins=10):
+    grouped_data = likes_by_view_bins(df, num_bins)
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(x=grouped_data["views"].astype(str), y=grouped_data["likes"], ax=ax, palette="Purples_r")
+    ax.set_xlabel("Faixa de Views")
+    ax.set_ylabel("Média de Likes")
+    ax.tick_params(axis="x", rotation=45)
+    return _figure_png(fig)
+
+
 def plot_views_vs_likes(df, num_bins=10):
     #Agrupa views em faixas e exibe a média de likes para cada faixa.
     if "views" in df.columns and "likes" in df.columns:
-        df_filtered = df[df["views"] > 0]  # Remover possíveis valores zero/nulos
-        df_filtered["view_bins"] = pd.qcut(df_filtered["views"], num_bins, duplicates="drop")
-
-        grouped_data = df_filtered.groupby("view_bins")["likes"].mean().reset_index()
-
-        fig, ax = plt.subplots(figsize=(10, 5))
-        sns.barplot(x=grouped_data["view_bins"].astype(str), y=grouped_data["likes"], ax=ax, palette="Purples_r")
         st.write(f"### Média de Likes por Faixa de Views")
-        ax.set_xlabel("Faixa de Views")
-        ax.set_ylabel("Média de Likes")
-        ax.tick_params(axis="x", rotation=45)
-
-        st.pyplot(fig)
+        st.image(views_vs_likes_figure(df, num_bins), use_container_width=True)
     else:
         st.write("As colunas 'views' e 'likes' são necessárias para esse gráfico.")
 
-        
+
+@memoize_eda
+def views_by_category(df):
+    return df.groupby('category_name', observed=True)['views'].mean().sort_values(ascending=False)
+
+
 def plot_views_by_category(df):
     if 'category_name' not in df.columns:
         st.error("Rode primeiro merge_categories para criar 'category_name'.")
         return
-    agg = df.groupby('category_name')['views'].mean().sort_values(ascending=False)
+    agg = views_by_category(df)
     st.write("### Média de Views por Categoria")
     st.bar_chart(agg)  # Mais leve que seaborn para muitas categorias
 
 
+@memoize_eda
+def top_videos(df, top_n=10):
+    # Uma linha por vídeo por dia em alta: cada vídeo entra uma vez, com seu pico de views
+    if "video_id" in df.columns:
+        peaks = df.loc[df.groupby("video_id", observed=True)["views"].idxmax().dropna()]
+        return peaks.nlargest(top_n, "views")[["video_id", "title", "views"]].reset_index(drop=True)
+    return df.nlargest(top_n, "views")[["title", "views"]]
+
+
 def show_top_videos(df, top_n=10):
     if "title" in df.columns and "views" in df.columns:
-        top_videos = df.nlargest(top_n, "views")[["title", "views"]]
         st.write(f"### Top {top_n} Vídeos Mais Populares")
-        st.dataframe(top_videos)
+        st.dataframe(top_videos(df, top_n))
     else:
         st.write("Erro nas colunas 'title' e 'views' para análise.")
 
 
+def show_trajectories(index, top_n=10):
+    #Resumo do índice de trajetórias (uma linha por vídeo do arquivo completo).
+    features = index.features
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Vídeos", len(features))
+    c2.metric("Dias em alta (média)", f"{features['dias_em_alta'].mean():.1f}")
+    if "horas_ate_trend" in features.columns:
+        c3.metric("Horas até entrar em alta (mediana)", f"{features['horas_ate_trend'].median():.0f}")
+    if "crescimento_views" not in features.columns:
+        return
+    column = st.selectbox("Ordenar por:", ["crescimento_views", "ganho_views_dia", "pico_views", "dias_em_alta"])
+    shown = [c for c in ["title", "dias_em_alta", "views_inicio", "pico_views", "crescimento_views", "horas_ate_trend"] if c in features.columns]
+    top = index.top(column, top_n)[shown]
+    st.write(f"### Top {top_n} Vídeos por {column}")
+    st.dataframe(top)
+    video_id = st.selectbox("Trajetória do vídeo:", top.index.tolist())
+    if video_id is not None:
+        series = index.trajectory(video_id).set_index("trending_date")
+        st.line_chart(series[[c for c in ("views", "likes") if c in series.columns]])
+
+
+@memoize_eda
+def cross_country_summary(df):
+    #Agregados por país para a comparação entre datasets.
+    grouped = df.groupby("country", observed=True)
+    summary = grouped.agg(
+        linhas=("views", "size"),
+        media_views=("views", "mean"),
+        mediana_views=("views", "median"),
+        media_likes=("likes", "mean"),
+    )
+    if "video_id" in df.columns:
+        summary["videos_unicos"] = grouped["video_id"].nunique()
+    summary["taxa_likes"] = grouped["likes"].sum() / grouped["views"].sum()
+    return summary
+
+
+@memoize_eda
+def views_by_category_and_country(df):
+    return df.pivot_table(index="category_name", columns="country", values="views", aggfunc="mean", observed=True)
+
+
+def plot_cross_country(df):
+    if "country" not in df.columns or "views" not in df.columns or "likes" not in df.columns:
+        st.write("Carregue mais de um país para a comparação.")
+        return
+    st.write("### Comparação entre Países")
+    st.dataframe(cross_country_summary(df))
+    if "category_name" in df.columns:
+        st.write("### Média de Views por Categoria e País")
+        st.bar_chart(views_by_category_and_country(df))
+
+
+def show_streaming_summary(stats, category_mapping=None):
+    #Exibe os agregados do arquivo completo calculados em modo streaming.
+    null_pct, zero_pct = stats.null_zero_percentage()
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Linhas (arquivo completo)", stats.rows)
+    c2.metric("Nulos (%)", f"{null_pct:.2f}%")
+    c3.metric("Zeros (%)", f"{zero_pct:.2f}%")
+
+    if stats.likes_views.n > 0:
+        intercept, slope, r_squared = stats.likes_views.params()
+        st.write(f"**Likes vs Views (arquivo completo):** Likes = {intercept:.2f} + {slope:.6f} × Views (R² = {r_squared:.4f})")
+        intercept, slope, r_squared = stats.like_rate_views.params()
+        st.write(f"**Taxa de Likes vs Views (arquivo completo):** Taxa de Likes = {intercept:.6f} + {slope:.12f} × Views (R² = {r_squared:.4f})")
+
+    if len(stats.category_counts) > 0:
+        st.write("### Média de Views por Categoria (arquivo completo)")
+        st.bar_chart(stats.category_means(category_mapping))
+
+    if stats.top_videos is not None:
+        st.write(f"### Top {stats.top_n} Vídeos Mais Populares (arquivo completo)")
+        st.dataframe(stats.top_videos.reset_index(drop=True))
+
+    if stats.histograms:
+        col = st.selectbox("Histograma (escala log):", list(stats.histograms))
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(figsize=(10, 4))
+        ax.stairs(stats.histograms[col], stats.hist_edges, fill=True, color="blue")
+        ax.set_xscale("symlog")
+        ax.set_title(f"Distribuição de {col} (arquivo completo)")
+        st.pyplot(fig)
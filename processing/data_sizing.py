@@ -0,0 +1,132 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.logger import logger
+
+# Texto/categoria com mais valores distintos que isto não entra nas features
+# padrão (títulos, tags, descrições, ids, links)
+TEXT_FEATURE_MAX_UNIQUE = 100
+
+# Curva de aprendizado: começa nesta amostra, dobra a cada passo e para
+# quando uma dobra ganha menos que PLATEAU_GAIN no score de validação
+MIN_SAMPLE_ROWS = 2000
+PLATEAU_GAIN = 0.005
+PROBE_CV_FOLDS = 3
+
+
+def default_features(df, target, keep=()):
+    """Todas as colunas menos o alvo e o texto de alta cardinalidade (exceto as de `keep`)."""
+    features = []
+    for col in df.columns:
+        if col == target:
+            continue
+        if col in keep:
+            features.append(col)
+            continue
+        series = df[col]
+        is_text = (
+            series.dtype == object
+            or pd.api.types.is_string_dtype(series.dtype)
+            or isinstance(series.dtype, pd.CategoricalDtype)
+        )
+        if is_text and series.nunique(dropna=True) > TEXT_FEATURE_MAX_UNIQUE:
+            continue
+        features.append(col)
+    return features
+
+
+def _strata(df, target, task_type):
+    # Regressão: estratifica por decis do alvo
+    if task_type == "regression":
+        return pd.qcut(df[target].rank(method="first"), 10, labels=False, duplicates="drop")
+    return df[target]
+
+
+def stratified_sample(df, target, n_rows, task_type, seed=123):
+    """Amostra de ~n_rows linhas mantendo a proporção de cada classe (ou decil do alvo)."""
+    if n_rows >= len(df):
+        return df
+    frac = n_rows / len(df)
+    strata = _strata(df, target, task_type)
+    # Cada estrato mantém ao menos 2 linhas (CV estratificado precisa delas)
+    positions = []
+    rng = np.random.default_rng(seed)
+    for idx in strata.groupby(strata, observed=True).indices.values():
+        take = min(len(idx), max(2, int(round(frac * len(idx)))))
+        positions.append(rng.choice(idx, size=take, replace=False))
+    return df.iloc[np.sort(np.concatenate(positions))]
+
+
+def _probe_matrix(df, target, task_type):
+    # Matriz numérica para o modelo de sondagem: datas → segundos, texto → códigos
+    columns = []
+    categorical = []
+    for col in df.columns:
+        if col == target:
+            continue
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+            columns.append(series.to_numpy(dtype="float64", na_value=np.nan))
+            categorical.append(False)
+        elif pd.api.types.is_datetime64_any_dtype(series.dtype):
+            seconds = series.astype("int64", copy=False).to_numpy(dtype="float64") / 1e9
+            columns.append(np.where(series.isna().to_numpy(), np.nan, seconds))
+            categorical.append(False)
+        else:
+            codes = pd.Categorical(series).codes.astype("float64")
+            codes[codes < 0] = np.nan
+            columns.append(codes)
+            # HistGradientBoosting aceita até 255 categorias nativas
+            categorical.append(series.nunique(dropna=True) <= 255)
+    X = np.column_stack(columns) if columns else np.empty((len(df), 0))
+    if task_type == "classification":
+        y = pd.Categorical(df[target]).codes
+    else:
+        y = df[target].to_numpy(dtype="float64")
+    return X, y, np.array(categorical, dtype=bool)
+
+
+def learning_curve_size(df, target, task_type, min_rows=MIN_SAMPLE_ROWS, plateau_gain=PLATEAU_GAIN,
+                        cv_folds=PROBE_CV_FOLDS, seed=123):
+    """
+    Treina um modelo rápido (HistGradientBoosting) em amostras estratificadas
+    que dobram de tamanho e mede o ganho de score por dobra. Retorna
+    (nº de linhas escolhido, curva como DataFrame). A escolha é o último
+    tamanho antes do ganho ficar abaixo de plateau_gain.
+    """
+    from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
+    from sklearn.model_selection import KFold, StratifiedKFold, cross_val_score
+
+    df = df[df[target].notna()]
+    sizes = []
+    n = min(min_rows, len(df))
+    while n < len(df):
+        sizes.append(n)
+        n *= 2
+    sizes.append(len(df))
+
+    rows = []
+    chosen = len(df)
+    for n_rows in sizes:
+        sample = stratified_sample(df, target, n_rows, task_type, seed)
+        X, y, categorical = _probe_matrix(sample, target, task_type)
+        if task_type == "classification":
+            estimator = HistGradientBoostingClassifier(categorical_features=categorical, random_state=seed)
+            splitter = StratifiedKFold(cv_folds, shuffle=True, random_state=seed)
+        else:
+            estimator = HistGradientBoostingRegressor(categorical_features=categorical, random_state=seed)
+            splitter = KFold(cv_folds, shuffle=True, random_state=seed)
+        started = time.perf_counter()
+        score = cross_val_score(estimator, X, y, cv=splitter).mean()
+        gain = score - rows[-1]["score"] if rows else np.nan
+        rows.append({"linhas": len(sample), "score": score, "ganho": gain,
+                     "segundos": time.perf_counter() - started})
+        if len(rows) > 1 and gain < plateau_gain:
+            # Dobrar não compensou: fica com o tamanho anterior
+            chosen = rows[-2]["linhas"]
+            break
+    curve = pd.DataFrame(rows)
+    logger.info(f"Dimensionamento de dados: {chosen} de {len(df)} linhas (curva: {len(rows)} pontos)")
+    return chosen, curve
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from config.logger import logger
+
+# Texto com no máximo esta fração de valores distintos vira category
+# (codificação por dicionário: canal, tags e títulos repetidos entre dias).
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+def _is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+def optimize_dtypes(df, category_max_unique_ratio=CATEGORY_MAX_UNIQUE_RATIO):
+    """
+    Reduz o DataFrame para os dtypes mais estreitos: inteiros com downcast,
+    texto repetitivo como category. O relatório de memória antes/depois fica
+    em df.attrs["dtype_report"].
+    """
+    before_bytes = int(df.memory_usage(deep=True).sum())
+    before_dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
+    n_rows = len(df)
+
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series.dtype) and series.dtype.kind in "iu":
+            # Sempre com sinal: evita underflow em contas como likes - dislikes
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif _is_text(series) and n_rows > 0:
+            if series.nunique(dropna=True) <= category_max_unique_ratio * n_rows:
+                df[col] = series.astype("category")
+
+    after_bytes = int(df.memory_usage(deep=True).sum())
+    df.attrs["dtype_report"] = {
+        "before_bytes": before_bytes,
+        "after_bytes": after_bytes,
+        "columns": {
+            col: [before_dtypes[col], str(dtype)]
+            for col, dtype in df.dtypes.items()
+            if before_dtypes[col] != str(dtype)
+        },
+    }
+    logger.info(
+        f"Dtypes otimizados: {before_bytes / 1e6:.1f} MB → {after_bytes / 1e6:.1f} MB"
+    )
+    return df
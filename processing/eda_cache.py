@@ -0,0 +1,202 @@
+import functools
+import hashlib
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config.instrumentation import span
+from config.settings import EDA_CACHE_MAX_BYTES
+
+# Linhas amostradas (espaçadas) para o hash de conteúdo do DataFrame
+FINGERPRINT_SAMPLE_ROWS = 1000
+
+
+def _hashable_sample(sample):
+    # Categóricas entram pelos códigos: hash_pandas_object em category hasheia
+    # a tabela inteira de categorias (cara nos textos do dtype optimizer)
+    columns = {}
+    for col in sample.columns:
+        values = sample[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = pd.Series(values.cat.codes.to_numpy(), index=values.index)
+        columns[col] = values
+    return pd.DataFrame(columns, index=sample.index)
+
+
+def _compute_fingerprint(df):
+    h = hashlib.sha1()
+    h.update(repr(df.shape).encode())
+    h.update(repr(list(zip(df.columns, map(str, df.dtypes)))).encode())
+    categories = [len(df[c].cat.categories) for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    h.update(repr(categories).encode())
+    if len(df) > 0:
+        step = max(1, len(df) // FINGERPRINT_SAMPLE_ROWS)
+        sample = _hashable_sample(df.iloc[::step])
+        h.update(pd.util.hash_pandas_object(sample, index=True).to_numpy().tobytes())
+        numeric = df.select_dtypes(include="number")
+        if numeric.shape[1] > 0:
+            h.update(numeric.sum(skipna=True).to_numpy(dtype="float64").tobytes())
+    return h.hexdigest()
+
+
+# Fingerprint por objeto (id → weakref, estrutura, fingerprint): os plots
+# chamam várias funções memoizadas com o mesmo DataFrame a cada rerun
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+def _buffer_address(series):
+    # Endereço do array de dados da coluna (códigos, nas categóricas); sem cópia
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.cat.codes.to_numpy()
+    else:
+        values = series.to_numpy(copy=False)
+    return values.__array_interface__["data"][0]
+
+
+def _structure(df):
+    # Muda quando colunas são trocadas/adicionadas (ex.: merge_categories);
+    # escrita in-place em valores de uma coluna existente não é detectada
+    buffers = (
+        tuple(_buffer_address(df.iloc[:, i]) for i in range(df.shape[1]))
+        if len(df) else ()
+    )
+    return df.shape, tuple(df.columns), tuple(map(str, df.dtypes)), buffers
+
+
+def dataframe_fingerprint(df):
+    """
+    Impressão digital barata do conteúdo: shape, colunas/dtypes, hash de
+    uma amostra espaçada de linhas e soma das colunas numéricas. Calculada
+    uma vez por objeto enquanto suas colunas não mudarem.
+    """
+    structure = _structure(df)
+    with _fingerprints_lock:
+        entry = _fingerprints.get(id(df))
+        if entry is not None and entry[0]() is df and entry[1] == structure:
+            return entry[2]
+    fingerprint = _compute_fingerprint(df)
+    key = id(df)
+
+    def forget(_ref, key=key):
+        with _fingerprints_lock:
+            if _fingerprints.get(key, (None,))[0] is _ref:
+                del _fingerprints[key]
+
+    with _fingerprints_lock:
+        _fingerprints[key] = (weakref.ref(df, forget), structure, fingerprint)
+    return fingerprint
+
+
+def dataframe_content_hash(df):
+    """
+    Hash de todo o conteúdo (todas as linhas, índice, colunas e dtypes), para
+    chaves persistentes (modelos, features, sweeps). Mais caro que o fingerprint
+    amostrado, que só serve ao cache de EDA em memória.
+    """
+    h = hashlib.sha1()
+    h.update(repr(df.shape).encode())
+    h.update(repr(list(zip(df.columns, map(str, df.dtypes)))).encode())
+    if len(df) > 0:
+        h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def estimate_size(value):
+    # Estimativa do custo em memória de um resultado cacheado
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class EdaCache:
+    """Cache LRU por processo (compartilhado entre sessões) com orçamento de memória."""
+
+    def __init__(self, max_bytes=EDA_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.current_bytes -= old_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+eda_cache = EdaCache()
+
+
+def _key_part(value):
+    if isinstance(value, pd.DataFrame):
+        return ("df", dataframe_fingerprint(value))
+    return repr(value)
+
+
+def memoize_eda(func):
+    """Memoiza uma função de análise pelo fingerprint dos DataFrames + argumentos."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (
+            func.__module__,
+            func.__qualname__,
+            tuple(_key_part(a) for a in args),
+            tuple(sorted((k, _key_part(v)) for k, v in kwargs.items())),
+        )
+        rows = next((len(a) for a in args if isinstance(a, pd.DataFrame)), None)
+        with span(func.__name__, rows=rows) as record:
+            found, value = eda_cache.get(key)
+            record["cache"] = "hit" if found else "miss"
+            if not found:
+                value = func(*args, **kwargs)
+                eda_cache.put(key, value)
+        return value
+
+    return wrapper
@@ -0,0 +1,173 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from processing.rendering import sample_indices
+
+# Pontos do holdout guardados para os gráficos de regressão (métricas usam todos)
+MAX_EVAL_POINTS = 20000
+# Pontos por curva ROC guardados (curvas longas são reamostradas)
+MAX_ROC_POINTS = 500
+
+
+def _roc_points(y_true_binary, scores):
+    from sklearn.metrics import auc, roc_curve
+    fpr, tpr, _ = roc_curve(y_true_binary, scores)
+    area = auc(fpr, tpr)
+    if len(fpr) > MAX_ROC_POINTS:
+        grid = np.linspace(0, 1, MAX_ROC_POINTS)
+        tpr, fpr = np.interp(grid, fpr, tpr), grid
+    return fpr.astype("float32"), tpr.astype("float32"), area
+
+
+def classification_artifacts(y_true, y_pred, y_score=None, classes=None, class_names=None):
+    """
+    Holdout → arrays compactos: matriz de confusão, acurácia e curvas ROC
+    (uma por classe; só a positiva no caso binário).
+    """
+    from sklearn.metrics import accuracy_score, confusion_matrix
+    y_true = np.asarray(y_true)
+    classes = np.unique(np.concatenate([y_true, np.asarray(y_pred)])) if classes is None else np.asarray(classes)
+    names = np.asarray(class_names if class_names is not None else classes).astype(str)
+    artifacts = {
+        "class_names": names,
+        "confusion": confusion_matrix(y_true, y_pred, labels=classes).astype("int64"),
+        "accuracy": np.float64(accuracy_score(y_true, y_pred)),
+    }
+    if y_score is not None:
+        y_score = np.asarray(y_score, dtype="float64")
+        if y_score.ndim == 1:
+            y_score = np.column_stack([-y_score, y_score])
+        roc_classes = [1] if len(classes) == 2 else range(len(classes))
+        fprs, tprs, offsets, aucs, labels = [], [], [0], [], []
+        for i in roc_classes:
+            positives = y_true == classes[i]
+            if positives.all() or not positives.any():
+                continue
+            fpr, tpr, area = _roc_points(positives, y_score[:, i])
+            fprs.append(fpr)
+            tprs.append(tpr)
+            offsets.append(offsets[-1] + len(fpr))
+            aucs.append(area)
+            labels.append(names[i])
+        if aucs:
+            artifacts.update(
+                roc_fpr=np.concatenate(fprs), roc_tpr=np.concatenate(tprs),
+                roc_offsets=np.asarray(offsets, dtype="int64"), roc_auc=np.asarray(aucs),
+                roc_labels=np.asarray(labels),
+            )
+    return artifacts
+
+
+def regression_artifacts(y_true, y_pred):
+    """Holdout → métricas (todas as linhas) + amostra de (real, previsto) para os gráficos."""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    y_true = np.asarray(y_true, dtype="float64")
+    y_pred = np.asarray(y_pred, dtype="float64")
+    idx = sample_indices(len(y_true), cap=MAX_EVAL_POINTS)
+    return {
+        "y_true": y_true[idx].astype("float32"),
+        "y_pred": y_pred[idx].astype("float32"),
+        "r2": np.float64(r2_score(y_true, y_pred)),
+        "mae": np.float64(mean_absolute_error(y_true, y_pred)),
+        "rmse": np.float64(np.sqrt(mean_squared_error(y_true, y_pred))),
+    }
+
+
+def estimator_artifacts(estimator, X_test, y_test, task_type, class_names=None):
+    """Pontua o holdout uma vez (logo após o treino) e resume em arrays."""
+    y_pred = estimator.predict(X_test)
+    if task_type == "regression":
+        return regression_artifacts(y_test, y_pred)
+    if hasattr(estimator, "predict_proba"):
+        y_score = estimator.predict_proba(X_test)
+    elif hasattr(estimator, "decision_function"):
+        y_score = estimator.decision_function(X_test)
+    else:
+        y_score = None
+    classes = getattr(estimator, "classes_", None)
+    return classification_artifacts(y_test, y_pred, y_score, classes, class_names)
+
+
+# Gráficos desenhados com a API orientada a objetos (Figure), sem pyplot:
+# cada família roda numa thread própria sem estado global compartilhado
+
+def _png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
+
+
+def _confusion_png(a):
+    from matplotlib.figure import Figure
+    cm, names = a["confusion"], a["class_names"]
+    fig = Figure(figsize=(6, 5))
+    ax = fig.subplots()
+    mesh = ax.imshow(cm, cmap="Blues")
+    fig.colorbar(mesh, ax=ax)
+    ax.set_xticks(range(len(names)), names, rotation=45, ha="right")
+    ax.set_yticks(range(len(names)), names)
+    if cm.size <= 400:
+        for (i, j), value in np.ndenumerate(cm):
+            ax.text(j, i, value, ha="center", va="center", color="white" if value > cm.max() / 2 else "black")
+    ax.set_xlabel("Previsto")
+    ax.set_ylabel("Real")
+    ax.set_title(f"Matriz de Confusão (acurácia = {float(a['accuracy']):.4f})")
+    return _png(fig)
+
+
+def _roc_png(a):
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(6, 5))
+    ax = fig.subplots()
+    offsets = a["roc_offsets"]
+    for i, label in enumerate(a["roc_labels"]):
+        start, end = offsets[i], offsets[i + 1]
+        ax.plot(a["roc_fpr"][start:end], a["roc_tpr"][start:end], label=f"{label} (AUC = {a['roc_auc'][i]:.3f})")
+    ax.plot([0, 1], [0, 1], linestyle="--", color="gray")
+    ax.set_xlabel("Taxa de falsos positivos")
+    ax.set_ylabel("Taxa de verdadeiros positivos")
+    ax.set_title("Curva ROC")
+    ax.legend(loc="lower right", fontsize="small")
+    return _png(fig)
+
+
+def _residuals_png(a):
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(6, 5))
+    ax = fig.subplots()
+    residuals = a["y_true"] - a["y_pred"]
+    ax.scatter(a["y_pred"], residuals, s=6, alpha=0.4)
+    ax.axhline(0, color="red")
+    ax.set_xlabel("Previsto")
+    ax.set_ylabel("Resíduo (real − previsto)")
+    ax.set_title(f"Resíduos (RMSE = {float(a['rmse']):.4g}, MAE = {float(a['mae']):.4g})")
+    return _png(fig)
+
+
+def _error_png(a):
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(6, 5))
+    ax = fig.subplots()
+    ax.scatter(a["y_true"], a["y_pred"], s=6, alpha=0.4)
+    lo = float(min(a["y_true"].min(), a["y_pred"].min()))
+    hi = float(max(a["y_true"].max(), a["y_pred"].max()))
+    ax.plot([lo, hi], [lo, hi], color="red", linestyle="--")
+    ax.set_xlabel("Real")
+    ax.set_ylabel("Previsto")
+    ax.set_title(f"Erro de previsão (R² = {float(a['r2']):.4f})")
+    return _png(fig)
+
+
+def evaluation_figures(artifacts, task_type):
+    """Renderiza as famílias de gráfico em paralelo a partir dos arrays; {nome: png}."""
+    if task_type == "classification":
+        families = {"confusion_matrix": _confusion_png}
+        if "roc_auc" in artifacts:
+            families["auc"] = _roc_png
+    else:
+        families = {"residuals": _residuals_png, "error": _error_png}
+    with ThreadPoolExecutor(max_workers=len(families)) as pool:
+        futures = {name: pool.submit(draw, artifacts) for name, draw in families.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+
+from config.instrumentation import span
+from config.logger import attach_worker_queue, worker_log_queue
+from data.category_index import country_code
+from processing.data_analysis import load_data, merge_categories
+
+# Colunas que viram category com o mesmo dtype em todos os países
+SHARED_CATEGORICAL_COLUMNS = ["country", "category_name"]
+
+
+def _load_country(file_path, max_rows):
+    df = load_data(file_path, max_rows)
+    if 'category_id' in df.columns:
+        df = merge_categories(df, file_path)
+    df['country'] = country_code(file_path)
+    return df
+
+
+def concat_with_shared_categories(frames, columns=SHARED_CATEGORICAL_COLUMNS):
+    """Concatena usando a união das categorias, para o concat não cair em object."""
+    # Também unifica colunas que já são category em todos os frames (dtype optimizer)
+    columns = list(columns) + [
+        col for col in frames[0].columns
+        if col not in columns and all(
+            col in f.columns and isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames
+        )
+    ]
+    for col in columns:
+        if not all(col in f.columns for f in frames):
+            continue
+        categories = sorted(set().union(*(f[col].dropna().unique() for f in frames)))
+        dtype = pd.CategoricalDtype(categories)
+        frames = [f.assign(**{col: f[col].astype(dtype)}) for f in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_countries(file_paths, max_rows=10000, max_workers=None):
+    """
+    Carrega vários XXvideos.csv em paralelo (um processo por arquivo),
+    marca cada linha com o país e concatena com dtypes categóricos comuns.
+    """
+    if not file_paths:
+        return None
+    max_workers = max_workers or min(len(file_paths), os.cpu_count() or 1)
+    with span("load_countries", countries=len(file_paths)) as record:
+        if max_workers == 1:
+            frames = [_load_country(p, max_rows) for p in file_paths]
+        else:
+            # spawn como nos outros pools: fork dentro do servidor (multi-thread) pode travar
+            with ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=attach_worker_queue, initargs=(worker_log_queue(),)
+            ) as pool:
+                frames = list(pool.map(_load_country, file_paths, repeat(max_rows)))
+        df = concat_with_shared_categories(frames)
+        record["rows"] = len(df)
+    return df
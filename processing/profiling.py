@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from processing.eda_cache import memoize_eda
+
+HIST_BINS = 20
+
+
+def _profile_column(series):
+    kind = series.dtype.kind
+    stats = {"dtype": str(series.dtype), "numeric": kind in "iuf"}
+
+    if kind == "b":
+        # bool: False == 0, como em (df == 0)
+        values = series.to_numpy(dtype=bool, na_value=True)
+        stats["nulls"] = int(series.isna().sum())
+        stats["zeros"] = int(values.size - np.count_nonzero(values))
+        return stats
+    if kind in "iuf":
+        data = series.to_numpy(dtype="float64", na_value=np.nan)
+        missing = np.isnan(data)
+        valid = data[~missing] if missing.any() else data
+        stats["nulls"] = int(missing.sum())
+        stats["zeros"] = int(valid.size - np.count_nonzero(valid))
+        if valid.size > 0:
+            counts, edges = np.histogram(valid, bins=HIST_BINS)
+            stats.update(
+                min=float(valid.min()),
+                max=float(valid.max()),
+                mean=float(valid.mean()),
+                std=float(valid.std(ddof=1)) if valid.size > 1 else 0.0,
+                hist_counts=counts,
+                hist_edges=edges,
+            )
+        return stats
+
+    # datas/texto/category: nulos via máscara; zeros só se houver o inteiro 0
+    stats["nulls"] = int(series.isna().sum())
+    stats["zeros"] = int((series.to_numpy() == 0).sum()) if series.dtype == object else 0
+    return stats
+
+
+@memoize_eda
+def compute_profile(df):
+    """
+    Perfil do DataFrame numa única passada pelos buffers NumPy de cada coluna:
+    nulos, zeros, min/max, média/desvio e bins de histograma, além das máscaras
+    de views/likes positivos usadas pelas regressões e faixas de views.
+    """
+    columns = {col: _profile_column(df[col]) for col in df.columns}
+    profile = {
+        "rows": len(df),
+        "size": df.size,
+        "columns": columns,
+        "null_total": sum(c["nulls"] for c in columns.values()),
+        "zero_total": sum(c["zeros"] for c in columns.values()),
+        "masks": {},
+    }
+    if "views" in df.columns:
+        views_positive = df["views"].to_numpy() > 0
+        profile["masks"]["views_positive"] = views_positive
+        if "likes" in df.columns:
+            profile["masks"]["views_likes_positive"] = views_positive & (df["likes"].to_numpy() > 0)
+    return profile
+
+
+def missing_counts(profile):
+    return pd.Series({col: c["nulls"] for col, c in profile["columns"].items()}, dtype="int64")
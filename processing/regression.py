@@ -0,0 +1,89 @@
+import numpy as np
+
+
+class OLSAccumulator:
+    """
+    Regressão linear simples y ~ a + b·x por estatísticas suficientes.
+
+    Guarda n, médias e somas de produtos centradas (equivalentes a Σx, Σy,
+    Σxy, Σx², Σy², mas sem o cancelamento numérico com views na casa de 1e8),
+    pode ser atualizada chunk a chunk e combinada entre partições. Produz os
+    mesmos intercept, slope e R² que sm.OLS(y, add_constant(x)).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sxx = 0.0
+        self.syy = 0.0
+        self.sxy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype="float64")
+        y = np.asarray(y, dtype="float64")
+        n = x.size
+        if n == 0:
+            return self
+        other = OLSAccumulator()
+        other.n = n
+        other.mean_x = float(x.mean())
+        other.mean_y = float(y.mean())
+        dx = x - other.mean_x
+        dy = y - other.mean_y
+        other.sxx = float(dx @ dx)
+        other.syy = float(dy @ dy)
+        other.sxy = float(dx @ dy)
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean_x, self.mean_y = other.n, other.mean_x, other.mean_y
+            self.sxx, self.syy, self.sxy = other.sxx, other.syy, other.sxy
+            return self
+        n = self.n + other.n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        factor = self.n * other.n / n
+        self.sxx += other.sxx + delta_x * delta_x * factor
+        self.syy += other.syy + delta_y * delta_y * factor
+        self.sxy += other.sxy + delta_x * delta_y * factor
+        self.mean_x += delta_x * other.n / n
+        self.mean_y += delta_y * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def slope(self):
+        return self.sxy / self.sxx if self.sxx > 0 else float("nan")
+
+    @property
+    def intercept(self):
+        return self.mean_y - self.slope * self.mean_x
+
+    @property
+    def rsquared(self):
+        if self.sxx <= 0 or self.syy <= 0:
+            return float("nan")
+        return self.sxy * self.sxy / (self.sxx * self.syy)
+
+    def params(self):
+        return self.intercept, self.slope, self.rsquared
+
+
+def likes_views_arrays(views, likes, mask=None):
+    # Mesmo filtro das análises: apenas views > 0 e likes > 0
+    views = np.asarray(views, dtype="float64")
+    likes = np.asarray(likes, dtype="float64")
+    if mask is None:
+        mask = (views > 0) & (likes > 0)
+    return views[mask], likes[mask]
+
+
+def like_rate_arrays(views, likes):
+    # Recebe arrays já filtrados; remove outliers (taxas acima de 0.2 = 20%)
+    like_rate = likes / views
+    keep = like_rate < 0.2
+    return views[keep], like_rate[keep]
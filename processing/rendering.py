@@ -0,0 +1,59 @@
+import numpy as np
+
+# Limite de pontos desenhados por gráfico de dispersão e semente fixa,
+# para que o mesmo DataFrame gere sempre a mesma imagem.
+MAX_SCATTER_POINTS = 2000
+SAMPLE_SEED = 42
+GRID_BINS = 80
+
+
+def sample_indices(n_rows, cap=MAX_SCATTER_POINTS, seed=SAMPLE_SEED):
+    """Índices de uma amostra uniforme e determinística de no máximo `cap` linhas."""
+    if n_rows <= cap:
+        return np.arange(n_rows)
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(n_rows, size=cap, replace=False))
+
+
+def _edges(values, bins, log):
+    lo, hi = float(values.min()), float(values.max())
+    if hi <= lo:
+        hi = lo + 1.0
+    if log:
+        return np.logspace(np.log10(lo), np.log10(hi), bins + 1)
+    return np.linspace(lo, hi, bins + 1)
+
+
+def density_grid(x, y, bins=GRID_BINS, log_x=False, log_y=False):
+    """Grade 2D de contagens (histogram2d) usada no lugar de um ponto por linha."""
+    x_edges = _edges(x, bins, log_x)
+    y_edges = _edges(y, bins, log_y)
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    return counts, x_edges, y_edges
+
+
+def draw_density_regression(ax, x, y, intercept, slope, log_x=False, log_y=False):
+    """
+    Desenha a grade de densidade, uma amostra limitada dos pontos e a reta
+    a partir dos parâmetros já ajustados; o custo não cresce com o nº de linhas.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    if len(x) == 0:
+        return
+    counts, x_edges, y_edges = density_grid(x, y, log_x=log_x, log_y=log_y)
+    from matplotlib.colors import LogNorm
+    masked = np.ma.masked_equal(counts.T, 0)
+    mesh = ax.pcolormesh(x_edges, y_edges, masked, cmap="Blues", norm=LogNorm())
+    ax.figure.colorbar(mesh, ax=ax, label="Linhas por célula")
+
+    idx = sample_indices(len(x))
+    ax.scatter(x[idx], y[idx], s=4, color="navy", alpha=0.3)
+
+    line_x = np.geomspace(x_edges[0], x_edges[-1], 200) if log_x else np.linspace(x_edges[0], x_edges[-1], 200)
+    ax.plot(line_x, intercept + slope * line_x, color="red")
+    if log_x:
+        ax.set_xscale("log")
+    if log_y:
+        ax.set_yscale("log")
+    ax.set_ylim(y_edges[0], y_edges[-1])
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from config.instrumentation import span
+from processing.data_analysis import normalize_frame
+from processing.regression import OLSAccumulator, likes_views_arrays, like_rate_arrays
+
+# Bins fixos (escala log) para que os histogramas possam ser somados chunk a chunk
+# sem conhecer o min/max do arquivo: [0, 1), depois 4 bins por década até 1e12.
+HIST_EDGES = np.concatenate([[0.0], np.logspace(0, 12, 49)])
+
+
+class StreamingStats:
+    """
+    Agregados exatos calculados incrementalmente sobre chunks do CSV:
+    nulos/zeros por coluna, média de views por categoria, top-N vídeos,
+    contagens de histograma e as regressões likes/views. A memória depende
+    só do tamanho do chunk.
+    """
+
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self.rows = 0
+        self.null_counts = pd.Series(dtype="int64")
+        self.zero_counts = pd.Series(dtype="int64")
+        self.category_sums = pd.Series(dtype="float64")
+        self.category_counts = pd.Series(dtype="int64")
+        self.top_videos = None
+        self.histograms = {}
+        self.hist_edges = HIST_EDGES
+        self.likes_views = OLSAccumulator()
+        self.like_rate_views = OLSAccumulator()
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        self.null_counts = self.null_counts.add(chunk.isnull().sum(), fill_value=0)
+        self.zero_counts = self.zero_counts.add((chunk == 0).sum(), fill_value=0)
+
+        if "category_id" in chunk.columns and "views" in chunk.columns:
+            grouped = chunk.groupby("category_id")["views"].agg(["sum", "count"])
+            self.category_sums = self.category_sums.add(grouped["sum"], fill_value=0)
+            self.category_counts = self.category_counts.add(grouped["count"], fill_value=0)
+
+        if "title" in chunk.columns and "views" in chunk.columns:
+            columns = ["title", "views"]
+            peaks = chunk
+            if "video_id" in chunk.columns:
+                # Pico de cada vídeo no chunk (só para o top-N; os demais
+                # agregados usam todas as linhas); o merge mantém o maior entre chunks
+                peaks = chunk.loc[chunk.groupby("video_id")["views"].idxmax().dropna()]
+                columns = ["video_id"] + columns
+            self._merge_top(peaks.nlargest(self.top_n, "views")[columns])
+
+        if "views" in chunk.columns and "likes" in chunk.columns:
+            views, likes = likes_views_arrays(chunk["views"], chunk["likes"])
+            self.likes_views.update(views, likes)
+            self.like_rate_views.update(*like_rate_arrays(views, likes))
+
+        for col in chunk.select_dtypes(include="number").columns:
+            values = chunk[col].dropna().to_numpy(dtype="float64")
+            counts, _ = np.histogram(np.clip(values, 0, HIST_EDGES[-1]), bins=HIST_EDGES)
+            if col in self.histograms:
+                self.histograms[col] += counts
+            else:
+                self.histograms[col] = counts
+        return self
+
+    def merge(self, other):
+        # Combina agregados de outra partição (ex.: outro arquivo/processo)
+        self.rows += other.rows
+        self.null_counts = self.null_counts.add(other.null_counts, fill_value=0)
+        self.zero_counts = self.zero_counts.add(other.zero_counts, fill_value=0)
+        self.category_sums = self.category_sums.add(other.category_sums, fill_value=0)
+        self.category_counts = self.category_counts.add(other.category_counts, fill_value=0)
+        self.likes_views.merge(other.likes_views)
+        self.like_rate_views.merge(other.like_rate_views)
+        if other.top_videos is not None:
+            self._merge_top(other.top_videos)
+        for col, counts in other.histograms.items():
+            if col in self.histograms:
+                self.histograms[col] = self.histograms[col] + counts
+            else:
+                self.histograms[col] = counts.copy()
+        return self
+
+    def _merge_top(self, candidates):
+        if self.top_videos is None:
+            self.top_videos = candidates
+        else:
+            merged = pd.concat([self.top_videos, candidates])
+            if "video_id" in merged.columns:
+                merged = merged.sort_values("views", ascending=False).drop_duplicates("video_id")
+            self.top_videos = merged.nlargest(self.top_n, "views")
+
+    def null_zero_percentage(self):
+        total_values = self.rows * len(self.null_counts)
+        if total_values == 0:
+            return 0.0, 0.0
+        null_percentage = self.null_counts.sum() / total_values * 100
+        zero_percentage = self.zero_counts.sum() / total_values * 100
+        return null_percentage, zero_percentage
+
+    def category_means(self, mapping=None):
+        sums = self.category_sums
+        counts = self.category_counts.reindex(sums.index)
+        if mapping is not None:
+            # Ids sem nome caem todos em "Desconhecido": soma antes de dividir
+            names = [mapping.get(int(i), "Desconhecido") for i in sums.index]
+            sums = sums.groupby(names).sum()
+            counts = counts.groupby(names).sum()
+        return (sums / counts).sort_values(ascending=False)
+
+
+def stream_aggregates(file_path, chunksize=100000, top_n=10):
+    """Lê o CSV inteiro em chunks e retorna um StreamingStats com os agregados exatos."""
+    stats = StreamingStats(top_n=top_n)
+    with span("stream_aggregates") as record:
+        for chunk in pd.read_csv(file_path, chunksize=chunksize):
+            stats.update(normalize_frame(chunk))
+        record["rows"] = stats.rows
+    return stats
@@ -0,0 +1,62 @@
+import numpy as np
+
+# scipy/sklearn são importados dentro das funções: a UI importa este módulo no startup
+
+# Colunas de texto livre dos dumps do YouTube
+TEXT_COLUMNS = ["title", "tags", "description"]
+
+# Largura fixa por coluna (sem vocabulário): memória não cresce com o texto
+HASH_N_FEATURES = 2 ** 18
+# Linhas por chunk de hashing (cada chunk vira uma matriz esparsa independente)
+TEXT_CHUNK_ROWS = 20000
+
+
+def split_tags(text):
+    # tags vêm como "tag um"|"tag dois"; "[none]" = sem tags
+    if not text or text == "[none]":
+        return []
+    return [tag.strip().strip('"').lower() for tag in text.split("|") if tag.strip().strip('"')]
+
+
+def _vectorizer(column, n_features):
+    from sklearn.feature_extraction.text import HashingVectorizer
+    if column == "tags":
+        return HashingVectorizer(
+            n_features=n_features, tokenizer=split_tags, token_pattern=None, lowercase=False,
+            alternate_sign=False, dtype=np.float32,
+        )
+    return HashingVectorizer(
+        n_features=n_features, ngram_range=(1, 2), alternate_sign=False, dtype=np.float32,
+    )
+
+
+def _hash_chunk(chunk, columns, n_features):
+    from scipy import sparse
+    blocks = [
+        # astype(object) antes do fillna: colunas category (optimize_dtypes) não aceitam "" como valor novo
+        _vectorizer(col, n_features).transform(chunk[col].astype(object).fillna("").astype(str))
+        for col in columns
+    ]
+    return sparse.hstack(blocks, format="csr")
+
+
+def hash_text(df, columns, n_features=HASH_N_FEATURES, chunk_rows=TEXT_CHUNK_ROWS, n_jobs=None):
+    """
+    Texto → matriz CSR (n_linhas × n_colunas·n_features). O hashing não tem
+    estado, então os chunks de linhas são processados em paralelo e empilhados.
+    """
+    from joblib import Parallel, delayed
+    from scipy import sparse
+
+    frame = df[columns]
+    chunks = [frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows)]
+    if len(chunks) <= 1 or n_jobs == 1:
+        parts = [_hash_chunk(chunk, columns, n_features) for chunk in chunks]
+    else:
+        parts = Parallel(n_jobs=n_jobs or -1)(
+            delayed(_hash_chunk)(chunk, columns, n_features) for chunk in chunks
+        )
+    if not parts:
+        return sparse.csr_matrix((0, len(columns) * n_features), dtype=np.float32)
+    return sparse.vstack(parts, format="csr")
+
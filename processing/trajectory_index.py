@@ -0,0 +1,300 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from config.instrumentation import span
+from config.logger import logger
+from config.settings import TRAJECTORY_CACHE_DIR
+from processing.data_analysis import normalize_frame
+
+# Incrementar quando as features abaixo mudarem (invalida os índices gravados)
+TRAJECTORY_VERSION = 2
+# Linhas por chunk ao ler o CSV (só as colunas do índice ficam em memória)
+TRAJECTORY_CHUNK_ROWS = 100000
+
+# Série diária guardada por vídeo; o resto vem da linha mais recente do vídeo
+ROW_COLUMNS = ["trending_date", "views", "likes", "dislikes", "comment_count"]
+STATIC_COLUMNS = ["title", "channel_title", "category_id", "publish_time"]
+# Chave composta (vídeo, dia) em um int64: dias desde 1970 cabem com folga
+_DAY_SLOTS = 1_000_000
+
+
+def _prepare(df):
+    """Colunas do índice, sem linhas sem vídeo/data e com uma linha por (vídeo, dia)."""
+    frame = df[[c for c in ["video_id"] + ROW_COLUMNS + STATIC_COLUMNS if c in df.columns]]
+    frame = frame.dropna(subset=["video_id", "trending_date"])
+    # Contagens em float64: um chunk com NaN não muda o dtype do índice
+    counts = {c: frame[c].astype("float64") for c in ROW_COLUMNS[1:] if c in frame.columns}
+    frame = frame.assign(video_id=frame["video_id"].astype(str), **counts)
+    # Os dumps repetem algumas linhas no mesmo dia: vale a primeira, como no update
+    frame = frame.drop_duplicates(["video_id", "trending_date"], keep="first")
+    order = np.lexsort((frame["trending_date"].to_numpy("datetime64[ns]"), frame["video_id"].to_numpy(object)))
+    return frame.iloc[order].reset_index(drop=True)
+
+
+def _days(dates):
+    return np.asarray(dates, dtype="datetime64[D]").astype("int64")
+
+
+def trajectory_features(rows, offsets):
+    """
+    Features por vídeo a partir das linhas ordenadas (vídeo i = rows[offsets[i]:offsets[i+1]]),
+    tudo vetorizado com os índices da primeira/última linha de cada vídeo.
+    """
+    first, last = offsets[:-1], offsets[1:] - 1
+    dates = rows["trending_date"].to_numpy("datetime64[ns]")
+    span_days = (dates[last] - dates[first]) / np.timedelta64(1, "D")
+    elapsed = np.maximum(span_days, 1)
+    features = pd.DataFrame({
+        "primeira_data": dates[first],
+        "ultima_data": dates[last],
+        "dias_em_alta": np.diff(offsets),
+    })
+    for col, name in (("views", "views"), ("likes", "likes")):
+        if col not in rows.columns:
+            continue
+        values = rows[col].to_numpy("float64")
+        features[f"{name}_inicio"] = values[first]
+        features[f"{name}_fim"] = values[last]
+        features[f"pico_{name}"] = np.maximum.reduceat(values, first) if len(first) else values[first]
+        # Ganho absoluto e crescimento relativo (log) por dia em alta
+        features[f"ganho_{name}_dia"] = (values[last] - values[first]) / elapsed
+        features[f"crescimento_{name}"] = (np.log1p(values[last]) - np.log1p(values[first])) / elapsed
+    if "views" in rows.columns and "likes" in rows.columns:
+        views_last = rows["views"].to_numpy("float64")[last]
+        features["taxa_likes"] = np.where(views_last > 0, rows["likes"].to_numpy("float64")[last] / np.maximum(views_last, 1), np.nan)
+    return features
+
+
+class TrajectoryIndex:
+    """
+    Índice por vídeo: linhas ordenadas por (video_id, trending_date), offsets
+    por vídeo e as features de trajetória (dias em alta, crescimento de views
+    e likes, horas da publicação até entrar em alta).
+    """
+
+    def __init__(self, video_ids, offsets, rows, features):
+        self.video_ids = video_ids
+        self.offsets = offsets
+        self.rows = rows
+        self.features = features
+
+    @property
+    def last_date(self):
+        return self.rows["trending_date"].max() if len(self.rows) else None
+
+    @classmethod
+    def build(cls, df):
+        with span("trajectory_build", rows=len(df)):
+            frame = _prepare(df)
+            ids = frame["video_id"].to_numpy(object)
+            video_ids, starts = np.unique(ids, return_index=True)
+            offsets = np.append(starts, len(ids)).astype("int64")
+            rows = frame[[c for c in ROW_COLUMNS if c in frame.columns]]
+            static = frame.iloc[offsets[1:] - 1] if len(ids) else frame.iloc[:0]
+            features = cls._with_static(trajectory_features(rows, offsets), static, video_ids)
+        return cls(video_ids, offsets, rows, features)
+
+    @staticmethod
+    def _with_static(features, static, video_ids):
+        static = static[[c for c in STATIC_COLUMNS if c in static.columns]].reset_index(drop=True)
+        features = pd.concat([static, features], axis=1)
+        if "publish_time" in features.columns:
+            delta = features["primeira_data"] - pd.to_datetime(features["publish_time"])
+            features["horas_ate_trend"] = delta.dt.total_seconds() / 3600
+        features.index = pd.Index(video_ids, name="video_id")
+        return features
+
+    def _row_keys(self):
+        codes = np.repeat(np.arange(len(self.video_ids)), np.diff(self.offsets))
+        return codes * _DAY_SLOTS + _days(self.rows["trending_date"].to_numpy("datetime64[ns]"))
+
+    def update(self, df):
+        """
+        Incorpora linhas novas (ex.: o arquivo do dia que chegou): insere nas
+        posições ordenadas e recalcula as features só dos vídeos tocados.
+        Retorna quantas linhas novas entraram.
+        """
+        frame = _prepare(df)
+        if frame.empty:
+            return 0
+        with span("trajectory_update", rows=len(frame)) as record:
+            ids = frame["video_id"].to_numpy(object)
+            days = _days(frame["trending_date"].to_numpy("datetime64[ns]"))
+            codes = np.searchsorted(self.video_ids, ids)
+            known = (codes < len(self.video_ids)) & (self.video_ids[np.minimum(codes, len(self.video_ids) - 1)] == ids) \
+                if len(self.video_ids) else np.zeros(len(ids), dtype=bool)
+
+            # Posição de inserção: vídeos conhecidos pela chave (vídeo, dia);
+            # vídeos novos antes do primeiro vídeo de id maior
+            positions = self.offsets[codes].copy()
+            if known.any():
+                old_keys = self._row_keys()
+                new_keys = codes[known] * _DAY_SLOTS + days[known]
+                positions[known] = np.searchsorted(old_keys, new_keys)
+                # (vídeo, dia) já indexado: ignora a linha repetida
+                hit = positions[known] < len(old_keys)
+                duplicate = np.zeros(len(ids), dtype=bool)
+                duplicate[np.flatnonzero(known)[hit]] = old_keys[positions[known][hit]] == new_keys[hit]
+                if duplicate.any():
+                    keep = ~duplicate
+                    frame, ids, codes, known, positions = (
+                        frame[keep].reset_index(drop=True), ids[keep], codes[keep], known[keep], positions[keep]
+                    )
+                if frame.empty:
+                    return 0
+
+            columns = list(self.rows.columns)
+            merged = {
+                col: np.insert(self.rows[col].to_numpy(), positions, frame[col].to_numpy(self.rows[col].dtype))
+                for col in columns
+            }
+            rows = pd.DataFrame(merged)
+
+            # Ids e contagens na nova ordem
+            added_ids = np.unique(ids[~known])
+            video_ids = np.insert(self.video_ids, np.searchsorted(self.video_ids, added_ids), added_ids)
+            counts = np.zeros(len(video_ids), dtype="int64")
+            old_positions = np.searchsorted(video_ids, self.video_ids)
+            counts[old_positions] = np.diff(self.offsets)
+            new_codes = np.searchsorted(video_ids, ids)
+            np.add.at(counts, new_codes, 1)
+            offsets = np.concatenate([[0], np.cumsum(counts)]).astype("int64")
+
+            # Features recalculadas só para os vídeos tocados
+            touched = np.unique(new_codes)
+            lengths = counts[touched]
+            starts = offsets[touched]
+            idx = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths) + np.arange(lengths.sum())
+            touched_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype("int64")
+            static = frame.groupby("video_id", sort=True).tail(1).set_index("video_id").reindex(video_ids[touched])
+            fresh = self._with_static(
+                trajectory_features(rows.iloc[idx].reset_index(drop=True), touched_offsets),
+                static.reset_index(drop=True), video_ids[touched],
+            )
+            features = pd.concat([self.features.drop(index=video_ids[touched], errors="ignore"), fresh])
+            self.features = features.loc[video_ids]
+            self.video_ids, self.offsets, self.rows = video_ids, offsets, rows
+            record.update(videos=len(touched), new_videos=len(added_ids))
+        return len(frame)
+
+    def trajectory(self, video_id):
+        """Série diária de um vídeo (linhas do índice entre seus offsets)."""
+        i = np.searchsorted(self.video_ids, video_id)
+        if i >= len(self.video_ids) or self.video_ids[i] != video_id:
+            return self.rows.iloc[:0]
+        return self.rows.iloc[self.offsets[i]:self.offsets[i + 1]]
+
+    def top(self, column="pico_views", n=10):
+        return self.features.nlargest(n, column)
+
+
+def _signature(file_path):
+    stat = os.stat(file_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class TrajectoryStore:
+    """Índice gravado por arquivo de origem em <dir>/<digest do caminho>/ (Feather + meta.json)."""
+
+    def __init__(self, root=TRAJECTORY_CACHE_DIR):
+        self.root = root
+
+    def _dir(self, file_path):
+        return os.path.join(self.root, hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16])
+
+    def load(self, file_path):
+        entry = self._dir(file_path)
+        meta_path = os.path.join(entry, "meta.json")
+        if not os.path.exists(meta_path):
+            return None, None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != TRAJECTORY_VERSION:
+            return None, None
+        rows = pd.read_feather(os.path.join(entry, "rows.feather"))
+        features = pd.read_feather(os.path.join(entry, "features.feather")).set_index("video_id")
+        offsets = np.concatenate([[0], np.cumsum(features["dias_em_alta"].to_numpy())]).astype("int64")
+        return TrajectoryIndex(features.index.to_numpy(object), offsets, rows, features), meta
+
+    def save(self, file_path, index, source_rows):
+        entry = self._dir(file_path)
+        # Grava num diretório temporário e renomeia: leitores nunca veem entrada parcial
+        tmp = f"{entry}.tmp-{os.getpid()}"
+        os.makedirs(tmp, exist_ok=True)
+        index.rows.to_feather(os.path.join(tmp, "rows.feather"))
+        index.features.reset_index().to_feather(os.path.join(tmp, "features.feather"))
+        meta = {
+            "version": TRAJECTORY_VERSION,
+            "source": os.path.abspath(file_path),
+            "last_date": str(index.last_date),
+            "source_rows": int(source_rows),
+            "signature": _signature(file_path),
+        }
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        if os.path.exists(entry):
+            os.replace(entry, f"{tmp}.old")
+        os.replace(tmp, entry)
+        if os.path.exists(f"{tmp}.old"):
+            import shutil
+            shutil.rmtree(f"{tmp}.old", ignore_errors=True)
+
+
+def _read_chunks(file_path, chunksize=TRAJECTORY_CHUNK_ROWS):
+    # Só as colunas do índice, normalizadas chunk a chunk (memória limitada pelo chunk)
+    needed = {"video_id", *ROW_COLUMNS, *STATIC_COLUMNS}
+    for chunk in pd.read_csv(file_path, chunksize=chunksize, usecols=lambda c: c.lower() in needed):
+        yield normalize_frame(chunk).dropna(subset=["video_id", "trending_date"])
+
+
+def _build_from_chunks(chunks):
+    # Um único build sobre os chunks concatenados (só as colunas do índice):
+    # update por chunk reinseriria todas as linhas anteriores a cada vez
+    frames = list(chunks)
+    if not frames:
+        return None, 0
+    frame = pd.concat(frames, ignore_index=True)
+    return TrajectoryIndex.build(frame), len(frame)
+
+
+def trajectory_index_for(file_path, df=None, store=None, chunksize=TRAJECTORY_CHUNK_ROWS):
+    """
+    Índice do arquivo, atualizado de forma incremental: só as linhas com
+    trending_date posterior ao último dia indexado entram. Se as linhas
+    antigas mudaram (arquivo reescrito), reconstrói. Sem `df`, lê o CSV em
+    chunks; com o arquivo igual ao da gravação, devolve o índice sem lê-lo.
+    """
+    store = store or TrajectoryStore()
+    index, meta = store.load(file_path)
+    if df is None and index is not None and meta.get("signature") == _signature(file_path):
+        return index
+
+    def chunks():
+        if df is None:
+            return _read_chunks(file_path, chunksize)
+        return [df.dropna(subset=["video_id", "trending_date"])]
+
+    if index is not None and index.last_date is not None:
+        last, old_rows, rows, new_rows = index.last_date, 0, 0, []
+        for chunk in chunks():
+            old = chunk["trending_date"] <= last
+            old_rows += int(old.sum())
+            rows += len(chunk)
+            new_rows.append(chunk[~old])
+        if old_rows == meta["source_rows"]:
+            # Dias novos entram de uma vez num único update
+            added = index.update(pd.concat(new_rows, ignore_index=True)) if new_rows else 0
+            if added:
+                logger.info(f"Índice de trajetórias: {added} linhas novas em {file_path}")
+            store.save(file_path, index, rows)
+            return index
+        logger.info(f"Índice de trajetórias: linhas antigas mudaram em {file_path}; reconstruindo")
+    index, rows = _build_from_chunks(chunks())
+    if index is None:
+        return None
+    store.save(file_path, index, rows)
+    return index
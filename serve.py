@@ -0,0 +1,31 @@
+import argparse
+
+from adapters.model_registry import ModelRegistry
+from adapters.prediction_service import serve
+from config.logger import logger
+from config.settings import SERVING_MAX_BATCH, SERVING_MAX_WAIT_MS
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP de previsão (sem Streamlit)")
+    parser.add_argument("--model", help="Chave do modelo no registro (padrão: o mais recente)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=SERVING_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=SERVING_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    key = args.model
+    if key is None:
+        entries = registry.entries()
+        if not entries:
+            parser.error("Nenhum modelo no registro; treine um modelo antes.")
+        key = entries[0]["key"]
+
+    logger.info("Iniciando serviço de previsão...")
+    server = serve(registry, key, args.host, args.port, args.max_batch, args.max_wait_ms)
+    print(f"Servindo modelo {key} em http://{args.host}:{args.port} (POST /predict, GET /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
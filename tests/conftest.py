@@ -0,0 +1,28 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Antes de qualquer import de config.logger: os testes não escrevem em logs/app.log
+os.environ.setdefault("SIAMD_LOG_DIR", tempfile.mkdtemp(prefix="siamd-test-logs-"))
+
+from benchmarks.synthetic_data import category_ids, generate_chunk  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # Caches relativos (data/.cache, jobs, models) ficam no diretório temporário
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def synthetic_csv(workdir):
+    """CAvideos.csv sintético pequeno (mesmas colunas dos dumps do Kaggle)."""
+    path = workdir / "CAvideos.csv"
+    categories = category_ids("CA", os.path.join(ROOT, "data"))
+    generate_chunk(0, 5000, seed=3, categories=categories).to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,46 @@
+import sys
+import types
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from adapters.batch_scoring import score_csv
+from adapters.model_registry import ModelRegistry
+from processing.data_analysis import load_data
+
+FEATURES = ["category_id", "views", "likes", "dislikes", "comments_disabled"]
+
+
+class FakeAdapter:
+    # Mesmo contrato do PyCaretAdapter: entrada + prediction_label
+    def save_model(self, model, task_type, path):
+        joblib.dump(model, f"{path}.pkl")
+
+    def load_model(self, task_type, path):
+        return joblib.load(f"{path}.pkl")
+
+    def predict(self, model, df, task_type):
+        result = df.copy()
+        result["prediction_label"] = model.predict(df)
+        return result
+
+
+def test_chunked_scoring_matches_single_shot(synthetic_csv, workdir, monkeypatch):
+    monkeypatch.setitem(sys.modules, "adapters.pycaret_adapter", types.SimpleNamespace(PyCaretAdapter=FakeAdapter))
+    df = load_data(synthetic_csv, max_rows=None, use_cache=False)
+    model = LinearRegression().fit(df[FEATURES], df["comment_count"])
+    registry = ModelRegistry(str(workdir / "models"))
+    registry.save("m1", model, "regression", "comment_count", FEATURES, {}, saver=FakeAdapter())
+
+    output_path = str(workdir / "predictions.parquet")
+    summary = score_csv(synthetic_csv, registry, "m1", output_path, chunksize=700, max_workers=1)
+    chunked = pd.read_parquet(output_path)
+    expected = FakeAdapter().predict(model, df[FEATURES], "regression")
+
+    assert summary["rows"] == len(df) == len(chunked)
+    assert chunked["video_id"].tolist() == df["video_id"].tolist()
+    np.testing.assert_allclose(chunked["prediction_label"], expected["prediction_label"])
+    for col in FEATURES:
+        np.testing.assert_array_equal(chunked[col].to_numpy(), expected[col].to_numpy())
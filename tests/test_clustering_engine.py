@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters import clustering_engine
+from adapters.clustering_engine import KSweepCache, elbow_k, train_clustering
+
+
+def _blobs(n_per_cluster=100):
+    rng = np.random.default_rng(0)
+    centers = [(0, 0), (20, 0), (0, 20), (20, 20)]
+    points = np.vstack([rng.normal(c, 1.0, size=(n_per_cluster, 2)) for c in centers])
+    return pd.DataFrame(points, columns=["views", "likes"])
+
+
+def test_second_run_reads_sweep_from_cache(workdir, monkeypatch):
+    calls = []
+    fit_k = clustering_engine._fit_k
+
+    def counting_fit_k(X, k):
+        calls.append(k)
+        return fit_k(X, k)
+
+    monkeypatch.setattr(clustering_engine, "_fit_k", counting_fit_k)
+    df = _blobs()
+    cache = KSweepCache(str(workdir / "clusters"))
+
+    _, first = train_clustering(df, max_workers=1, cache=cache)
+    assert sorted(calls) == list(clustering_engine.K_RANGE)
+
+    calls.clear()
+    pipeline, second = train_clustering(df, max_workers=1, cache=cache)
+    # Só o reajuste do k escolhido; as métricas do sweep vêm do cache
+    assert calls == [pipeline.named_steps["model"].n_clusters]
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_best_k_and_elbow_are_chosen_from_sweep(workdir):
+    pipeline, sweep = train_clustering(_blobs(), max_workers=1, cache=KSweepCache(str(workdir / "clusters")))
+    best = int(sweep.loc[sweep["silhouette"].idxmax(), "k"])
+    assert best == 4
+    assert pipeline.named_steps["model"].n_clusters == best
+    assert pipeline.elbow_k_ == elbow_k(sweep) == 4
+    assert pipeline.k_sweep_ is sweep
+
+
+def test_too_few_rows_for_any_k(workdir):
+    with pytest.raises(ValueError, match="pelo menos 3 linhas"):
+        train_clustering(_blobs().head(2), max_workers=1, cache=KSweepCache(str(workdir / "clusters")))
+
+
+def test_k_range_clamped_to_row_count(workdir):
+    df = _blobs().iloc[[0, 1, 100, 101, 200]]
+    _, sweep = train_clustering(df, max_workers=1, cache=KSweepCache(str(workdir / "clusters")))
+    assert sweep["k"].tolist() == [2, 3, 4]
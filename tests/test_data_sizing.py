@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from processing.data_sizing import learning_curve_size, stratified_sample
+
+
+def _labeled(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    return pd.DataFrame({
+        "x": x,
+        "ruido": rng.normal(size=n),
+        "label": np.where(x > 0, "alto", "baixo"),
+        "classe": rng.choice(["a", "b", "c"], size=n, p=[0.7, 0.25, 0.05]),
+    })
+
+
+def test_stratified_sample_preserves_class_proportions():
+    df = _labeled()
+    sample = stratified_sample(df, "classe", 2000, "classification")
+    assert abs(len(sample) - 2000) <= 3
+    expected = df["classe"].value_counts(normalize=True)
+    observed = sample["classe"].value_counts(normalize=True)
+    np.testing.assert_allclose(observed[expected.index], expected, atol=1e-3)
+
+
+def test_stratified_sample_regression_keeps_every_decile():
+    df = _labeled()
+    sample = stratified_sample(df, "x", 1000, "regression")
+    deciles = pd.qcut(df["x"], 10, labels=False)
+    counts = deciles.loc[sample.index].value_counts()
+    assert len(counts) == 10 and counts.min() == counts.max() == 100
+
+
+def test_learning_curve_stops_when_gain_below_threshold():
+    # Alvo trivial: o score satura na primeira amostra, a primeira dobra não ganha nada
+    df = _labeled()[["x", "ruido", "label"]]
+    chosen, curve = learning_curve_size(df, "label", "classification", min_rows=1000)
+    assert len(curve) == 2
+    assert curve["ganho"].iloc[-1] < 0.005
+    assert chosen == curve["linhas"].iloc[0] == 1000
+
+
+def test_learning_curve_uses_all_rows_without_plateau():
+    df = _labeled(n=4000)[["x", "ruido", "label"]]
+    chosen, curve = learning_curve_size(df, "label", "classification", min_rows=1000, plateau_gain=-np.inf)
+    assert curve["linhas"].tolist() == [1000, 2000, 4000]
+    assert chosen == 4000
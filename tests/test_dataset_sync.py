@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from adapters.local_dataset import LocalDirectoryDataset
+from data.dataset_sync import DatasetSync, sha256_file
+
+DATASET = "owner/videos"
+
+
+@pytest.fixture
+def remote(tmp_path):
+    root = tmp_path / "remote"
+    source = root / "owner" / "videos"
+    source.mkdir(parents=True)
+    (source / "CAvideos.csv").write_text("video_id,views\na,1\nb,2\n", encoding="utf-8")
+    (source / "CA_category_id.json").write_text('{"items": []}', encoding="utf-8")
+    return root
+
+
+def _sync(remote, tmp_path, compress=False, on_extracted=None):
+    port = LocalDirectoryDataset(str(remote), compress=compress)
+    sync = DatasetSync(
+        port, str(tmp_path / "dados"), manifest_dir=str(tmp_path / "manifestos"), on_extracted=on_extracted
+    )
+    return port, sync
+
+
+def test_unchanged_files_are_skipped(remote, tmp_path):
+    port, sync = _sync(remote, tmp_path)
+    first = sync.sync(DATASET)
+    assert sorted(first["downloaded"]) == ["CA_category_id.json", "CAvideos.csv"]
+    port.downloads.clear()
+    second = sync.sync(DATASET)
+    assert second["downloaded"] == [] and port.downloads == []
+    assert sorted(second["unchanged"]) == ["CA_category_id.json", "CAvideos.csv"]
+    # mtime local tocado sem mudar o conteúdo: confere o sha256 e não baixa
+    os.utime(tmp_path / "dados" / "CAvideos.csv")
+    assert sync.sync(DATASET)["downloaded"] == []
+
+
+def test_remote_change_is_downloaded_again(remote, tmp_path):
+    port, sync = _sync(remote, tmp_path)
+    sync.sync(DATASET)
+    port.downloads.clear()
+    with open(remote / "owner" / "videos" / "CAvideos.csv", "a", encoding="utf-8") as f:
+        f.write("c,3\n")
+    summary = sync.sync(DATASET)
+    assert summary["downloaded"] == ["CAvideos.csv"] and port.downloads == ["CAvideos.csv"]
+    assert (tmp_path / "dados" / "CAvideos.csv").read_text(encoding="utf-8").endswith("c,3\n")
+
+
+def test_corrupted_local_copy_is_fetched_again(remote, tmp_path):
+    port, sync = _sync(remote, tmp_path)
+    sync.sync(DATASET)
+    local = tmp_path / "dados" / "CAvideos.csv"
+    expected = sha256_file(str(local))
+    # Mesmo tamanho, conteúdo diferente: só o sha256 pega
+    local.write_text("video_id,views\na,9\nb,2\n", encoding="utf-8")
+    port.downloads.clear()
+    summary = sync.sync(DATASET)
+    assert summary["downloaded"] == ["CAvideos.csv"]
+    assert sha256_file(str(local)) == expected
+
+
+def test_compressed_files_are_extracted(remote, tmp_path):
+    installed = []
+    port, sync = _sync(remote, tmp_path, compress=True, on_extracted=installed.append)
+    summary = sync.sync(DATASET)
+    data_dir = tmp_path / "dados"
+    assert sorted(summary["downloaded"]) == ["CA_category_id.json", "CAvideos.csv"]
+    assert sorted(p.name for p in data_dir.iterdir() if not p.name.startswith(".")) == \
+        ["CA_category_id.json", "CAvideos.csv"]
+    assert (data_dir / "CAvideos.csv").read_text(encoding="utf-8") == \
+        (remote / "owner" / "videos" / "CAvideos.csv").read_text(encoding="utf-8")
+    assert sorted(os.path.basename(p) for p in installed) == ["CA_category_id.json", "CAvideos.csv"]
+    manifest = sync.load_manifest(DATASET)
+    local = manifest["files"]["CAvideos.csv"]["local"]["CAvideos.csv"]
+    assert local["sha256"] == sha256_file(str(data_dir / "CAvideos.csv"))
+    port.downloads.clear()
+    assert sync.sync(DATASET)["downloaded"] == [] and port.downloads == []
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from processing import eda_cache
+from processing.eda_cache import dataframe_fingerprint, memoize_eda
+
+
+def _frame():
+    return pd.DataFrame({
+        "views": range(5000),
+        "title": pd.Categorical([f"video {i % 700}" for i in range(5000)]),
+    })
+
+
+def test_fingerprint_computed_once_per_object(monkeypatch):
+    calls = []
+    compute = eda_cache._compute_fingerprint
+    monkeypatch.setattr(eda_cache, "_compute_fingerprint", lambda df: calls.append(1) or compute(df))
+    df = _frame()
+    first = dataframe_fingerprint(df)
+    assert dataframe_fingerprint(df) == first
+    assert len(calls) == 1
+    # Coluna substituída: recalcula
+    df["views"] = df["views"] + 1
+    assert dataframe_fingerprint(df) != first
+    assert len(calls) == 2
+    # Mesmo conteúdo em outro objeto: mesmo fingerprint
+    assert dataframe_fingerprint(_frame()) == first
+
+
+def test_categorical_hashed_by_codes(monkeypatch):
+    hashed = []
+    real = pd.util.hash_pandas_object
+    monkeypatch.setattr(pd.util, "hash_pandas_object", lambda obj, **kw: hashed.append(obj) or real(obj, **kw))
+    dataframe_fingerprint(_frame())
+    assert not any(isinstance(obj[c].dtype, pd.CategoricalDtype) for obj in hashed for c in obj.columns)
+
+
+def test_memoize_eda_hits_on_same_frame():
+    calls = []
+
+    @memoize_eda
+    def total(df):
+        calls.append(1)
+        return df["views"].sum()
+
+    df = _frame()
+    assert total(df) == total(df) == df["views"].sum()
+    assert len(calls) == 1
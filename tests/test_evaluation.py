@@ -0,0 +1,42 @@
+import os
+import sys
+
+import joblib
+import numpy as np
+import pytest
+
+from adapters.model_registry import ModelRegistry
+from adapters.sparse_text_trainer import train_sparse_text_model
+from processing.data_analysis import load_data
+
+
+class FakeAdapter:
+    def save_model(self, model, task_type, path):
+        joblib.dump(model, f"{path}.pkl")
+
+
+@pytest.mark.parametrize("target, task_type, families", [
+    ("likes", "regression", {"residuals", "error"}),
+    ("category_id", "classification", {"confusion_matrix", "auc"}),
+])
+def test_artifacts_written_at_training_and_rendered_without_model(
+        synthetic_csv, workdir, monkeypatch, target, task_type, families):
+    df = load_data(synthetic_csv, max_rows=2000, use_cache=False)
+    df = df[["title", "tags", "views", "dislikes", "comment_count", target]]
+    model, board, artifacts = train_sparse_text_model(df, target, task_type, cv_folds=3, max_workers=1)
+    registry = ModelRegistry(str(workdir / "models"))
+    features = [c for c in df.columns if c != target]
+    registry.save("m1", model, task_type, target, features, {}, leaderboard=board, artifacts=artifacts,
+                  saver=FakeAdapter())
+    assert registry.has_artifacts("m1")
+    with np.load(os.path.join(registry.root, "m1", "eval.npz")) as saved:
+        assert set(saved.files) == set(artifacts)
+
+    # Sem o pipeline e sem o PyCaret: os gráficos saem só dos arrays
+    os.remove(registry.model_path("m1") + ".pkl")
+    monkeypatch.setitem(sys.modules, "adapters.pycaret_adapter", None)
+    figures = registry.figures("m1")
+    assert set(figures) == families
+    assert all(png.startswith(b"\x89PNG") for png in figures.values())
+    assert sorted(f for f in os.listdir(os.path.join(registry.root, "m1")) if f.endswith(".png")) == \
+        sorted(f"eval-{name}.png" for name in families)
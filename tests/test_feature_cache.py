@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from adapters.feature_cache import FeatureCache, feature_key
+
+
+def test_put_get_round_trip_returns_memmaps(workdir):
+    rng = np.random.default_rng(0)
+    X_train = pd.DataFrame(rng.normal(size=(200, 3)), columns=["views", "likes", "dislikes"])
+    X_test = pd.DataFrame(rng.normal(size=(50, 3)), columns=X_train.columns)
+    y_train, y_test = rng.integers(0, 2, 200), rng.integers(0, 2, 50)
+    pipeline = StandardScaler().fit(X_train)
+    cache = FeatureCache(str(workdir / "features"))
+    key = feature_key(X_train, "label", "classification", 0.8, True, 123)
+
+    assert cache.get(key) is None
+    cache.put(key, X_train, y_train, X_test, y_test, pipeline, ["lr", "rf"])
+    entry = cache.get(key)
+
+    expected = {"X_train": X_train, "y_train": y_train, "X_test": X_test, "y_test": y_test}
+    for name, values in expected.items():
+        assert isinstance(entry[name], np.memmap)
+        assert str(entry[name].filename).endswith(f"{name}.npy")
+        np.testing.assert_array_equal(entry[name], np.asarray(values))
+    np.testing.assert_array_equal(entry["pipeline"].mean_, pipeline.mean_)
+    assert entry["candidates"] == ["lr", "rf"]
+    assert entry["columns"] == ["views", "likes", "dislikes"]
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from data import kaggle_service
+from data.columnar_cache import read_cached_frame
+from processing.data_analysis import NORMALIZATION_VERSION
+from processing.trajectory_index import TrajectoryStore
+
+
+def test_prepare_downloaded_file_stays_bounded(synthetic_csv, monkeypatch):
+    monkeypatch.setattr(kaggle_service, "PREWARM_ROWS", 1000)
+    calls = []
+    real_read_csv = pd.read_csv
+
+    def read_csv(*args, **kwargs):
+        calls.append(kwargs.get("nrows") or kwargs.get("chunksize"))
+        return real_read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", read_csv)
+    kaggle_service.prepare_downloaded_file(synthetic_csv)
+
+    # Nenhuma leitura do arquivo inteiro: cache com as primeiras linhas, índice em chunks
+    assert calls and all(calls)
+    assert len(read_cached_frame(synthetic_csv, NORMALIZATION_VERSION, max_rows=1000)) == 1000
+    index, meta = TrajectoryStore().load(synthetic_csv)
+    assert meta["source_rows"] == len(real_read_csv(synthetic_csv))
+    assert int(index.features["dias_em_alta"].sum()) == len(index.rows)
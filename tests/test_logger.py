@@ -0,0 +1,35 @@
+import logging
+import logging.handlers
+import multiprocessing
+import time
+import uuid
+
+from config import logger as log_config
+
+
+def _child(log_queue, marker):
+    from config.logger import attach_worker_queue, is_log_owner
+    root = logging.getLogger()
+    opened = any(isinstance(h, logging.handlers.RotatingFileHandler) for h in root.handlers)
+    attach_worker_queue(log_queue)
+    logging.getLogger("siamd.test").warning(f"{marker} owner={is_log_owner()} arquivo={opened}")
+
+
+def test_workers_log_through_owner_queue():
+    assert log_config.is_log_owner()
+    marker = uuid.uuid4().hex
+    process = multiprocessing.get_context("spawn").Process(
+        target=_child, args=(log_config.worker_log_queue(), marker)
+    )
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+    path = log_config._file_handler.baseFilename
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = [line for line in f if marker in line]
+        if lines:
+            break
+        time.sleep(0.1)
+    assert lines and "owner=False arquivo=False" in lines[0]
@@ -0,0 +1,78 @@
+import sys
+import types
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from adapters import model_registry
+from adapters.model_registry import ModelRegistry
+from processing.evaluation import regression_artifacts
+
+
+class FakeAdapter:
+    loads = 0
+
+    def save_model(self, model, task_type, path):
+        joblib.dump(model, f"{path}.pkl")
+
+    def load_model(self, task_type, path):
+        FakeAdapter.loads += 1
+        return joblib.load(f"{path}.pkl")
+
+
+@pytest.fixture
+def registry(workdir, monkeypatch):
+    monkeypatch.setitem(sys.modules, "adapters.pycaret_adapter", types.SimpleNamespace(PyCaretAdapter=FakeAdapter))
+    monkeypatch.setattr(model_registry, "_loaded_models", OrderedDict())
+    FakeAdapter.loads = 0
+    return ModelRegistry(str(workdir / "models"), cache_size=2)
+
+
+def _train(registry, slope):
+    df = pd.DataFrame({"views": np.arange(50.0), "likes": slope * np.arange(50.0)})
+    model = LinearRegression().fit(df[["views"]], df["likes"])
+    params = {"cv_folds": 5}
+    key = registry.make_key(df, "likes", "regression", params)
+    artifacts = regression_artifacts(df["likes"], model.predict(df[["views"]]))
+    registry.save(key, model, "regression", "likes", ["views"], params, artifacts=artifacts, saver=FakeAdapter())
+    return key, model
+
+
+def test_save_and_load(registry):
+    key, model = _train(registry, 2)
+    assert registry.exists(key)
+    loaded, meta = registry.load(key)
+    assert meta["target"] == "likes" and meta["model_name"] == "LinearRegression"
+    np.testing.assert_allclose(loaded.coef_, model.coef_)
+    assert [m["key"] for m in registry.entries()] == [key]
+    # Segunda leitura vem do LRU em memória
+    assert registry.load(key)[0] is loaded
+    assert FakeAdapter.loads == 1
+
+
+def test_lru_evicts_oldest_at_capacity(registry):
+    keys = [_train(registry, slope)[0] for slope in (1, 2, 3)]
+    for key in keys:
+        registry.load(key)
+    assert list(model_registry._loaded_models) == keys[1:]
+    registry.load(keys[0])  # despejado: desserializa de novo
+    assert FakeAdapter.loads == 4
+    assert list(model_registry._loaded_models) == [keys[2], keys[0]]
+
+
+def test_figures_rendered_once_and_cached(registry, monkeypatch):
+    key, _ = _train(registry, 2)
+    assert registry.has_artifacts(key)
+    figures = registry.figures(key)
+    assert set(figures) == {"residuals", "error"}
+    assert all(png.startswith(b"\x89PNG") for png in figures.values())
+
+    def fail(*args):
+        raise AssertionError("figuras deveriam vir do disco")
+
+    monkeypatch.setattr("processing.evaluation.evaluation_figures", fail)
+    assert registry.figures(key) == figures
@@ -0,0 +1,30 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from processing.multi_country import load_countries
+from tests.conftest import ROOT
+
+
+@pytest.fixture
+def country_files(synthetic_csv, workdir):
+    # Mesmo CSV sintético e mesmas categorias (só o CA vem no repo) com o nome de outro país
+    os.makedirs(workdir / "data")
+    paths = []
+    for country in ("CA", "US"):
+        categories = os.path.join(ROOT, "data", "CA_category_id.json")
+        shutil.copy(categories, workdir / "data" / f"{country}_category_id.json")
+        path = workdir / f"{country}videos.csv"
+        if not path.exists():
+            shutil.copy(synthetic_csv, path)
+        paths.append(str(path))
+    return paths
+
+
+def test_parallel_load_matches_sequential(country_files):
+    parallel = load_countries(country_files, max_rows=2000, max_workers=2)
+    sequential = load_countries(country_files, max_rows=2000, max_workers=1)
+    pd.testing.assert_frame_equal(parallel, sequential)
+    assert parallel["country"].value_counts().to_dict() == {"CA": 2000, "US": 2000}
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from adapters.prediction_service import MicroBatcher
+
+
+def _submit_concurrently(batcher, records):
+    futures = [None] * len(records)
+    barrier = threading.Barrier(len(records))
+
+    def client(i):
+        barrier.wait()
+        futures[i] = batcher.submit(records[i])
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(len(records))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return futures
+
+
+def test_concurrent_requests_share_one_batch():
+    batches = []
+
+    def predict(df):
+        batches.append(len(df))
+        return [{"prediction_label": views * 10} for views in df["views"]]
+
+    batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=2000)
+    futures = _submit_concurrently(batcher, [{"views": i} for i in range(8)])
+    # Cada requisição recebe a linha do seu próprio registro
+    assert [f.result(timeout=5) for f in futures] == [{"prediction_label": i * 10} for i in range(8)]
+    assert batches == [8]
+    assert batcher.metrics.batches == 1 and batcher.metrics.batch_rows == 8
+
+
+def test_failing_batch_errors_every_waiter():
+    def predict(df):
+        raise RuntimeError("pipeline quebrado")
+
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=2000)
+    futures = _submit_concurrently(batcher, [{"views": i} for i in range(4)])
+    for future in futures:
+        with pytest.raises(RuntimeError, match="pipeline quebrado"):
+            future.result(timeout=5)
+
+
+def test_short_prediction_does_not_leave_waiters_hanging():
+    batcher = MicroBatcher(lambda df: [], max_batch_size=2, max_wait_ms=2000)
+    futures = _submit_concurrently(batcher, [{"views": 1}, {"views": 2}])
+    for future in futures:
+        with pytest.raises(ValueError, match="0 linhas"):
+            future.result(timeout=5)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+
+from processing.regression import OLSAccumulator, likes_views_arrays
+
+
+def _ols(x, y):
+    fit = sm.OLS(y, sm.add_constant(x)).fit()
+    return fit.params[0], fit.params[1], fit.rsquared
+
+
+def test_merged_chunks_match_statsmodels():
+    rng = np.random.default_rng(0)
+    # Views na casa de 1e8: é onde Σx² ingênuo perde precisão
+    views = rng.lognormal(mean=16, sigma=1.5, size=50000)
+    likes = 0.03 * views + rng.normal(0, 5e4, size=views.size)
+    x, y = likes_views_arrays(views, likes)
+
+    # Duas partições (ex.: dois arquivos), cada uma em chunks de tamanhos diferentes
+    half = x.size // 2
+    left, right = OLSAccumulator(), OLSAccumulator()
+    for start in range(0, half, 7000):
+        left.update(x[start:min(start + 7000, half)], y[start:min(start + 7000, half)])
+    for start in range(half, x.size, 3333):
+        right.update(x[start:start + 3333], y[start:start + 3333])
+    merged = left.merge(right)
+
+    assert merged.n == x.size
+    np.testing.assert_allclose(merged.params(), _ols(x, y), rtol=1e-9)
+
+
+def test_synthetic_csv_matches_statsmodels(synthetic_csv):
+    acc = OLSAccumulator()
+    frames = []
+    for chunk in pd.read_csv(synthetic_csv, usecols=["views", "likes"], chunksize=700):
+        acc.update(*likes_views_arrays(chunk["views"], chunk["likes"]))
+        frames.append(chunk)
+    df = pd.concat(frames)
+    np.testing.assert_allclose(acc.params(), _ols(*likes_views_arrays(df["views"], df["likes"])), rtol=1e-9)
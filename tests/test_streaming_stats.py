@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from processing.data_analysis import normalize_frame
+from processing.regression import OLSAccumulator, likes_views_arrays, like_rate_arrays
+from processing.streaming_stats import HIST_EDGES, stream_aggregates
+
+
+def test_streaming_matches_full_frame(synthetic_csv):
+    df = normalize_frame(pd.read_csv(synthetic_csv))
+    stats = stream_aggregates(synthetic_csv, chunksize=700, top_n=5)
+
+    assert stats.rows == len(df)
+    pd.testing.assert_series_equal(
+        stats.null_counts.astype("int64").sort_index(), df.isnull().sum().sort_index(), check_names=False
+    )
+
+    views, likes = likes_views_arrays(df["views"], df["likes"])
+    expected = OLSAccumulator().update(views, likes)
+    assert stats.likes_views.n == expected.n
+    np.testing.assert_allclose(stats.likes_views.params(), expected.params(), rtol=1e-9)
+    expected_rate = OLSAccumulator().update(*like_rate_arrays(views, likes))
+    np.testing.assert_allclose(stats.like_rate_views.params(), expected_rate.params(), rtol=1e-9)
+
+    counts, _ = np.histogram(np.clip(df["views"].to_numpy("float64"), 0, HIST_EDGES[-1]), bins=HIST_EDGES)
+    np.testing.assert_array_equal(stats.histograms["views"], counts)
+
+    means = df.groupby("category_id")["views"].mean().sort_values(ascending=False)
+    np.testing.assert_allclose(stats.category_means().to_numpy(), means.to_numpy())
+
+    # Top-N: cada vídeo uma vez, no seu pico de views
+    peaks = df.loc[df.groupby("video_id")["views"].idxmax()].nlargest(5, "views")
+    assert stats.top_videos["video_id"].tolist() == peaks["video_id"].tolist()
+    assert stats.top_videos["views"].tolist() == peaks["views"].tolist()
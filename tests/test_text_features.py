@@ -0,0 +1,23 @@
+import pandas as pd
+
+from adapters.sparse_text_trainer import predict_frame, train_sparse_text_model
+from processing.data_analysis import load_data
+from processing.text_features import TEXT_COLUMNS, hash_text
+
+
+def test_hash_text_on_loaded_categoricals(synthetic_csv):
+    # load_data → optimize_dtypes deixa title/tags/description como category, com NaN
+    df = load_data(synthetic_csv, max_rows=None)
+    assert any(isinstance(df[c].dtype, pd.CategoricalDtype) for c in TEXT_COLUMNS)
+    assert df["description"].isna().any()
+    matrix = hash_text(df, TEXT_COLUMNS, n_features=2 ** 10, chunk_rows=1000, n_jobs=1)
+    assert matrix.shape == (len(df), 3 * 2 ** 10)
+    assert matrix.nnz > 0
+
+
+def test_train_sparse_text_model_on_loaded_data(synthetic_csv):
+    df = load_data(synthetic_csv, max_rows=None)
+    frame = df[TEXT_COLUMNS + ["category_id", "likes", "views"]]
+    model, board, _ = train_sparse_text_model(frame, "views", "regression", cv_folds=2, max_workers=1)
+    assert (board["Status"] == "ativo").any()
+    assert len(predict_frame(model, frame.head(20))) == 20
@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import sys
+import types
+
+import joblib
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from adapters.model_registry import ModelRegistry
+from adapters.training_jobs import JobDispatcher, TrainingJobQueue, _run_job
+from ports.training_job_port import TrainingJobPort
+
+
+class FakeAdapter:
+    leaderboard = None
+    eval_artifacts = None
+
+    def train_model(self, df, target, task_type, on_update=None, **params):
+        if target not in df.columns:
+            raise KeyError(target)
+        return LinearRegression().fit(df.drop(columns=[target]), df[target])
+
+    def save_model(self, model, task_type, path):
+        joblib.dump(model, f"{path}.pkl")
+
+
+def _queued_job(workdir, target):
+    queue = TrainingJobQueue(jobs_dir=str(workdir / "jobs"), registry=ModelRegistry(str(workdir / "models")))
+    df = pd.DataFrame({"views": range(50), "likes": [2 * v for v in range(50)]})
+    job_id = "job1"
+    job_dir = workdir / "jobs" / job_id
+    os.makedirs(job_dir)
+    df.to_parquet(job_dir / "input.parquet", index=False)
+    key = queue.registry.make_key(df, target, "regression", {})
+    queue.store.create(job_id, "regression", target, ["views"], {}, queue.registry.model_path(key), key,
+                       queue.registry.root)
+    return queue, job_id, job_dir / "input.parquet"
+
+
+def test_job_queue_implements_job_port():
+    assert issubclass(TrainingJobQueue, TrainingJobPort)
+
+
+def test_input_removed_after_success(workdir, monkeypatch):
+    monkeypatch.setitem(sys.modules, "adapters.pycaret_adapter", types.SimpleNamespace(PyCaretAdapter=FakeAdapter))
+    queue, job_id, input_path = _queued_job(workdir, "likes")
+    _run_job(queue.db_path, job_id, queue.registry.root)
+    job = queue.get_job(job_id)
+    assert job["status"] == "done"
+    assert queue.registry.exists(job["registry_key"])
+    assert not input_path.exists()
+
+
+def test_input_removed_after_failure(workdir, monkeypatch):
+    monkeypatch.setitem(sys.modules, "adapters.pycaret_adapter", types.SimpleNamespace(PyCaretAdapter=FakeAdapter))
+    queue, job_id, input_path = _queued_job(workdir, "inexistente")
+    _run_job(queue.db_path, job_id, queue.registry.root)
+    assert queue.get_job(job_id)["status"] == "failed"
+    assert not input_path.exists()
+
+
+def test_recover_keeps_job_claimed_by_live_dispatcher(workdir):
+    queue, job_id, input_path = _queued_job(workdir, "likes")
+    assert queue.store.claim(job_id, os.getpid())
+    JobDispatcher(queue.db_path, max_concurrent=1)  # segundo despachante: só roda o _recover
+    assert queue.get_job(job_id)["status"] == "starting"
+    assert input_path.exists()
+
+
+def test_recover_fails_job_of_dead_dispatcher(workdir):
+    queue, job_id, input_path = _queued_job(workdir, "likes")
+    dead = multiprocessing.get_context("spawn").Process(target=os.getpid)
+    dead.start()
+    dead.join()
+    assert queue.store.claim(job_id, dead.pid)
+    JobDispatcher(queue.db_path, max_concurrent=1)
+    assert queue.get_job(job_id)["status"] == "failed"
+    assert not input_path.exists()
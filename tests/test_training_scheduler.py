@@ -0,0 +1,49 @@
+import time
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import KFold
+
+from adapters.training_scheduler import ModelScheduler
+
+
+class SlowRegressor(BaseEstimator, RegressorMixin):
+    def __init__(self, seconds=30):
+        self.seconds = seconds
+
+    def fit(self, X, y):
+        time.sleep(self.seconds)
+        return self
+
+    def predict(self, X):
+        return np.zeros(len(X))
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    return X, X @ [1.0, 2.0, 3.0] + rng.normal(size=200)
+
+
+def test_run_does_not_mutate_candidates():
+    X, y = _data()
+    rf = RandomForestRegressor(n_estimators=5, n_jobs=-1, random_state=0)
+    candidates = {"rf": ("Random Forest", rf), "lr": ("Linear", LinearRegression())}
+    splits = list(KFold(2, shuffle=True, random_state=0).split(X))
+    board, best = ModelScheduler(max_workers=1).run(candidates, X, y, splits, "regression")
+    assert rf.n_jobs == -1
+    assert best in candidates
+    assert (board["Folds"] > 0).all()
+
+
+def test_time_budget_stops_running_fits():
+    X, y = _data()
+    candidates = {"lr": ("Linear", LinearRegression()), "slow": ("Lento", SlowRegressor())}
+    splits = list(KFold(2, shuffle=True, random_state=0).split(X))
+    started = time.monotonic()
+    board, best = ModelScheduler(max_workers=2, time_budget=8).run(candidates, X, y, splits, "regression")
+    assert time.monotonic() - started < 25
+    assert best == "lr"
+    assert board.set_index("ID").loc["slow", "Folds"] == 0
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from processing.data_analysis import normalize_frame
+from processing.trajectory_index import TrajectoryIndex, TrajectoryStore, trajectory_index_for
+
+
+def assert_same_index(actual, expected):
+    np.testing.assert_array_equal(actual.video_ids, expected.video_ids)
+    np.testing.assert_array_equal(actual.offsets, expected.offsets)
+    pd.testing.assert_frame_equal(actual.rows.reset_index(drop=True), expected.rows.reset_index(drop=True))
+    pd.testing.assert_frame_equal(actual.features, expected.features, check_dtype=False, check_categorical=False)
+
+
+@pytest.fixture
+def frame(synthetic_csv):
+    return normalize_frame(pd.read_csv(synthetic_csv))
+
+
+def test_daily_updates_match_full_build(frame):
+    full = TrajectoryIndex.build(frame)
+    dates = np.sort(frame["trending_date"].unique())
+    index = TrajectoryIndex.build(frame[frame["trending_date"] <= dates[5]])
+    for day in dates[6:]:
+        index.update(frame[frame["trending_date"] == day])
+    assert_same_index(index, full)
+    # Dia já indexado: nada entra
+    assert index.update(frame[frame["trending_date"] == dates[-1]]) == 0
+    assert_same_index(index, full)
+
+
+def test_trajectory_and_features(frame):
+    index = TrajectoryIndex.build(frame)
+    video_id = index.video_ids[0]
+    rows = frame[frame["video_id"] == video_id].sort_values("trending_date")
+    series = index.trajectory(video_id)
+    assert series["views"].tolist() == rows["views"].astype(float).tolist()
+    features = index.features.loc[video_id]
+    assert features["dias_em_alta"] == len(rows)
+    assert features["pico_views"] == rows["views"].max()
+    assert index.trajectory("inexistente").empty
+
+
+def test_store_appends_only_new_days(synthetic_csv, frame, workdir):
+    store = TrajectoryStore(str(workdir / "trajetorias"))
+    raw = pd.read_csv(synthetic_csv)
+    dates = np.sort(frame["trending_date"].unique())
+    first = (frame["trending_date"] <= dates[10]).to_numpy()
+    raw[first].to_csv(synthetic_csv, index=False)
+    trajectory_index_for(synthetic_csv, store=store, chunksize=500)
+
+    # O arquivo do dia seguinte chega: mesmas linhas antigas + dias novos
+    raw.to_csv(synthetic_csv, index=False)
+    index = trajectory_index_for(synthetic_csv, store=store, chunksize=500)
+    assert_same_index(index, TrajectoryIndex.build(frame))
+    _, meta = store.load(synthetic_csv)
+    assert meta["source_rows"] == len(frame)
+
+    # Arquivo sem mudança: devolve o índice gravado
+    assert_same_index(trajectory_index_for(synthetic_csv, store=store), index)
+
+    # Linhas antigas reescritas: reconstrói do zero
+    rewritten = raw.iloc[100:]
+    rewritten.to_csv(synthetic_csv, index=False)
+    index = trajectory_index_for(synthetic_csv, store=store, chunksize=500)
+    assert_same_index(index, TrajectoryIndex.build(normalize_frame(rewritten.copy())))
+
+
+def test_rebuild_is_a_single_build(synthetic_csv, frame, workdir, monkeypatch):
+    builds = []
+    build = TrajectoryIndex.build.__func__
+    monkeypatch.setattr(TrajectoryIndex, "build", classmethod(lambda cls, df: builds.append(len(df)) or build(cls, df)))
+    monkeypatch.setattr(TrajectoryIndex, "update", lambda self, df: pytest.fail("update num rebuild"))
+    index = trajectory_index_for(synthetic_csv, store=TrajectoryStore(str(workdir / "t")), chunksize=500)
+    assert builds == [len(frame)]
+    assert int(index.features["dias_em_alta"].sum()) == len(frame)
@@ -1,22 +1,35 @@
+import io
 import os
 import pandas as pd
 import streamlit as st
 from processing.data_analysis import (
     load_data,
     calculate_null_zero_percentage,
-    plot_missing_values,
-    plot_numeric_distribution,
     plot_views_vs_likes,
     plot_views_by_category,
     show_top_videos,
+    show_streaming_summary,
+    show_trajectories,
     merge_categories,
+    load_category_mapping,
+    plot_cross_country,
     plot_regression_likes_views,
     plot_regression_like_rate_vs_views,
 )
+from processing.streaming_stats import stream_aggregates
+from processing.multi_country import load_countries
+from processing.trajectory_index import trajectory_index_for
+from processing.data_sizing import default_features
+from processing.text_features import TEXT_COLUMNS
 from data.kaggle_service import download_dataset
-from config.settings import load_kaggle_credentials
-from config.logger import logger
-from adapters.pycaret_adapter import PyCaretAdapter
+from config.settings import load_kaggle_credentials, PREDICTIONS_DIR
+from config.import_timing import timed_import, lazy_import_times, importtime_report
+from config.instrumentation import span_frame, span_summary, start_run
+from config.logger import logger, log_file, LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+from adapters.numpy_profiler import NumpyProfiler
+from adapters.training_jobs import TrainingJobQueue
+from adapters.model_registry import ModelRegistry
+from adapters.batch_scoring import score_csv
 
 # Página configurada
 st.set_page_config(
@@ -26,7 +39,100 @@ st.set_page_config(
 )
 
 
+def pycaret_adapter():
+    # PyCaret (e sklearn, lightgbm...) só é importado no primeiro treino/previsão
+    return timed_import("adapters.pycaret_adapter").PyCaretAdapter()
+
+
+def use_registered_model(registry, key):
+    # Seleciona um modelo do registro (sem setup ativo do PyCaret); só os
+    # metadados são lidos aqui, o pipeline carrega no primeiro uso
+    meta = registry.meta(key)
+    st.session_state.pop("trained_model", None)
+    st.session_state.task_type = meta["task_type"]
+    st.session_state.feature_cols = meta["features"]
+    st.session_state.model_key = key
+    st.session_state.model_in_session = False
+    return meta
+
+
+def session_model(registry):
+    if "trained_model" not in st.session_state:
+        st.session_state.trained_model, _ = registry.load(st.session_state.model_key)
+    return st.session_state.trained_model
+
+
+def startup_diagnostics():
+    with st.sidebar.expander("⏱️ Diagnóstico de inicialização"):
+        if lazy_import_times:
+            st.write("**Imports sob demanda (este processo):**")
+            st.dataframe(
+                pd.Series(lazy_import_times, name="segundos").round(2).rename_axis("módulo"),
+            )
+        target = st.selectbox("Módulo:", ["ui.web_interface", "adapters.pycaret_adapter"])
+        if st.button("Medir imports (-X importtime)"):
+            with st.spinner("Importando em um processo novo..."):
+                total_ms, report = importtime_report(target)
+            st.metric("Tempo total de import", f"{total_ms / 1000:.2f} s")
+            st.dataframe(report, hide_index=True)
+
+
+def performance_panel(run_id):
+    # Chamado no fim do script: mostra as etapas medidas nesta execução
+    with st.sidebar.expander("📈 Diagnóstico de desempenho"):
+        spans = span_frame(run=run_id)
+        if spans.empty:
+            st.caption("Nenhuma etapa medida nesta execução.")
+        else:
+            st.metric("Tempo nas etapas medidas", f"{spans.loc[spans['depth'] == 0, 'seconds'].sum():.2f} s")
+            spans = spans.dropna(axis=1, how="all").drop(columns=["run", "thread"], errors="ignore")
+            st.dataframe(spans.round(3), hide_index=True)
+            st.caption(
+                "peak_mb: pico de memória da etapa (tracemalloc). process_rss_hwm_mb: maior RSS do "
+                "processo desde o início, não o consumo da etapa."
+            )
+        summary = span_summary()
+        if not summary.empty:
+            st.write("**Acumulado no processo (por etapa):**")
+            st.dataframe(summary.round(3))
+        st.caption(
+            f"Log: {log_file} (nível {LOG_LEVEL}, rotação a cada {LOG_MAX_BYTES // 2 ** 20} MB, "
+            f"{LOG_BACKUP_COUNT} arquivos antigos)"
+        )
+
+
+@st.fragment(run_every="3s")
+def jobs_panel(job_queue):
+    # Atualiza sozinho a cada 3s sem rerodar o script inteiro
+    jobs = job_queue.list_jobs()
+    if jobs.empty:
+        return
+    st.subheader("📋 Jobs de Treinamento")
+    st.dataframe(jobs, hide_index=True)
+    active = jobs[jobs["status"].isin(["queued", "starting", "running"])]
+    for _, row in active.iterrows():
+        job = job_queue.get_job(row["id"])
+        st.progress(float(job["progress"] or 0), text=f"{row['id']} ({row['status']})")
+        if job["leaderboard"]:
+            st.dataframe(pd.read_json(io.StringIO(job["leaderboard"])), hide_index=True)
+
+    done_ids = jobs.loc[jobs["status"] == "done", "id"].tolist()
+    if done_ids:
+        chosen = st.selectbox("Job concluído:", done_ids)
+        if st.button("📥 Usar modelo do job"):
+            job = job_queue.get_job(chosen)
+            use_registered_model(job_queue.registry, job["registry_key"])
+            st.success(f"✅ Modelo do job {chosen} carregado para a aba de avaliação.")
+    failed = jobs[jobs["status"] == "failed"]
+    for _, row in failed.head(3).iterrows():
+        with st.expander(f"❌ Job {row['id']} falhou"):
+            st.code(job_queue.get_job(row["id"])["error"])
+
+
 def main():
+    run_id = start_run()
+    registry = ModelRegistry()
+    job_queue = TrainingJobQueue(registry=registry)
     # Sidebar
     st.sidebar.title("SIAMD 🌐")
     st.sidebar.markdown("_Sistema Inteligente de Análise e Modelagem de Dados_")
@@ -42,11 +148,19 @@ def main():
             "🔗 Dataset Kaggle:", "datasnaek/youtube-new"
         )
         download_path = "./data"
+        force_download = st.sidebar.checkbox("Baixar tudo de novo (ignorar manifesto)", value=False)
         if st.sidebar.button("⬇️ Baixar do Kaggle"):
-            success = download_dataset(dataset_name, download_path)
-            st.sidebar.success(
-                "✅ Dataset baixado!" if success else "❌ Falha ao baixar."
-            )
+            with st.spinner("Sincronizando dataset..."):
+                summary = download_dataset(dataset_name, download_path, force=force_download)
+            if summary is None:
+                st.sidebar.error("❌ Falha ao baixar.")
+            elif summary["downloaded"]:
+                st.sidebar.success(
+                    f"✅ {len(summary['downloaded'])} arquivo(s) atualizado(s) "
+                    f"({summary['bytes'] / 2 ** 20:.1f} MB), {len(summary['unchanged'])} sem mudança."
+                )
+            else:
+                st.sidebar.success("✅ Dataset já atualizado; nada para baixar.")
             logger.info(f"Download Kaggle: {dataset_name}")
         csv_files = (
             [f for f in os.listdir(download_path) if f.endswith(".csv")]
@@ -57,11 +171,28 @@ def main():
             selected_file = st.sidebar.selectbox("CSV disponível:", csv_files)
             max_rows = st.sidebar.slider("Linhas Máx.", 100, 100000, 30000, step=100)
             file_path = os.path.join(download_path, selected_file)
+            streaming_mode = st.sidebar.checkbox(
+                "📊 Estatísticas do arquivo completo (streaming)", value=False
+            )
+            trajectory_mode = st.sidebar.checkbox(
+                "🎞️ Índice de trajetórias por vídeo", value=False
+            )
+            country_files = st.sidebar.multiselect(
+                "🌍 Comparar países:", [f for f in csv_files if "videos" in f]
+            )
     else:
         st.sidebar.warning("⚠️ Configure credenciais Kaggle no .env para download.")
 
+    fast_render = st.sidebar.checkbox(
+        "⚡ Renderização rápida (grade + amostra)", value=True
+    )
+
+    startup_diagnostics()
+
     # Carregamento do DataFrame
     df = None
+    full_stats = None
+    trajectories = None
     if uploaded_file:
         df = (
             pd.read_csv(uploaded_file)
@@ -69,8 +200,35 @@ def main():
             else pd.read_excel(uploaded_file)
         )
         df.columns = df.columns.str.lower()
+    elif kaggle_ok and "file_path" in locals() and country_files:
+        # Vários países carregados em paralelo; reruns reaproveitam o frame
+        paths = [os.path.join(download_path, f) for f in country_files]
+        countries_key = (tuple((p, os.stat(p).st_mtime_ns) for p in paths), max_rows)
+        if st.session_state.get("countries_key") != countries_key:
+            with st.spinner("Carregando países em paralelo..."):
+                st.session_state.countries_df = load_countries(paths, max_rows)
+            st.session_state.countries_key = countries_key
+        df = st.session_state.countries_df
     elif kaggle_ok and "file_path" in locals():
         df = load_data(file_path, max_rows)
+        if streaming_mode:
+            # Uma passada por versão do arquivo; reruns reaproveitam o resultado
+            stat = os.stat(file_path)
+            stats_key = (file_path, stat.st_mtime_ns, stat.st_size)
+            if st.session_state.get("full_stats_key") != stats_key:
+                with st.spinner("Lendo arquivo completo em chunks..."):
+                    st.session_state.full_stats = stream_aggregates(file_path)
+                st.session_state.full_stats_key = stats_key
+            full_stats = st.session_state.full_stats
+        if trajectory_mode and {"video_id", "trending_date"} <= set(df.columns):
+            # Índice gravado em disco; só os dias novos do arquivo são processados
+            stat = os.stat(file_path)
+            trajectories_key = (file_path, stat.st_mtime_ns, stat.st_size)
+            if st.session_state.get("trajectories_key") != trajectories_key:
+                with st.spinner("Atualizando índice de trajetórias..."):
+                    st.session_state.trajectories = trajectory_index_for(file_path)
+                st.session_state.trajectories_key = trajectories_key
+            trajectories = st.session_state.trajectories
 
     # Títulos e Tabs
     st.title("SIAMD - Sistema de Análise e Modelagem")
@@ -98,23 +256,50 @@ def main():
                 null_pct, zero_pct = calculate_null_zero_percentage(df)
                 st.metric("Nulos (%)", f"{null_pct:.2f}%")
                 st.metric("Zeros (%)", f"{zero_pct:.2f}%")
+                memory_mb = df.memory_usage(deep=True).sum() / 1e6
+                report = df.attrs.get("dtype_report")
+                if report:
+                    saved_mb = (report["before_bytes"] - report["after_bytes"]) / 1e6
+                    st.metric("Memória", f"{memory_mb:.1f} MB", delta=f"-{saved_mb:.1f} MB (dtypes)", delta_color="inverse")
+                else:
+                    st.metric("Memória", f"{memory_mb:.1f} MB")
+            if report and report["columns"]:
+                with st.expander("🗜️ Dtypes otimizados"):
+                    st.dataframe(
+                        pd.DataFrame.from_dict(
+                            report["columns"], orient="index", columns=["Antes", "Depois"]
+                        )
+                    )
+            if full_stats is not None:
+                st.markdown("---")
+                st.subheader("Arquivo Completo (streaming)")
+                show_streaming_summary(full_stats, load_category_mapping(selected_file))
             st.markdown("---")
             st.subheader("Distribuições")
-            plot_numeric_distribution(df)
-            plot_missing_values(df)
+            NumpyProfiler().generate_report(df)
             st.markdown("---")
             st.subheader("Tendências")
-            plot_regression_likes_views(df)
-            plot_regression_like_rate_vs_views(df)
+            plot_regression_likes_views(df, fast=fast_render)
+            plot_regression_like_rate_vs_views(df, fast=fast_render)
             plot_views_vs_likes(df)
             st.markdown("---")
             st.subheader("Categorias")
-            if 'category_id' in df.columns:
+            if 'category_name' in df.columns:
+                plot_views_by_category(df)
+            elif 'category_id' in df.columns:
                 df_cat = merge_categories(df, selected_file)
                 plot_views_by_category(df_cat)
             else:
                 st.info("Coluna 'category_id' não encontrada; análise de categorias pulada.")
             show_top_videos(df)
+            if trajectories is not None:
+                st.markdown("---")
+                st.subheader("Trajetórias (arquivo completo)")
+                show_trajectories(trajectories)
+            if 'country' in df.columns:
+                st.markdown("---")
+                st.subheader("Países")
+                plot_cross_country(df)
 
     # Tab 2: Model Training
     with tab2:
@@ -122,25 +307,53 @@ def main():
         if df is None:
             st.warning("📥 Carregue um dataset antes de treinar.")
         else:
+            train_source = df
+            if trajectories is not None:
+                granularity = st.radio(
+                    "Dados de treino:",
+                    ["Linhas do arquivo", "Uma linha por vídeo (trajetórias)"],
+                    horizontal=True,
+                )
+                if granularity != "Linhas do arquivo":
+                    train_source = trajectories.features.reset_index()
             with st.expander("📋 Parâmetros do Modelo", expanded=True):
-                cols = df.columns.tolist()
+                cols = train_source.columns.tolist()
                 target_col = st.selectbox("Coluna Alvo:", cols)
+                text_features = st.checkbox(
+                    "🔤 Features de texto com hashing (title/tags/description)", value=False
+                )
+                # Texto de alta cardinalidade (título, tags, descrição) fica fora por padrão,
+                # a menos que vá pelo hashing esparso
+                suggested = default_features(train_source, target_col, keep=TEXT_COLUMNS if text_features else ())
                 feature_cols = st.multiselect(
                     "Features:",
                     [c for c in cols if c != target_col],
-                    default=[c for c in cols if c != target_col],
+                    default=suggested,
                 )
+                excluded = [c for c in cols if c != target_col and c not in suggested]
+                if excluded:
+                    st.caption(f"Fora do padrão (texto de alta cardinalidade): {', '.join(excluded)}")
                 task_type = st.selectbox(
                     "Tipo de Tarefa:", ["classification", "regression", "clustering"]
                 )
                 cv_folds = st.slider("Folds CV:", 2, 10, 5)
                 train_size = st.slider("Tamanho do Treino:", 0.5, 0.9, 0.8)
+                time_budget_min = st.slider("⏱️ Orçamento de tempo (min):", 1, 60, 10)
+                max_workers = st.slider(
+                    "Processos paralelos:", 1, os.cpu_count() or 1, os.cpu_count() or 1
+                )
+                auto_size = st.checkbox(
+                    "📉 Dimensionar amostra pela curva de aprendizado", value=True
+                )
+                run_in_background = st.checkbox(
+                    "🧵 Executar em segundo plano (fila de jobs)", value=True
+                )
 
             if st.button("🚀 Treinar Modelo"):
                 if not feature_cols:
                     st.error("Selecione ao menos uma feature.")
                 else:
-                    df_train = df[feature_cols + [target_col]]
+                    df_train = train_source[feature_cols + [target_col]]
                     stratify_flag = True
 
                     # Se for classificação, verifica test_size vs n_classes
@@ -154,48 +367,116 @@ def main():
                             )
                             stratify_flag = False
 
-                    # Treina passando o flag de stratify
-                    pyc = PyCaretAdapter()
-                    with st.spinner("Treinando modelo..."):
-                        model = pyc.train_model(
-                            df_train,
-                            target_col,
-                            task_type,
-                            cv_folds=cv_folds,
-                            train_size=train_size,
-                            stratify=stratify_flag
+                    train_params = dict(
+                        cv_folds=cv_folds,
+                        train_size=train_size,
+                        stratify=stratify_flag,
+                        time_budget=time_budget_min * 60,
+                        max_workers=max_workers,
+                        auto_size=auto_size,
+                        text_features=text_features,
+                    )
+                    model_key = registry.make_key(df_train, target_col, task_type, train_params)
+                    if registry.exists(model_key):
+                        # Mesmo dataset + parâmetros: reaproveita o pipeline salvo
+                        meta = use_registered_model(registry, model_key)
+                        st.success(
+                            f"♻️ Modelo já treinado com estes dados e parâmetros ({meta['model_name']}); "
+                            "carregado do registro."
                         )
+                    elif run_in_background:
+                        job_id = job_queue.submit_training(
+                            df_train, target_col, task_type, **train_params
+                        )
+                        st.success(f"🧵 Job {job_id} enviado para a fila.")
+                        logger.info(f"Job de treinamento enviado: {job_id}")
+                    else:
+                        # Treina passando o flag de stratify
+                        pyc = pycaret_adapter()
+                        st.write("**Leaderboard (parcial):**")
+                        leaderboard_slot = st.empty()
+                        with st.spinner("Treinando modelo..."):
+                            model = pyc.train_model(
+                                df_train,
+                                target_col,
+                                task_type,
+                                on_update=leaderboard_slot.dataframe,
+                                **train_params
+                            )
 
+                        registry.save(
+                            model_key, model, task_type, target_col, feature_cols, train_params,
+                            leaderboard=pyc.leaderboard, artifacts=pyc.eval_artifacts, saver=pyc
+                        )
+                        st.success("✅ Treinamento concluído!")
+                        st.session_state.trained_model = model
+                        st.session_state.task_type = task_type
+                        st.session_state.feature_cols = feature_cols
+                        st.session_state.model_key = model_key
+                        # Treino via cache de features não abre setup: sem plot_model
+                        st.session_state.model_in_session = pyc.setup_active
+                        st.write("**Melhor modelo:**", model)
+                        if pyc.learning_curve is not None:
+                            st.write("**Curva de aprendizado (amostras estratificadas):**")
+                            st.line_chart(pyc.learning_curve.set_index("linhas")["score"])
+                            st.dataframe(pyc.learning_curve, hide_index=True)
 
-                    st.success("✅ Treinamento concluído!")
-                    st.session_state.trained_model = model
-                    st.session_state.task_type = task_type
-                    st.session_state.feature_cols = feature_cols
-                    st.write("**Melhor modelo:**", model)
+        jobs_panel(job_queue)
 
     # Tab 3: Evaluation & Prediction
     with tab3:
         st.header("Avaliação e Previsão")
-        if "trained_model" not in st.session_state:
+        entries = registry.entries()
+        if "model_key" not in st.session_state and entries:
+            # Abre no modelo mais recente do registro (desserializado no primeiro uso)
+            use_registered_model(registry, entries[0]["key"])
+        if entries:
+            with st.expander("🗂️ Modelos registrados"):
+                labels = {
+                    e["key"]: f"{e['model_name']} · {e['task_type']} · alvo: {e['target']} · {e['key']}"
+                    for e in entries
+                }
+                current = st.session_state.get("model_key")
+                chosen_key = st.selectbox(
+                    "Modelo:", list(labels), format_func=labels.get,
+                    index=list(labels).index(current) if current in labels else 0,
+                )
+                if st.button("📂 Carregar modelo") and chosen_key != current:
+                    use_registered_model(registry, chosen_key)
+                    st.rerun()
+        if "model_key" not in st.session_state:
             st.warning("🤖 Treine um modelo antes de usar esta aba.")
         else:
-            model = st.session_state.trained_model
             task_type = st.session_state.task_type
             features = st.session_state.feature_cols
             c1, c2 = st.columns([1, 1])
             # Avaliação
             with c1:
-                if st.button("🔍 Analisar Modelo"):
-                    pc = PyCaretAdapter()
+                model_key = st.session_state.get("model_key")
+                if model_key and registry.has_artifacts(model_key):
+                    # Holdout avaliado no treino: gráficos saem dos arrays salvos com o modelo
+                    if st.button("🔍 Analisar Modelo"):
+                        with st.spinner("Gerando gráficos..."):
+                            figures = registry.figures(model_key)
+                        for png in figures.values():
+                            st.image(png, use_container_width=True)
+                # Clusterização analisa pelo sweep salvo no modelo (sem setup)
+                elif not st.session_state.get("model_in_session", True) and task_type != "clustering":
+                    st.info("ℹ️ Gráficos de avaliação exigem um modelo treinado nesta sessão (setup ativo).")
+                elif st.button("🔍 Analisar Modelo"):
+                    pc = pycaret_adapter()
                     with st.spinner("Gerando gráficos..."):
-                        pc.analyze_model(model, task_type)
+                        pc.analyze_model(session_model(registry), task_type)
             # Previsão
             with c2:
                 st.subheader("Novo Registro")
                 with st.form("form_previsao", clear_on_submit=True):
                     new_data = {}
                     for f in features:
-                        if pd.api.types.is_datetime64_any_dtype(df[f]):
+                        if df is None or f not in df.columns:
+                            # Modelo do registro sem o dataset carregado
+                            new_data[f] = st.text_input(f, value="")
+                        elif pd.api.types.is_datetime64_any_dtype(df[f]):
                             # date_input já devolve um datetime.date
                             new_data[f] = st.date_input(
                                 f,
@@ -209,18 +490,66 @@ def main():
                     if st.form_submit_button("📊 Prever"):
                         new_df = pd.DataFrame([new_data])
                         for f in features:
-                            if pd.api.types.is_datetime64_any_dtype(df[f]):
+                            if df is not None and f in df.columns and pd.api.types.is_datetime64_any_dtype(df[f]):
                                 new_df[f] = pd.to_datetime(new_df[f])
-                        if task_type == "classification":
-                            from pycaret.classification import predict_model as pred
-                        elif task_type == "regression":
-                            from pycaret.regression import predict_model as pred
-                        else:
-                            from pycaret.clustering import predict_model as pred
-                        result = pred(model, data=new_df)
+                        result = pycaret_adapter().predict(session_model(registry), new_df, task_type)
                         st.subheader("Resultado da Previsão")
                         st.dataframe(result)
 
+            # Previsão em lote (CSV inteiro → Parquet)
+            st.markdown("---")
+            st.subheader("📦 Previsão em Lote")
+            model_key = st.session_state.get("model_key")
+            if model_key is None or not registry.exists(model_key):
+                st.info("ℹ️ A previsão em lote usa modelos do registro; treine ou carregue um modelo registrado.")
+            else:
+                batch_upload = st.file_uploader("CSV para pontuar:", type=["csv"], key="batch_csv")
+                local_csvs = (
+                    [f for f in os.listdir("./data") if f.endswith(".csv")]
+                    if os.path.exists("./data") else []
+                )
+                batch_local = None
+                if batch_upload is None and local_csvs:
+                    batch_local = st.selectbox("Ou um CSV baixado:", local_csvs)
+                batch_workers = st.slider(
+                    "Processos de previsão:", 1, os.cpu_count() or 1, os.cpu_count() or 1
+                )
+                if st.button("⚙️ Processar lote") and (batch_upload or batch_local):
+                    os.makedirs(PREDICTIONS_DIR, exist_ok=True)
+                    if batch_upload is not None:
+                        # Mantém o nome original: o prefixo do país escolhe as categorias
+                        csv_path = os.path.join(PREDICTIONS_DIR, batch_upload.name)
+                        with open(csv_path, "wb") as f:
+                            f.write(batch_upload.getbuffer())
+                    else:
+                        csv_path = os.path.join("./data", batch_local)
+                    base = os.path.splitext(os.path.basename(csv_path))[0]
+                    output_path = os.path.join(PREDICTIONS_DIR, f"{base}-{model_key}.parquet")
+                    progress = st.empty()
+                    try:
+                        with st.spinner("Pontuando em chunks..."):
+                            summary = score_csv(
+                                csv_path, registry, model_key, output_path,
+                                max_workers=batch_workers,
+                                on_progress=lambda n: progress.write(f"{n:,} linhas pontuadas"),
+                            )
+                    except (ValueError, KeyError, OSError) as e:
+                        # ValueError cobre também CSV ilegível (ParserError, UnicodeDecodeError)
+                        st.error(f"❌ Não foi possível pontuar o CSV: {e}")
+                    else:
+                        m1, m2, m3 = st.columns(3)
+                        m1.metric("Linhas", f"{summary['rows']:,}")
+                        m2.metric("Tempo (s)", f"{summary['seconds']:.1f}")
+                        m3.metric("Linhas/s", f"{summary['rows_per_sec']:,.0f}")
+                        st.caption(f"Saída: {output_path}")
+                        with open(output_path, "rb") as f:
+                            st.download_button(
+                                "📥 Baixar previsões (Parquet)", f.read(),
+                                file_name=os.path.basename(output_path),
+                            )
+
+    performance_panel(run_id)
+
 
 if __name__ == "__main__":
     main()